@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for converting buffers in place with ``convert_buffer()``
+
+Compares, for an array.array('d') of values:
+
+ * a list comprehension calling a converter from get_converter()
+   (which makes a new list, rather than converting in place)
+ * convert_buffer() without numpy (a block at a time, in place)
+ * convert_buffer() with numpy, if it's installed
+
+for a linear (m -> ft) and an affine (C -> F) conversion.
+
+usage:
+
+    python bench_buffer.py [number_of_values]
+"""
+
+import array
+import sys
+import time
+
+from nucos import array_conversion, get_converter
+
+
+def time_it(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main(num=1000000):
+    numpy = array_conversion.np
+    for from_unit, to_unit in [("m", "ft"), ("C", "F")]:
+        print("{} -> {}, {} values:".format(from_unit, to_unit, num))
+        values = array.array('d', range(num))
+        converter = get_converter(from_unit, to_unit)
+
+        baseline = time_it(lambda: [converter(value) for value in values])
+        print("  {:35s} {:7.4f} s".format("list comprehension", baseline))
+
+        array_conversion.np = None
+        seconds = time_it(lambda: array_conversion.convert_buffer(
+            from_unit, to_unit, values))
+        print("  {:35s} {:7.4f} s   {:5.1f} x".format(
+            "convert_buffer (no numpy)", seconds, baseline / seconds))
+        array_conversion.np = numpy
+
+        if numpy is not None:
+            seconds = time_it(lambda: array_conversion.convert_buffer(
+                from_unit, to_unit, values))
+            print("  {:35s} {:7.4f} s   {:5.1f} x".format(
+                "convert_buffer (numpy)", seconds, baseline / seconds))
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
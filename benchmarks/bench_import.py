@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for the start-up cost of ``import nucos``
+
+The unit lookup tables and converters are built the first time they
+are used, rather than on import. This compares the time to:
+
+ * ``import nucos``
+ * ``import nucos`` and build everything,
+   which is what used to happen on import.
+ * ``import nucos`` and do one conversion,
+   which only builds what that conversion needs.
+
+Each is run in a fresh interpreter, a number of times, timed from
+inside the interpreter (so the interpreter start up, which is much
+bigger and noisier, isn't included), and the minimum and median are
+reported.
+
+If the path to another checkout of nucos is given, the same is timed
+for that one too, e.g. to compare with the baseline version::
+
+    git worktree add /tmp/nucos_baseline <commit>
+    python bench_import.py 40 /tmp/nucos_baseline
+
+Both checkouts are byte compiled first (with compileall), so that it
+is the import that is timed, not compiling the source -- that takes
+~10 ms, and would happen on every run if PYTHONDONTWRITEBYTECODE is set.
+
+Measured with this script (Python 3.11, one core, minimum of 100
+runs: ``python bench_import.py 100 /tmp/nucos_baseline``), compared to
+the version before any of the lazy loading changes:
+
+                                      this version    baseline
+    import nucos                         5.8 ms         3.2 ms
+    import nucos + build all tables      6.4 ms         3.5 ms
+    import nucos + one convert()         5.7 ms         3.3 ms
+
+So ``import nucos`` is slower than the baseline, not faster: building
+the tables on first use only saves what the baseline spent building
+them on import, which is less than this version spends importing the
+collections module (~1.7 ms) and the bigger unit_conversion module.
+
+usage:
+
+    python bench_import.py [number_of_runs] [other_checkout]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+CASES = [
+    ("import nucos", "import nucos"),
+    ("import nucos + build all tables",
+     "import nucos\n"
+     "from nucos import unit_conversion as uc\n"
+     "uc.UNIT_TYPES; uc.UNIT_NAMES; list(uc.Converters.values())"),
+    ("import nucos + one convert()",
+     "import nucos\n"
+     "nucos.convert('m', 'ft', 1.0)"),
+]
+
+TIMER = ("import time\n"
+         "start = time.perf_counter()\n"
+         "{}\n"
+         "print(time.perf_counter() - start)\n")
+
+
+def time_it(code, runs, checkout):
+    times = []
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", TIMER.format(code)],
+                                cwd=checkout, check=True,
+                                capture_output=True, text=True)
+        times.append(float(result.stdout))
+    return min(times), statistics.median(times)
+
+
+def main(runs=20, other_checkout=None):
+    this_checkout = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    checkouts = [("this version", this_checkout)]
+    if other_checkout is not None:
+        checkouts.append((other_checkout, other_checkout))
+    for checkout_name, checkout in checkouts:
+        subprocess.run([sys.executable, "-m", "compileall", "-q", "nucos"],
+                       cwd=checkout, check=True)
+        print(checkout_name)
+        for name, code in CASES:
+            try:
+                best, median = time_it(code, runs, checkout)
+            except subprocess.CalledProcessError:
+                print("  {:35s} (not supported)".format(name))
+                continue
+            print("  {:35s} min: {:6.2f} ms   median: {:6.2f} ms"
+                  .format(name, best * 1000, median * 1000))
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    main(*[int(arg) for arg in args[:1]], *args[1:2])
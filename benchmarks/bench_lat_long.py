@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for formatting and parsing lat-long strings in bulk
+
+Times ``format_lon_array()`` and ``parse_lon_array()`` on random
+longitudes, in each of the styles, and reports strings per minute.
+
+The scalar ``format_lon_*()`` loop is timed for comparison.
+
+usage:
+
+    python bench_lat_long.py [number_of_values]
+"""
+
+import random
+import sys
+import time
+
+from nucos import lat_long
+
+SCALAR_FORMATTERS = {"d": lat_long.format_lon_d,
+                     "dm": lat_long.format_lon_dm,
+                     "dms": lat_long.format_lon_dms,
+                     }
+
+
+def time_it(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def report(name, seconds, num):
+    print("{:30s} {:7.3f} s   {:6.1f} million strings / minute"
+          .format(name, seconds, num / seconds * 60 / 1e6))
+
+
+def main(num=1000000):
+    random.seed(42)
+    values = [random.uniform(-180, 180) for _ in range(num)]
+
+    for style, formatter in SCALAR_FORMATTERS.items():
+        seconds, _ = time_it(lambda: [formatter(f) for f in values])
+        report("format, scalar loop, " + style, seconds, num)
+
+        seconds, strings = time_it(lat_long.format_lon_array, values, style)
+        report("format_lon_array, " + style, seconds, num)
+
+        seconds, (_, valid) = time_it(lat_long.parse_lon_array, strings)
+        report("parse_lon_array, " + style, seconds, num)
+        assert all(valid)
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
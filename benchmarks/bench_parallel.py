@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""
+Benchmark for converting large files in parallel
+
+Writes a CSV file with three unit columns, then converts it with
+``convert_csv()`` (single process, streaming) and with
+``convert_file()`` with increasing numbers of worker processes, and
+reports the throughput of each.
+
+The number of workers goes up in powers of two, up to the number of
+cores. How the throughput scales with the number of cores hasn't been
+measured yet: so far it has only been run on one core (Python 3.11,
+1,000,000 rows, 66.6 MB), where both take the same time:
+
+    convert_csv                      10.69 s        94 k rows/s
+    convert_file, 1 workers          10.27 s        97 k rows/s
+
+usage:
+
+    python bench_parallel.py [number_of_rows]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from nucos.csv_conversion import convert_csv
+from nucos.file_conversion import convert_file
+
+TO_UNITS = {"volume": "m^3", "discharge": "m^3/s", "length": "m"}
+
+
+def write_csv(filename, num_rows):
+    random.seed(42)
+    with open(filename, "w") as outfile:
+        outfile.write("Date,Volume (bbl),Rate (bbl/day),Depth (ft)\n")
+        for _ in range(num_rows):
+            outfile.write("2020-01-01,{!r},{!r},{!r}\n"
+                          .format(random.uniform(0, 1000),
+                                  random.random(),
+                                  random.uniform(0, 100)))
+
+
+def report(name, seconds, num_rows, size):
+    print("{:30s} {:7.2f} s   {:7.0f} k rows/s   {:6.1f} MB/s"
+          .format(name, seconds, num_rows / seconds / 1000,
+                  size / seconds / 1e6))
+
+
+def main(num_rows=1000000):
+    cpus = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmpdir:
+        infile = os.path.join(tmpdir, "in.csv")
+        outfile = os.path.join(tmpdir, "out.csv")
+        write_csv(infile, num_rows)
+        size = os.path.getsize(infile)
+        print("{} rows, {:.1f} MB, {} CPUs".format(num_rows, size / 1e6, cpus))
+
+        start = time.perf_counter()
+        convert_csv(infile, outfile, to_units=TO_UNITS)
+        report("convert_csv", time.perf_counter() - start, num_rows, size)
+
+        workers = 1
+        while workers <= cpus:
+            start = time.perf_counter()
+            convert_file(infile, outfile, to_units=TO_UNITS, workers=workers)
+            report("convert_file, {} workers".format(workers),
+                   time.perf_counter() - start, num_rows, size)
+            workers *= 2
+
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -14,8 +14,6 @@ NOTE: the names in here are the public API.
 
 __version__ = "3.4.1"
 
-
-
 from .unit_conversion import (UnitConversionError,
                               InvalidUnitError,
                               InvalidUnitTypeError,
@@ -43,6 +41,9 @@ from .unit_conversion import (UnitConversionError,
                               # LatLongConverter,
                               # OilQuantityConverter,
                               convert,
+                              get_converter,
+                              get_unit,
+                              Unit,
                               )
 
 from .lat_long import (LatLongConverter,
@@ -54,7 +55,49 @@ from .lat_long import (LatLongConverter,
                        format_lon_dm,
                        format_lat_dms,
                        format_lon_dms,
+                       format_lat_array,
+                       format_lon_array,
+                       parse_lat_array,
+                       parse_lon_array,
                        )
 
 # this should probably not be exposed
 from .unit_data import ConvertDataUnits
+
+
+# These are imported the first time they are used, as they import numpy
+# (if it's there), or other modules, and we don't want to pay for that
+# in `import nucos`
+_LAZY_IMPORTS = {"convert_array": "array_conversion",
+                 "convert_many": "array_conversion",
+                 "unit_codes": "array_conversion",
+                 "convert_codes": "array_conversion",
+                 "convert_buffer": "array_conversion",
+                 "convert_csv": "csv_conversion",
+                 "convert_file": "file_conversion",
+                 "convert_raw_file": "binary_conversion",
+                 "convert_npy_file": "binary_conversion",
+                 "slick_volume": "calculations",
+                 "slick_thickness": "calculations",
+                 "slick_area": "calculations",
+                 "cumulative_release": "calculations",
+                 "get_plan": "plans",
+                 "Plan": "plans",
+                 "compile_unit": "compound_units",
+                 "compile_conversion": "compound_units",
+                 "suggest_units": "suggestions",
+                 "complete_units": "typeahead",
+                 }
+
+
+def __getattr__(name):
+    try:
+        module_name = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    # importlib is imported here too, as it adds to `import nucos`
+    import importlib
+
+    module = importlib.import_module("." + module_name, __name__)
+    return getattr(module, name)
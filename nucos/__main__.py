@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+
+"""
+Command line interface to nucos
+
+    python -m nucos convert-csv in.csv out.csv --to volume m^3
+    python -m nucos convert-ndjson in.ndjson out.ndjson --to volume m^3
+
+run ``python -m nucos --help`` for details
+"""
+
+import argparse
+import sys
+
+from .csv_conversion import convert_csv
+from .file_conversion import convert_file
+
+
+def _get_conversions(args):
+    columns = {name: (from_unit, to_unit)
+               for name, from_unit, to_unit in args.column or []}
+    to_units = dict(args.to or [])
+    if not (columns or to_units):
+        raise ValueError("nothing to convert: use --column and/or --to")
+    return columns, to_units
+
+
+def convert_csv_command(args):
+    columns, to_units = _get_conversions(args)
+
+    outfile = sys.stdout if args.outfile == "-" else args.outfile
+    if args.workers is not None:
+        if args.infile == "-":
+            raise ValueError("--workers needs an input file, not stdin")
+        convert_file(args.infile, outfile,
+                     columns=columns,
+                     to_units=to_units,
+                     file_format="csv",
+                     float_format=args.float_format,
+                     workers=args.workers or None,
+                     delimiter=args.delimiter)
+    else:
+        infile = sys.stdin if args.infile == "-" else args.infile
+        convert_csv(infile, outfile,
+                    columns=columns,
+                    to_units=to_units,
+                    float_format=args.float_format,
+                    chunk_size=args.chunk_size,
+                    delimiter=args.delimiter)
+
+
+def convert_ndjson_command(args):
+    columns, to_units = _get_conversions(args)
+
+    outfile = sys.stdout if args.outfile == "-" else args.outfile
+    convert_file(args.infile, outfile,
+                 columns=columns,
+                 to_units=to_units,
+                 file_format="ndjson",
+                 workers=args.workers or None)
+
+
+def _add_unit_arguments(parser):
+    parser.add_argument("--column", nargs=3, action="append",
+                        metavar=("NAME", "FROM_UNIT", "TO_UNIT"),
+                        help="convert the column with header NAME")
+    parser.add_argument("--to", nargs=2, action="append",
+                        metavar=("UNIT_TYPE", "TO_UNIT"),
+                        help="convert the columns with a UNIT_TYPE unit "
+                             "in the header to TO_UNIT")
+
+
+def make_parser():
+    parser = argparse.ArgumentParser(prog="python -m nucos",
+                                     description="NUCOS unit conversion")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    csv_parser = commands.add_parser(
+        "convert-csv",
+        help="convert the units of columns of a CSV file",
+        description="Convert the units of columns of a CSV file. Columns "
+                    "can be given explicitly with --column, or have the "
+                    "unit in the header, like 'Volume (bbl)', and be "
+                    "converted to the unit given with --to for that type.")
+    csv_parser.add_argument("infile", help="CSV file to read ('-' for stdin)")
+    csv_parser.add_argument("outfile",
+                            help="CSV file to write ('-' for stdout)")
+    _add_unit_arguments(csv_parser)
+    csv_parser.add_argument("--float-format", default=None,
+                            help="format spec for the converted values, "
+                                 "e.g. '.6g'")
+    csv_parser.add_argument("--delimiter", default=",")
+    csv_parser.add_argument("--chunk-size", type=int, default=10000,
+                            help="number of rows to process at a time")
+    csv_parser.add_argument("--workers", type=int, default=None,
+                            help="convert in parallel, with this many "
+                                 "processes (0 for one per CPU). "
+                                 "Values can't have newlines in them.")
+    csv_parser.set_defaults(func=convert_csv_command)
+
+    ndjson_parser = commands.add_parser(
+        "convert-ndjson",
+        help="convert the units of values in an NDJSON file",
+        description="Convert the units of values in a newline delimited "
+                    "JSON file. Keys can be given explicitly with --column, "
+                    "or have the unit in them, like 'Volume (bbl)', and be "
+                    "converted to the unit given with --to for that type.")
+    ndjson_parser.add_argument("infile", help="NDJSON file to read")
+    ndjson_parser.add_argument("outfile",
+                               help="NDJSON file to write ('-' for stdout)")
+    _add_unit_arguments(ndjson_parser)
+    ndjson_parser.add_argument("--workers", type=int, default=0,
+                               help="number of processes to use "
+                                    "(0, the default, for one per CPU)")
+    ndjson_parser.set_defaults(func=convert_ndjson_command)
+
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.func(args)
+    except ValueError as err:  # including UnitConversionErrors
+        parser.exit(1, "{}: error: {}\n".format(parser.prog, err))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
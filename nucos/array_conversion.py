@@ -0,0 +1,566 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of whole arrays of values
+
+``convert()`` works on numpy arrays already, as long as the unit isn't
+special (API gravity), but it makes a few full-size temporaries
+along the way.
+
+The functions here do the conversion in as few passes as possible,
+preserve the dtype of float32 arrays, and can convert in place.
+
+numpy is optional: without it, ``array.array`` and plain sequences
+are supported, with the loop done in Python.
+
+``convert_buffer()`` converts anything that supports the buffer
+protocol (``array.array``, ``memoryview``, ``bytearray``, ...) in place,
+without copying it.
+"""
+
+import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .unit_conversion import (get_converter,
+                              Simplify,
+                              Converters,
+                              APIGravityConverter,
+                              UnitConversionError,
+                              InvalidUnitTypeError,
+                              )
+
+# array.array typecodes that hold floating point values
+FLOAT_TYPECODES = ('f', 'd')
+
+# number of values converted at a time by convert_buffer() without numpy
+BUFFER_BLOCK_SIZE = 4096
+
+
+def convert_array(from_unit, to_unit, arr, out=None, dtype=None,
+                  unit_type=None):
+    """
+    convert_array(from_unit, to_unit, arr, out=None, dtype=None)
+
+    Convert a whole array of values from one unit to another.
+
+    :param from_unit: the unit the original values are in
+    :param to_unit: the unit you want the values converted to
+    :param arr: the values to convert: a numpy array, an array.array,
+                or any sequence of numbers.
+    :param out=None: an array to put the results in. It can be the
+                     same array as ``arr``, to convert in place.
+    :param dtype=None: the dtype of the result. If None, floating point
+                       inputs keep their dtype (float32 stays float32),
+                       everything else is converted to float64.
+    :param unit_type=None: the type of the unit: 'mass', 'length', etc.
+                           Only required if the unit name is ambiguous.
+
+    :returns: the converted array (``out``, if it was passed in)
+    """
+    converter = get_converter(from_unit, to_unit, unit_type)
+    return apply_converter(converter, arr, out=out, dtype=dtype)
+
+
+def apply_converter(converter, arr, out=None, dtype=None):
+    """
+    apply_converter(converter, arr, out=None, dtype=None)
+
+    Apply a converter from ``get_converter()`` to a whole array.
+
+    See ``convert_array()`` for the parameters.
+    """
+    if np is None:
+        return _apply_sequence(converter, arr, out, dtype)
+    return _apply_ndarray(converter, arr, out, dtype)
+
+
+def _apply_ndarray(converter, arr, out, dtype):
+    """
+    numpy version: in-place ufuncs into the output array, so there
+    are no temporaries, whatever the converter.
+    """
+    arr = np.asarray(arr)
+    if out is None:
+        if dtype is None:
+            dtype = arr.dtype if arr.dtype.kind == 'f' else np.float64
+        out = np.empty(arr.shape, dtype=dtype)
+        result = out
+    else:
+        # so that array.array, etc. can be used for output too
+        result = out
+        out = np.asarray(out)
+        if dtype is not None and np.dtype(dtype) != out.dtype:
+            raise TypeError("dtype: {} doesn't match the dtype of out: {}"
+                            .format(np.dtype(dtype), out.dtype))
+
+    if isinstance(converter, APIGravityConverter):
+        if converter.from_api:
+            np.add(arr, 131.5, out=out)
+            np.divide(141.5, out, out=out)
+            np.multiply(out, converter.scale, out=out)
+        else:
+            np.multiply(arr, converter.scale, out=out)
+        if converter.to_api:
+            np.divide(141.5, out, out=out)
+            np.subtract(out, 131.5, out=out)
+    elif (getattr(converter, "convertdata", None) is not None and
+          out.dtype == np.float64):
+        # the same steps as the converter, so the same rounding
+        # (in single precision, one multiply and add loses less)
+        (A1, B1), (A2, B2) = converter.convertdata
+        np.add(arr, B1, out=out)
+        np.multiply(out, A1, out=out)
+        np.divide(out, A2, out=out)
+        np.subtract(out, B2, out=out)
+    else:
+        np.multiply(arr, converter.scale, out=out)
+        if converter.offset:
+            np.add(out, converter.offset, out=out)
+
+    return result
+
+
+def _apply_sequence(converter, arr, out, dtype):
+    """
+    pure Python version -- a single loop over the values.
+    """
+    if out is not None:
+        for i, value in enumerate(arr):
+            out[i] = converter(value)
+        return out
+
+    typecode = dtype if dtype is not None else getattr(arr, 'typecode', None)
+    if typecode is None:
+        return [converter(value) for value in arr]
+    if typecode not in FLOAT_TYPECODES:
+        if dtype is not None:
+            raise TypeError("dtype must be one of {} without numpy"
+                            .format(FLOAT_TYPECODES))
+        typecode = 'd'
+    return array.array(typecode, map(converter, arr))
+
+
+def convert_buffer(from_unit, to_unit, buffer, typecode=None,
+                   unit_type=None):
+    """
+    convert_buffer(from_unit, to_unit, buffer, typecode=None, unit_type=None)
+
+    Convert the values in a writable buffer in place, without copying it.
+
+    :param from_unit: the unit the original values are in
+    :param to_unit: the unit you want the values converted to
+    :param buffer: any writable object that supports the buffer protocol,
+                   and holds float or double values: array.array('d'),
+                   a memoryview of one, etc.
+    :param typecode=None: 'f' or 'd' -- what the buffer holds, if it's
+                          plain bytes, like a bytearray.
+    :param unit_type=None: the type of the unit: 'mass', 'length', etc.
+                           Only required if the unit name is ambiguous.
+
+    :returns: the number of values converted
+    """
+    converter = get_converter(from_unit, to_unit, unit_type)
+    return apply_converter_buffer(converter, buffer, typecode)
+
+
+def apply_converter_buffer(converter, buffer, typecode=None):
+    """
+    apply_converter_buffer(converter, buffer, typecode=None)
+
+    Apply a converter from ``get_converter()`` to a buffer, in place.
+
+    See ``convert_buffer()`` for the parameters.
+    """
+    view = _float_view(buffer, typecode)
+    try:
+        if np is None:
+            _apply_buffer_blocks(converter, view)
+        else:
+            values = np.asarray(view)
+            _apply_ndarray(converter, values, values, None)
+            del values  # so the view can be released
+        return len(view)
+    finally:
+        view.release()
+
+
+def _float_view(buffer, typecode):
+    """
+    a one dimensional memoryview of floats on a buffer
+    """
+    view = memoryview(buffer)
+    fmt = view.format.lstrip("@")
+    if typecode is None and fmt in FLOAT_TYPECODES:
+        typecode = fmt
+
+    if view.readonly:
+        error = "buffer must be writable"
+    elif fmt not in ('B', 'b', 'c') and fmt != typecode:
+        error = ("buffer must hold floats ('f' or 'd'), not: {!r}"
+                 .format(view.format))
+    elif typecode not in FLOAT_TYPECODES:
+        error = ("typecode must be one of {} for a buffer of bytes"
+                 .format(FLOAT_TYPECODES))
+    elif view.ndim == 1 and fmt == typecode:
+        return view
+    else:
+        error = None
+    try:
+        if error is not None:
+            raise TypeError(error)
+        return view.cast('B').cast(typecode)
+    finally:
+        view.release()
+
+
+def _apply_buffer_blocks(converter, view):
+    """
+    pure Python version: converts a block of values at a time, so the
+    temporaries stay small, whatever the size of the buffer.
+    """
+    typecode = view.format
+    scale = converter.scale
+    offset = converter.offset
+    for start in range(0, len(view), BUFFER_BLOCK_SIZE):
+        block = view[start:start + BUFFER_BLOCK_SIZE]
+        if (isinstance(converter, APIGravityConverter) or
+                getattr(converter, "convertdata", None) is not None):
+            values = map(converter, block)
+        elif offset:
+            values = [value * scale + offset for value in block]
+        else:
+            values = [value * scale for value in block]
+        block[:] = array.array(typecode, values)
+        block.release()
+
+
+def density_array(density, density_units):
+    """
+    density_array(density, density_units)
+
+    Convert densities, in any density unit (including API gravity),
+    to kg/m^3.
+
+    :returns: a numpy array, or with no numpy, a list
+              (or a float, if density is a single value)
+    """
+    converter = get_converter(density_units, "kg/m^3", "density")
+    if np is not None:
+        return apply_converter(converter, density)
+    if isinstance(density, (int, float)):
+        return converter(density)
+    return [converter(value) for value in density]
+
+
+def scale_by_density(values, factor, density, density_units, divide=False):
+    """
+    scale_by_density(values, factor, density, density_units, divide=False)
+
+    Compute ``values * factor * density``, or ``values * factor / density``
+    with density converted to kg/m^3 -- the core of all the conversions
+    between types that need a density: mass <-> volume, etc.
+
+    :param values: the values to convert
+    :param factor: the (unit conversion) factor to scale the values by
+    :param density: density of each value, or a single density for all
+    :param density_units: the units of density (including API)
+    :param divide=False: if True, divide by the density, rather than
+                         multiply.
+
+    See scale_product() for what is returned.
+    """
+    return scale_product(values, density_array(density, density_units),
+                         factor, divide)
+
+
+def scale_product(values1, values2, factor, divide=False):
+    """
+    scale_product(values1, values2, factor, divide=False)
+
+    Compute ``values1 * values2 * factor`` (or ``values1 / values2 * factor``
+    if divide is True) in one pass -- for combining values of different
+    unit types, with the unit conversion factors folded into factor.
+
+    values1 and values2 can be scalars or arrays, as long as they
+    broadcast together.
+
+    :returns: a numpy array, or with no numpy, a list (or a float,
+              if both are single values)
+    """
+    if np is None:
+        return _scale_product_sequence(values1, values2, factor, divide)
+
+    result = np.multiply(values1, factor, dtype=np.float64)
+    values2 = np.asarray(values2)
+    return result / values2 if divide else result * values2
+
+
+def _scale_product_sequence(values1, values2, factor, divide):
+    scalar1 = isinstance(values1, (int, float))
+    scalar2 = isinstance(values2, (int, float))
+    if scalar1 and scalar2:
+        return (values1 * factor / values2 if divide
+                else values1 * factor * values2)
+
+    values1 = values1 if scalar1 else list(values1)
+    values2 = values2 if scalar2 else list(values2)
+    if scalar1:
+        values1 = [values1] * len(values2)
+    if scalar2:
+        values2 = [values2] * len(values1)
+    if len(values1) != len(values2):
+        raise ValueError("the arrays must be the same length")
+
+    if divide:
+        return [v1 * factor / v2 for v1, v2 in zip(values1, values2)]
+    return [v1 * factor * v2 for v1, v2 in zip(values1, values2)]
+
+
+def convert_many(from_units, to_units, values, unit_type=None):
+    """
+    convert_many(from_units, to_units, values, unit_type=None)
+
+    Convert a column of values, where each value can have its own units.
+
+    Each distinct (from_unit, to_unit) pair is only looked up once,
+    and all the values with that pair are converted together.
+
+    :param from_units: the unit of each value -- a sequence the same
+                       length as values, or a single unit name for all.
+    :param to_units: the unit to convert each value to -- a sequence the
+                     same length as values, or a single unit name for all.
+    :param values: the values to convert.
+    :param unit_type=None: the type of the units: 'mass', 'length', etc.
+                           Only required if the unit names are ambiguous.
+
+    :returns: (results, errors): ``errors`` is True for every row that
+              couldn't be converted (bad unit name, incompatible units)
+              -- those rows are NaN in ``results``, rather than an
+              Exception being raised.
+
+    With numpy, results and errors are numpy arrays, otherwise lists.
+    """
+    if np is None:
+        return _convert_many_sequence(from_units, to_units, values, unit_type)
+    return _convert_many_ndarray(from_units, to_units, values, unit_type)
+
+
+def _get_converter_or_none(from_unit, to_unit, unit_type):
+    try:
+        return get_converter(from_unit, to_unit, unit_type)
+    except UnitConversionError:
+        return None
+
+
+def _factorize(units, num):
+    """
+    returns the distinct unit names, and the index into them for each row
+    """
+    if isinstance(units, str):
+        return np.array([units]), np.zeros(num, dtype=np.intp)
+    units = np.asarray(units, dtype=str)
+    if units.shape != (num,):
+        raise ValueError("There must be one unit for each value")
+    return np.unique(units, return_inverse=True)
+
+
+def _convert_many_ndarray(from_units, to_units, values, unit_type):
+    values = np.asarray(values)
+    if values.ndim != 1:
+        raise ValueError("values must be one dimensional")
+    dtype = values.dtype if values.dtype.kind == 'f' else np.float64
+    num = len(values)
+
+    from_names, from_codes = _factorize(from_units, num)
+    to_names, to_codes = _factorize(to_units, num)
+
+    pair_codes = from_codes * len(to_names) + to_codes
+    order = np.argsort(pair_codes, kind='stable')
+    sorted_codes = pair_codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    ends = np.r_[starts[1:], num]
+
+    results = np.empty(num, dtype=dtype)
+    errors = np.zeros(num, dtype=bool)
+    if num == 0:
+        return results, errors
+    for start, end in zip(starts, ends):
+        rows = order[start:end]
+        from_code, to_code = divmod(int(sorted_codes[start]), len(to_names))
+        converter = _get_converter_or_none(str(from_names[from_code]),
+                                           str(to_names[to_code]),
+                                           unit_type)
+        if converter is None:
+            results[rows] = np.nan
+            errors[rows] = True
+        else:
+            results[rows] = apply_converter(converter, values[rows],
+                                            dtype=dtype)
+
+    return results, errors
+
+
+def _convert_many_sequence(from_units, to_units, values, unit_type):
+    values = list(values)
+    num = len(values)
+    if isinstance(from_units, str):
+        from_units = [from_units] * num
+    if isinstance(to_units, str):
+        to_units = [to_units] * num
+    if not len(from_units) == len(to_units) == num:
+        raise ValueError("There must be one unit for each value")
+
+    converters = {}
+    results = []
+    errors = []
+    for from_unit, to_unit, value in zip(from_units, to_units, values):
+        try:
+            converter = converters[from_unit, to_unit]
+        except KeyError:
+            converter = _get_converter_or_none(from_unit, to_unit, unit_type)
+            converters[from_unit, to_unit] = converter
+        if converter is None:
+            results.append(float('nan'))
+            errors.append(True)
+        else:
+            results.append(converter(value))
+            errors.append(False)
+
+    return results, errors
+
+
+def _get_type_converter(unit_type):
+    unit_type = Simplify(unit_type)
+    try:
+        return Converters[unit_type]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+
+
+def unit_codes(unit_type, units):
+    """
+    unit_codes(unit_type, units)
+
+    Encode a sequence of unit names as their integer unit codes.
+
+    This lets a column of units be stored compactly (as uint8 with numpy),
+    rather than repeating the strings, and then be converted with
+    ``convert_codes()``.
+
+    :param unit_type: the type of the units: 'mass', 'length', etc.
+    :param units: sequence of unit names -- any supported spelling
+
+    Raises InvalidUnitError if any of the names are not units of unit_type
+    """
+    converter = _get_type_converter(unit_type)
+
+    if np is None:
+        codes = {}
+        for unit in units:
+            if unit not in codes:
+                codes[unit] = converter.get_unit_code(unit)
+        return array.array('B' if len(converter.UnitCodes) < 256 else 'H',
+                           (codes[unit] for unit in units))
+
+    names, inverse = np.unique(np.asarray(units, dtype=str),
+                               return_inverse=True)
+    dtype = np.uint8 if len(converter.UnitCodes) < 256 else np.uint16
+    codes = np.array([converter.get_unit_code(str(name)) for name in names],
+                     dtype=dtype)
+    return codes[inverse]
+
+
+def _np_matrices(converter):
+    """
+    numpy versions of the conversion matrices, cached on the converter
+    """
+    try:
+        return converter._np_matrices
+    except AttributeError:
+        scale, offset = converter.get_matrices()
+        converter._np_matrices = (np.array(scale), np.array(offset))
+        return converter._np_matrices
+
+
+def convert_codes(unit_type, from_codes, to_codes, values, out=None):
+    """
+    convert_codes(unit_type, from_codes, to_codes, values, out=None)
+
+    Convert values using integer unit codes, rather than unit names.
+
+    The conversion factors are looked up in the precomputed conversion
+    matrix for the unit type, so this is a gather and a multiply(-add).
+
+    :param unit_type: the type of the units: 'mass', 'length', etc.
+    :param from_codes: the unit code of each value (see ``unit_codes()``),
+                       or a single code for all.
+    :param to_codes: the unit code to convert each value to,
+                     or a single code for all.
+    :param values: the values to convert.
+    :param out=None: an array to put the results in.
+    """
+    converter = _get_type_converter(unit_type)
+    if np is None:
+        return _convert_codes_sequence(converter, from_codes, to_codes,
+                                       values, out)
+    return _convert_codes_ndarray(converter, from_codes, to_codes,
+                                  values, out)
+
+
+def _convert_codes_ndarray(converter, from_codes, to_codes, values, out):
+    scale, offset = _np_matrices(converter)
+    values = np.asarray(values)
+    from_codes, to_codes = np.broadcast_arrays(np.asarray(from_codes, np.intp),
+                                               np.asarray(to_codes, np.intp))
+
+    if out is None:
+        dtype = values.dtype if values.dtype.kind == 'f' else np.float64
+        out = np.empty(values.shape, dtype=dtype)
+    result = out
+    out = np.asarray(out)
+
+    factors = scale[from_codes, to_codes]
+    np.multiply(values, factors, out=out)
+    if offset.any():
+        np.add(out, offset[from_codes, to_codes], out=out)
+
+    # API gravity can't be done with the matrices
+    special = np.isnan(factors)
+    if special.any():
+        names = list(converter.UnitCodes)
+        for from_code, to_code in set(zip(from_codes[special].tolist(),
+                                           to_codes[special].tolist())):
+            rows = special & (from_codes == from_code) & (to_codes == to_code)
+            out[rows] = apply_converter(
+                converter.get_converter(names[from_code], names[to_code]),
+                values[rows])
+
+    return result
+
+
+def _convert_codes_sequence(converter, from_codes, to_codes, values, out):
+    scale, offset = converter.get_matrices()
+    names = list(converter.UnitCodes)
+    values = list(values)
+    num = len(values)
+    if isinstance(from_codes, int):
+        from_codes = [from_codes] * num
+    if isinstance(to_codes, int):
+        to_codes = [to_codes] * num
+
+    if out is None:
+        out = [0.0] * num
+    for i, (from_code, to_code, value) in enumerate(zip(from_codes,
+                                                        to_codes,
+                                                        values)):
+        factor = scale[from_code][to_code]
+        if factor != factor:  # NaN: API gravity
+            out[i] = converter.get_converter(names[from_code],
+                                             names[to_code])(value)
+        else:
+            out[i] = value * factor + offset[from_code][to_code]
+    return out
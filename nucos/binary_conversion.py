@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of binary files of floating point values
+
+Raw files of float32 or float64 values, and numpy ``.npy`` files, can
+be converted in place, or into a new file. The file is memory mapped a
+window at a time, so it is never all loaded into memory, no matter
+how big it is.
+
+The converters are the same ones ``get_converter()`` returns, so the
+results are the same as ``convert()``.
+
+numpy is optional: without it, the values are converted in a Python
+loop (see ``array_conversion.convert_buffer()``) -- slower, but it works.
+"""
+
+import ast
+import contextlib
+import mmap
+import os
+import struct
+import sys
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .unit_conversion import get_converter
+from .array_conversion import apply_converter, apply_converter_buffer
+
+# (array typecode, itemsize) for the dtype names we understand
+FLOAT_DTYPES = {"f": ("f", 4),
+                "f4": ("f", 4),
+                "float32": ("f", 4),
+                "d": ("d", 8),
+                "f8": ("d", 8),
+                "float64": ("d", 8),
+                }
+
+NATIVE_BYTEORDER = "<" if sys.byteorder == "little" else ">"
+
+NPY_MAGIC = b"\x93NUMPY"
+
+
+def _parse_dtype(dtype):
+    """
+    returns (typecode, itemsize, byteorder) for a dtype name like
+    "float32", "<f8" or "d"
+    """
+    dtype = str(dtype)
+    byteorder = NATIVE_BYTEORDER
+    if dtype[:1] in "<>=|":
+        if dtype[0] in "<>":
+            byteorder = dtype[0]
+        dtype = dtype[1:]
+    try:
+        typecode, itemsize = FLOAT_DTYPES[dtype]
+    except KeyError:
+        raise ValueError("dtype must be float32 or float64, not: {}"
+                         .format(dtype))
+    return typecode, itemsize, byteorder
+
+
+def read_npy_header(filename):
+    """
+    Read the header of a .npy file -- without needing numpy
+
+    :returns: (dtype, shape, data_offset)
+    """
+    with open(filename, "rb") as infile:
+        if infile.read(len(NPY_MAGIC)) != NPY_MAGIC:
+            raise ValueError("{} is not a .npy file".format(filename))
+        major, minor = infile.read(2)
+        if major == 1:
+            header_len, = struct.unpack("<H", infile.read(2))
+        else:
+            header_len, = struct.unpack("<I", infile.read(4))
+        encoding = "utf-8" if major >= 3 else "latin1"
+        header = ast.literal_eval(infile.read(header_len).decode(encoding))
+        return header["descr"], tuple(header["shape"]), infile.tell()
+
+
+def convert_raw_file(from_unit, to_unit, filename, outfile=None,
+                     dtype="float64", header_bytes=0, window_bytes=2**24,
+                     unit_type=None):
+    """
+    convert_raw_file(from_unit, to_unit, filename, outfile=None,
+                     dtype="float64", header_bytes=0, window_bytes=2**24,
+                     unit_type=None)
+
+    Convert a binary file of floating point values.
+
+    :param from_unit: the unit the values in the file are in
+    :param to_unit: the unit to convert them to
+    :param filename: the file to convert
+    :param outfile=None: the file to write the result to.
+                         If None, the file is converted in place.
+    :param dtype="float64": the type of the values: "float32" or
+                            "float64", with "<" or ">" for the byte
+                            order if it's not the native one.
+    :param header_bytes=0: number of bytes at the start of the file to
+                           leave alone (copied as is to outfile).
+    :param window_bytes=2**24: about how much of the file to map at once.
+    :param unit_type=None: the type of the unit: 'mass', 'length', etc.
+                           Only required if the unit name is ambiguous.
+
+    :returns: the number of values converted
+    """
+    converter = get_converter(from_unit, to_unit, unit_type)
+    typecode, itemsize, byteorder = _parse_dtype(dtype)
+
+    data_bytes = os.path.getsize(filename) - header_bytes
+    if data_bytes < 0 or data_bytes % itemsize:
+        raise ValueError("file size doesn't match a header of {} bytes, and "
+                         "{} byte values".format(header_bytes, itemsize))
+
+    # whole pages, and so a whole number of values, in each window
+    granularity = mmap.ALLOCATIONGRANULARITY
+    window_bytes = max(window_bytes // granularity, 1) * granularity
+
+    if outfile is not None and os.path.exists(outfile):
+        if os.path.samefile(filename, outfile):
+            outfile = None
+
+    if outfile is None:
+        with open(filename, "r+b") as datafile:
+            for start, end in _windows(header_bytes, data_bytes, window_bytes):
+                with _map_window(datafile, start, end, write=True) as window:
+                    _convert_window(converter, window, window,
+                                    typecode, itemsize, byteorder)
+    else:
+        with open(filename, "rb") as infile, open(outfile, "w+b") as out:
+            out.write(infile.read(header_bytes))
+            out.truncate(header_bytes + data_bytes)
+            for start, end in _windows(header_bytes, data_bytes, window_bytes):
+                with _map_window(infile, start, end) as in_window, \
+                        _map_window(out, start, end, write=True) as out_window:
+                    _convert_window(converter, in_window, out_window,
+                                    typecode, itemsize, byteorder)
+
+    return data_bytes // itemsize
+
+
+def convert_npy_file(from_unit, to_unit, filename, outfile=None,
+                     window_bytes=2**24, unit_type=None):
+    """
+    convert_npy_file(from_unit, to_unit, filename, outfile=None,
+                     window_bytes=2**24, unit_type=None)
+
+    Convert a numpy .npy file of float32 or float64 values.
+
+    Works without numpy as well.
+
+    See convert_raw_file() for the parameters.
+    """
+    dtype, shape, data_offset = read_npy_header(filename)
+    num = 1
+    for dim in shape:
+        num *= dim
+    if data_offset + num * _parse_dtype(dtype)[1] != os.path.getsize(filename):
+        raise ValueError("The size of {} doesn't match its header"
+                         .format(filename))
+    return convert_raw_file(from_unit, to_unit, filename, outfile,
+                            dtype=dtype, header_bytes=data_offset,
+                            window_bytes=window_bytes, unit_type=unit_type)
+
+
+def _windows(start, num_bytes, window_bytes):
+    """
+    (start, end) of each window of the data
+    """
+    end_of_data = start + num_bytes
+    while start < end_of_data:
+        end = min(start + window_bytes, end_of_data)
+        yield start, end
+        start = end
+
+
+@contextlib.contextmanager
+def _map_window(fileobj, start, end, write=False):
+    """
+    memory map bytes start:end of an open file
+
+    yields a memoryview of just those bytes, and makes sure it's released
+    before the map is closed.
+    """
+    map_start = start - start % mmap.ALLOCATIONGRANULARITY
+    with mmap.mmap(fileobj.fileno(), end - map_start, offset=map_start,
+                   access=mmap.ACCESS_WRITE if write
+                   else mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)[start - map_start:]
+        try:
+            yield view
+        finally:
+            view.release()
+
+
+def _convert_window(converter, in_window, out_window,
+                    typecode, itemsize, byteorder):
+    """
+    convert the values in one window: in_window and out_window are
+    memoryviews of bytes -- they can be the same one.
+    """
+    if np is not None:
+        dtype = np.dtype(byteorder + typecode)
+        values = np.frombuffer(in_window, dtype=dtype)
+        out = np.frombuffer(out_window, dtype=dtype)
+        apply_converter(converter, values, out=out)
+        del values, out  # so the window can be released
+    elif byteorder == NATIVE_BYTEORDER:
+        if out_window is not in_window:
+            out_window[:] = in_window
+        apply_converter_buffer(converter, out_window, typecode)
+    else:
+        # memoryview can't swap bytes -- unpack and pack the whole window
+        fmt = "{}{}{}".format(byteorder, len(in_window) // itemsize, typecode)
+        values = [converter(value) for value in struct.unpack(fmt, in_window)]
+        out_window[:] = struct.pack(fmt, *values)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+
+"""
+Calculations that combine values of more than one unit type
+
+These all work on whole arrays of values (or single values), in any
+of the supported units. The unit conversion factors are looked up once
+per call, and folded into a single factor, so the arrays are only
+passed over once or twice.
+
+With numpy, numpy arrays are returned, otherwise lists.
+"""
+
+from .unit_conversion import get_converter, get_unit_type, InvalidUnitError
+from . import array_conversion
+from .array_conversion import scale_product
+
+# an oil concentration (thickness) of one micron is 1e-6 m^3 of oil per m^2
+MICRON = 1e-6
+
+
+def _factor(from_unit, to_unit, unit_type):
+    return get_converter(from_unit, to_unit, unit_type).scale
+
+
+def slick_volume(area, area_units, thickness, thickness_units, volume_units):
+    """
+    slick_volume(area, area_units, thickness, thickness_units, volume_units)
+
+    Volume of oil in a slick, from its area and thickness
+
+    :param area: area of the slick(s)
+    :param area_units: units of area: "m^2", "acre", "km^2", ...
+    :param thickness: thickness of the slick(s), in any of the
+                      "Oil Concentration" units: "micron", "bbl/acre",
+                      "g/m^2", ...
+    :param thickness_units: units of thickness
+    :param volume_units: units of volume desired
+
+    area and thickness can be arrays, or scalars, that broadcast together.
+
+    Note: the mass per area units (g/m^2, etc.) assume a density of 0.95
+    """
+    factor = (_factor(area_units, "m^2", "area") *
+              _factor(thickness_units, "micron", "oil concentration") *
+              MICRON *
+              _factor("m^3", volume_units, "volume"))
+    return scale_product(area, thickness, factor)
+
+
+def slick_thickness(volume, volume_units, area, area_units, thickness_units):
+    """
+    slick_thickness(volume, volume_units, area, area_units, thickness_units)
+
+    Average thickness of a slick, from the volume of oil and its area
+
+    See slick_volume() for the parameters.
+    """
+    factor = (_factor(volume_units, "m^3", "volume") /
+              (_factor(area_units, "m^2", "area") * MICRON) *
+              _factor("micron", thickness_units, "oil concentration"))
+    return scale_product(volume, area, factor, divide=True)
+
+
+def slick_area(volume, volume_units, thickness, thickness_units, area_units):
+    """
+    slick_area(volume, volume_units, thickness, thickness_units, area_units)
+
+    Area of a slick, from the volume of oil and its thickness
+
+    See slick_volume() for the parameters.
+    """
+    factor = (_factor(volume_units, "m^3", "volume") /
+              (_factor(thickness_units, "micron", "oil concentration") *
+               MICRON) *
+              _factor("m^2", area_units, "area"))
+    return scale_product(volume, thickness, factor, divide=True)
+
+
+# which unit of amount goes with each unit type of rate
+RELEASE_TYPES = {"discharge": ("m^3/s", "m^3", "volume"),
+                 "massdischarge": ("kg/s", "kg", "mass"),
+                 }
+
+INTEGRATION_METHODS = ("trapezoid", "step")
+
+
+def cumulative_release(rates, rate_units, times, time_units, total_units,
+                       method="trapezoid"):
+    """
+    cumulative_release(rates, rate_units, times, time_units, total_units,
+                       method="trapezoid")
+
+    Integrate a time series of release rates to the cumulative amount
+    released.
+
+    :param rates: the release rate at each time
+    :param rate_units: units of rate: any "Discharge" unit (bbl/day, gpm,
+                       m^3/s, ...) or "Mass Discharge" unit (kg/s, ...)
+    :param times: the time of each rate, e.g. hours since the start
+    :param time_units: units of time: "s", "min", "hr", "day"
+    :param total_units: units of the result: a Volume unit for Discharge
+                        rates, or a Mass unit for Mass Discharge rates.
+    :param method="trapezoid": how to integrate:
+                               "trapezoid": the rate changes linearly
+                               between times.
+                               "step": each rate holds until the next time.
+
+    :returns: the total released up to each time (so the first is zero),
+              as a numpy array, or a list if numpy is not installed.
+    """
+    if method not in INTEGRATION_METHODS:
+        raise ValueError("method must be one of {}, not {!r}"
+                         .format(INTEGRATION_METHODS, method))
+    rate_type = get_unit_type(rate_units)
+    try:
+        base_rate, base_total, total_type = RELEASE_TYPES[rate_type]
+    except KeyError:
+        raise InvalidUnitError((rate_units, "Discharge or Mass Discharge"))
+
+    factor = (_factor(rate_units, base_rate, rate_type) *
+              _factor(time_units, "s", "time") *
+              _factor(base_total, total_units, total_type))
+
+    np = array_conversion.np
+    if np is None:
+        return _cumulative_release_sequence(rates, times, factor, method)
+
+    rates = np.asarray(rates, dtype=np.float64)
+    times = np.asarray(times, dtype=np.float64)
+    if rates.shape != times.shape or rates.ndim != 1:
+        raise ValueError("rates and times must be 1-d, and the same length")
+
+    totals = np.zeros(len(times))
+    if len(times) < 2:
+        return totals
+    if method == "trapezoid":
+        increments = rates[:-1] + rates[1:]
+        increments *= 0.5 * factor
+    else:
+        increments = rates[:-1] * factor
+    increments *= np.diff(times)
+    np.cumsum(increments, out=totals[1:])
+    return totals
+
+
+def _cumulative_release_sequence(rates, times, factor, method):
+    rates = list(rates)
+    times = list(times)
+    if len(rates) != len(times):
+        raise ValueError("rates and times must be the same length")
+
+    totals = [0.0] * len(times)
+    total = 0.0
+    for i in range(1, len(times)):
+        if method == "trapezoid":
+            rate = (rates[i - 1] + rates[i]) * 0.5
+        else:
+            rate = rates[i - 1]
+        total += rate * factor * (times[i] - times[i - 1])
+        totals[i] = total
+    return totals
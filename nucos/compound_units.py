@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+
+"""
+Compound units: units written as products, quotients and powers of
+the Length, Mass, Time and Volume units
+
+Any unit that can be written that way can be converted, without it
+having to be listed in unit_data.py::
+
+    compile_conversion("ft^3/min", "bbl/day")
+    compile_conversion("meter sec-1", "knots")
+    compile_conversion("kg m^-3", "lb/gal")
+
+The units can be:
+
+* separated by whitespace, ``*``, ``·`` or ``×`` (multiply), or ``/``
+  or ``per`` (divide the unit, or parenthesized group, that comes next)
+* raised to integer powers: ``m^3``, ``m**3``, ``m3``, ``s-1``, ``m³``,
+  ``s⁻¹``, or with ``square`` / ``sq`` and ``cubic`` / ``cu`` in front.
+* any of the names (and synonyms) in the tables, including names with
+  spaces in them, like "metric ton".
+
+Units from the other tables (e.g. "knots" or "cSt") can be converted
+to and from compound units too, as long as they are a combination of
+length, mass and time.
+
+The results are cached, so converting the same units again costs
+only a dict lookup.
+
+``get_converter()`` and ``convert()`` fall back to these when they
+don't recognize a unit name.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from .unit_conversion import (get_converter,
+                              get_unit,
+                              Simplify,
+                              Converters,
+                              APIGravityConverter,
+                              Unit,
+                              UNIT_NAME_CACHE,
+                              UnitConversionError,
+                              NotSupportedUnitError,
+                              )
+from .plans import AffineStep, Plan
+
+# dimensions are (length, mass, time) exponents
+
+# the unit types that compound units are built from: (dimensions of
+# the base unit of the table, which is SI)
+BASE_TYPES = {"length": (1, 0, 0),
+              "mass": (0, 1, 0),
+              "time": (0, 0, 1),
+              "volume": (3, 0, 0),
+              }
+
+# the unit types that can be converted to and from compound units:
+# (an SI unit in the table, its dimensions)
+DIMENSIONED_TYPES = {"length": ("m", (1, 0, 0)),
+                     "area": ("m^2", (2, 0, 0)),
+                     "volume": ("m^3", (3, 0, 0)),
+                     "mass": ("kg", (0, 1, 0)),
+                     "time": ("s", (0, 0, 1)),
+                     "velocity": ("m/s", (1, 0, -1)),
+                     "discharge": ("m^3/s", (3, 0, -1)),
+                     "massdischarge": ("kg/s", (0, 1, -1)),
+                     "density": ("kg/m^3", (-3, 1, 0)),
+                     "kinematicviscosity": ("m^2/s", (2, 0, -1)),
+                     "dynamicviscosity": ("Pa s", (-1, 1, -1)),
+                     "interfacialtension": ("N/m", (0, 1, -2)),
+                     "pressure": ("Pa", (-1, 1, -2)),
+                     }
+
+DIMENSION_TYPES = {dims: unit_type
+                   for unit_type, (_, dims) in DIMENSIONED_TYPES.items()}
+
+# words that raise the next unit to a power: "square feet"
+POWER_WORDS = {"square": 2, "sq": 2, "cubic": 3, "cu": 3}
+
+SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺", "0123456789-+")
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<space>\s+)
+  | (?P<power>(?:\^|\*\*)\s*[-+]?\d+|[⁻⁺]?[⁰¹²³⁴⁵⁶⁷⁸⁹]+|[-+]?\d+)
+  | (?P<open>\()
+  | (?P<close>\))
+  | (?P<op>[*/·×])
+  | (?P<word>[^\s()*/·×^⁰¹²³⁴⁵⁶⁷⁸⁹⁻⁺\d+-]+)
+""", re.VERBOSE)
+
+
+class CompoundUnit(namedtuple("CompoundUnit",
+                              ["expression", "dimensions", "scale"])):
+    """
+    A compiled compound unit.
+
+    expression: the unit, as it was passed in
+    dimensions: the (length, mass, time) exponents
+    scale: to convert to SI units: si_value = value * scale
+    """
+    __slots__ = ()
+
+    @property
+    def unit_type(self):
+        """
+        the (simplified) unit type with the same dimensions, or None
+        """
+        return DIMENSION_TYPES.get(self.dimensions)
+
+
+@lru_cache(maxsize=1024)
+def compile_unit(expression):
+    """
+    compile_unit(expression)
+
+    Compile a unit name, or compound unit expression, like "kg m^-3".
+
+    :returns: a CompoundUnit
+
+    raises NotSupportedUnitError if it can't be parsed, or
+    UnitConversionError if it's a unit in the tables that can't be used
+    as a compound unit (like API gravity or a mass fraction)
+    """
+    table_unit = _table_unit(expression)
+    if table_unit is not None:
+        return table_unit
+    if not isinstance(expression, str):
+        raise NotSupportedUnitError(expression)
+    dimensions, scale = _parse(expression)
+    return CompoundUnit(expression, dimensions, scale)
+
+
+@lru_cache(maxsize=1024)
+def compile_conversion(from_unit, to_unit):
+    """
+    compile_conversion(from_unit, to_unit)
+
+    The Plan to convert between two units, either of which can be a
+    compound unit expression.
+
+    raises UnitConversionError if the units have different dimensions,
+    or no dimensions: "m/m" to "s/s" could be a ratio of anything.
+    """
+    from_compiled = compile_unit(from_unit)
+    to_compiled = compile_unit(to_unit)
+    if (from_compiled.dimensions != to_compiled.dimensions or
+            from_compiled.dimensions == (0, 0, 0)):
+        raise UnitConversionError("Cannot convert {0} to {1}"
+                                  .format(from_unit, to_unit))
+    return Plan([AffineStep(from_compiled.scale / to_compiled.scale)])
+
+
+def _table_unit(name):
+    """
+    The CompoundUnit for a unit in the tables, or None if it isn't one
+    (or is ambiguous).
+
+    raises UnitConversionError for units in the tables that aren't made of
+    length, mass and time -- "g/kg" is a mass fraction, not just a number
+    """
+    unit_type = UNIT_NAME_CACHE.lookup(name).unit_type
+    if unit_type is None:
+        return None
+    if unit_type not in DIMENSIONED_TYPES:
+        raise UnitConversionError("{} can't be used in a compound unit"
+                                  .format(name))
+    si_unit, dimensions = DIMENSIONED_TYPES[unit_type]
+    converter = get_converter(name, si_unit, unit_type)
+    if isinstance(converter, APIGravityConverter):
+        raise UnitConversionError("{} can't be used in a compound unit"
+                                  .format(name))
+    if isinstance(name, Unit):
+        name = name.primary_name
+    return CompoundUnit(name, dimensions, converter.scale)
+
+
+def _lookup_base(words):
+    """
+    (dimensions, scale) of a base unit name, or None if it isn't one
+    (or is in more than one of the tables, like "oz")
+    """
+    name = " ".join(words)
+    simple_name = Simplify(name)
+    found = []
+    for unit_type, dimensions in BASE_TYPES.items():
+        converter = Converters[unit_type]
+        primary = converter.Synonyms.get(simple_name)
+        if primary is not None:
+            found.append((dimensions, converter.Convertdata[primary]))
+    if not found:
+        # maybe it has an SI prefix: "ms"
+        unit_type = UNIT_NAME_CACHE.lookup(name).unit_type
+        if unit_type in BASE_TYPES:
+            found.append((BASE_TYPES[unit_type],
+                          get_unit(name, unit_type).scale))
+    return found[0] if len(found) == 1 else None
+
+
+def _tokenize(expression):
+    """
+    list of tokens: ["word", text, power], ["open"], ["close", power],
+    or ["op", "*" or "/"]
+    """
+    tokens = []
+    pos = 0
+    while pos < len(expression):
+        found = TOKEN_PATTERN.match(expression, pos)
+        if found is None:
+            raise NotSupportedUnitError(expression)
+        pos = found.end()
+        kind = found.lastgroup
+        text = found.group()
+        if kind == "space":
+            continue
+        if kind == "power":
+            if (not tokens or tokens[-1][0] not in ("word", "close") or
+                    tokens[-1][-1] is not None):
+                raise NotSupportedUnitError(expression)
+            power = text.translate(SUPERSCRIPTS).lstrip("^*").strip()
+            tokens[-1][-1] = int(power)
+        elif kind == "word" and text.lower() == "per":
+            tokens.append(["op", "/"])
+        elif kind == "word":
+            tokens.append(["word", text, None])
+        elif kind == "op":
+            tokens.append(["op", "/" if text == "/" else "*"])
+        elif kind == "open":
+            tokens.append(["open"])
+        else:
+            tokens.append(["close", None])
+    return tokens
+
+
+def _parse(expression):
+    """
+    (dimensions, scale) of a compound unit expression
+    """
+    tokens = _tokenize(expression)
+    try:
+        (dimensions, scale), pos = _parse_product(tokens, 0, expression)
+    except IndexError:
+        raise NotSupportedUnitError(expression)
+    if pos != len(tokens) or dimensions is None:
+        raise NotSupportedUnitError(expression)
+    return dimensions, scale
+
+
+def _parse_product(tokens, pos, expression):
+    """
+    parse factors until the end, or a close paren
+
+    returns ((dimensions, scale), position of the next token)
+    dimensions is None if there were no factors
+    """
+    dimensions = None
+    scale = 1.0
+    sign = 1
+    power = None  # from "square", "cubic"
+    while pos < len(tokens) and tokens[pos][0] != "close":
+        kind = tokens[pos][0]
+        if kind == "op":
+            if sign != 1 or power is not None:
+                raise NotSupportedUnitError(expression)
+            sign = -1 if tokens[pos][1] == "/" else 1
+            pos += 1
+            continue
+
+        if kind == "open":
+            (factor_dims, factor_scale), pos = _parse_product(tokens, pos + 1,
+                                                              expression)
+            if factor_dims is None or tokens[pos][0] != "close":
+                raise NotSupportedUnitError(expression)
+            exponent = tokens[pos][1]
+            pos += 1
+        else:
+            end = pos
+            while end < len(tokens) and tokens[end][0] == "word":
+                end += 1
+            match = _match_words(tokens, pos, end)
+            if match is None:
+                word = tokens[pos]
+                if (word[1].lower() in POWER_WORDS and word[2] is None
+                        and power is None):
+                    power = POWER_WORDS[word[1].lower()]
+                    pos += 1
+                    continue
+                raise NotSupportedUnitError(expression)
+            (factor_dims, factor_scale), pos = match
+            exponent = tokens[pos - 1][2]
+
+        if exponent is None:
+            exponent = 1
+        exponent *= sign * (power or 1)
+        if dimensions is None:
+            dimensions = (0, 0, 0)
+        dimensions = tuple(d + f * exponent
+                           for d, f in zip(dimensions, factor_dims))
+        scale *= factor_scale ** exponent
+        sign = 1
+        power = None
+
+    if sign != 1 or power is not None:
+        raise NotSupportedUnitError(expression)
+    return (dimensions, scale), pos
+
+
+def _match_words(tokens, start, end):
+    """
+    The longest run of words from start that is a base unit name --
+    only the last word can have a power.
+
+    returns ((dimensions, scale), position after the words), or None
+    """
+    for stop in range(end, start, -1):
+        if any(token[2] is not None for token in tokens[start:stop - 1]):
+            continue
+        found = _lookup_base([token[1] for token in tokens[start:stop]])
+        if found is not None:
+            return found, stop
+    return None
@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of whole CSV files
+
+The file is streamed through a chunk of rows at a time, so memory use
+doesn't depend on the size of the file. The conversion for each column
+is looked up once, before any rows are read.
+
+The columns to convert can be given explicitly::
+
+    convert_csv("in.csv", "out.csv",
+                columns={"Spilled": ("bbl", "m^3")})
+
+or the units can be taken from headers like ``Volume (bbl)``, with
+the unit to convert to given for each unit type::
+
+    convert_csv("in.csv", "out.csv",
+                to_units={"volume": "m^3", "discharge": "m^3/s"})
+
+The converted columns get their headers updated: ``Volume (m^3)``
+
+Also available from the command line::
+
+    python -m nucos convert-csv in.csv out.csv --to volume m^3
+"""
+
+import contextlib
+import csv
+import itertools
+import os
+import re
+
+from .unit_conversion import (get_converter,
+                              Simplify,
+                              UNIT_NAME_CACHE,
+                              )
+
+
+class RowError(ValueError):
+    """
+    A row that can't be converted
+
+    row: the row number
+    detail: what's wrong with it
+    """
+    def __init__(self, row, detail):
+        super().__init__(row, detail)
+        self.row = row
+        self.detail = detail
+
+    def __str__(self):
+        return "row {}, {}".format(self.row, self.detail)
+
+
+# "Volume (bbl)" or "Volume [bbl]"
+HEADER_UNIT_PATTERN = re.compile(
+    r"^(?P<name>.*?)\s*[(\[](?P<unit>[^()\[\]]+)[)\]]\s*$")
+
+
+def header_unit(header):
+    """
+    The unit in a column header like "Volume (bbl)", or None if
+    the header doesn't have one.
+    """
+    found = HEADER_UNIT_PATTERN.match(header)
+    if found is None:
+        return None
+    return found.group("unit").strip()
+
+
+def _replace_header_unit(header, unit):
+    found = HEADER_UNIT_PATTERN.match(header)
+    if found is None:
+        return header
+    return "{} ({})".format(found.group("name"), unit)
+
+
+def resolve_columns(header, columns=None, to_units=None):
+    """
+    resolve_columns(header, columns=None, to_units=None)
+
+    Work out the conversion for each column of a CSV file.
+
+    :param header: list of the column headers
+    :param columns=None: mapping of column header to (from_unit, to_unit)
+    :param to_units=None: mapping of unit type to the unit to convert to,
+                          for the columns with the unit in the header,
+                          like "Volume (bbl)".
+                          (columns not in the mapping are left alone)
+
+    :returns: (new_header, conversions): conversions is a list of
+              (column index, converter) -- see get_converter()
+
+    raises a ValueError if a column in ``columns`` is not in the header,
+    and the usual UnitConversionErrors for bad units.
+    """
+    columns = dict(columns or {})
+    to_units = {Simplify(unit_type): unit
+                for unit_type, unit in (to_units or {}).items()}
+
+    missing = set(columns) - set(header)
+    if missing:
+        raise ValueError("columns not in the file: {}".format(sorted(missing)))
+
+    new_header = list(header)
+    conversions = []
+    for index, name in enumerate(header):
+        if name in columns:
+            from_unit, to_unit = columns[name]
+        else:
+            from_unit = header_unit(name)
+            if from_unit is None:
+                continue
+            unit_type = UNIT_NAME_CACHE.lookup(from_unit).unit_type
+            if unit_type not in to_units:
+                continue
+            to_unit = to_units[unit_type]
+        conversions.append((index, get_converter(from_unit, to_unit)))
+        new_header[index] = _replace_header_unit(name, to_unit)
+
+    return new_header, conversions
+
+
+def convert_rows(rows, conversions, float_format=None, first_row=2):
+    """
+    convert_rows(rows, conversions, float_format=None, first_row=2)
+
+    Generator that converts the values in rows of strings, as read by
+    csv.reader.
+
+    :param rows: iterable of rows (lists of strings)
+    :param conversions: list of (column index, converter), as returned
+                        by resolve_columns()
+    :param float_format=None: format spec for the converted values,
+                              e.g. ".6g". The default is repr().
+    :param first_row=2: the row number of the first row, for the
+                        error messages.
+
+    Empty values are left empty -- anything else that isn't a number,
+    or a row that is too short to have the column, raises a RowError.
+    """
+    if float_format is None:
+        to_string = repr
+    else:
+        to_string = "{{:{}}}".format(float_format).format
+    for row_num, row in enumerate(rows, first_row):
+        for index, converter in conversions:
+            try:
+                value = row[index]
+            except IndexError:
+                raise RowError(row_num,
+                               "column {}: missing -- the row only has {} "
+                               "columns".format(index + 1, len(row)))
+            try:
+                row[index] = to_string(converter(float(value)))
+            except ValueError:
+                if not value.strip():
+                    continue
+                raise RowError(row_num, "column {}: {!r} is not a number"
+                                        .format(index + 1, value))
+        yield row
+
+
+def convert_csv(infile, outfile, columns=None, to_units=None,
+                float_format=None, chunk_size=10000, **fmtparams):
+    """
+    convert_csv(infile, outfile, columns=None, to_units=None,
+                float_format=None, chunk_size=10000, **fmtparams)
+
+    Convert the units of columns of a CSV file.
+
+    :param infile: filename or open (text) file to read
+    :param outfile: filename or open (text) file to write
+    :param columns=None: mapping of column header to (from_unit, to_unit)
+    :param to_units=None: mapping of unit type to the unit to convert to,
+                          for columns with the unit in the header.
+    :param float_format=None: format spec for the converted values,
+                              e.g. ".6g". The default is repr().
+    :param chunk_size=10000: number of rows to process at a time.
+
+    Any other keyword arguments (delimiter, etc.) are passed on to
+    csv.reader and csv.writer.
+
+    See resolve_columns() for the details of columns and to_units.
+
+    :returns: the number of rows converted
+    """
+    with _open(infile, "r") as infile, _open(outfile, "w") as outfile:
+        reader = csv.reader(infile, **fmtparams)
+        writer = csv.writer(outfile, **fmtparams)
+        try:
+            header = next(reader)
+        except StopIteration:
+            return 0
+        header, conversions = resolve_columns(header, columns, to_units)
+        writer.writerow(header)
+
+        rows = convert_rows(reader, conversions, float_format)
+        num_rows = 0
+        while True:
+            chunk = list(itertools.islice(rows, chunk_size))
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            num_rows += len(chunk)
+    return num_rows
+
+
+def _open(file, mode):
+    """
+    open a file by name, or pass an already open file through
+    (without closing it at the end)
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode, encoding="utf-8", newline="")
+    return contextlib.nullcontext(file)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python
+
+"""
+Unit conversion of large CSV and NDJSON files, in parallel
+
+The file is split into byte ranges on line boundaries, each range is
+converted in a separate process, and the results are written out in
+the original order.
+
+The conversion for each column (or NDJSON key) is resolved once, in
+the main process, and the resulting plan, with the converters, is sent
+to the workers, so they don't need to look anything up.
+
+Note: for CSV, this means that quoted values can't have newlines in
+them -- use ``csv_conversion.convert_csv()`` for files like that.
+
+NDJSON files have one JSON object per line. The keys are treated like
+CSV headers: the plan is made from the keys of the first object, and
+keys like ``"Volume (bbl)"`` are renamed with the new unit.
+"""
+
+import concurrent.futures
+import csv
+import io
+import json
+import os
+from collections import deque, namedtuple
+
+from .csv_conversion import resolve_columns, convert_rows, RowError, _open
+
+# what the workers need to convert a range of the file
+ConversionPlan = namedtuple("ConversionPlan", ["file_format",
+                                               "conversions",
+                                               "float_format",
+                                               "fmtparams",
+                                               ])
+
+FILE_FORMATS = {".csv": "csv",
+                ".ndjson": "ndjson",
+                ".jsonl": "ndjson",
+                }
+
+
+def file_format_from_name(filename):
+    ext = os.path.splitext(filename)[1].lower()
+    try:
+        return FILE_FORMATS[ext]
+    except KeyError:
+        raise ValueError("Can't tell the file format from the name: {}. "
+                         "Pass in file_format".format(filename))
+
+
+def make_plan(filename, file_format, columns=None, to_units=None,
+              float_format=None, **fmtparams):
+    """
+    make_plan(filename, file_format, columns=None, to_units=None,
+              float_format=None, **fmtparams)
+
+    Resolve the conversions for a file, from its header line
+    (or first record, for NDJSON).
+
+    :returns: (plan, header, data_start): the new header line to write,
+              and the byte offset where the data starts.
+    """
+    with open(filename, "rb") as infile:
+        first_line = infile.readline()
+        data_start = infile.tell()
+
+    if file_format == "csv":
+        header = next(csv.reader([first_line.decode("utf-8")], **fmtparams),
+                      [])
+        new_header, conversions = resolve_columns(header, columns, to_units)
+        output = io.StringIO(newline="")
+        csv.writer(output, **fmtparams).writerow(new_header)
+        header = output.getvalue() if header else ""
+    elif file_format == "ndjson":
+        keys = list(json.loads(first_line)) if first_line.strip() else []
+        new_keys, conversions = resolve_columns(keys, columns, to_units)
+        conversions = {keys[index]: (new_keys[index], converter)
+                       for index, converter in conversions}
+        header = ""
+        data_start = 0
+    else:
+        raise ValueError("file_format must be one of: {}"
+                         .format(sorted(set(FILE_FORMATS.values()))))
+
+    return (ConversionPlan(file_format, conversions, float_format, fmtparams),
+            header,
+            data_start)
+
+
+def split_ranges(filename, start=0, chunk_bytes=2**24):
+    """
+    Generator of (start, end) byte ranges of about chunk_bytes,
+    that start and end on line boundaries.
+    """
+    size = os.path.getsize(filename)
+    with open(filename, "rb") as infile:
+        while start < size:
+            end = start + chunk_bytes
+            if end >= size:
+                end = size
+            else:
+                infile.seek(end)
+                infile.readline()
+                end = infile.tell()
+            yield start, end
+            start = end
+
+
+def convert_range(filename, start, end, plan):
+    """
+    Convert the lines in bytes start:end of a file
+
+    This is what runs in the worker processes.
+
+    :returns: (converted text, number of rows)
+
+    Errors in a row give the row number in the whole file.
+    """
+    with open(filename, "rb") as infile:
+        infile.seek(start)
+        text = infile.read(end - start).decode("utf-8")
+    try:
+        if plan.file_format == "csv":
+            return _convert_csv_text(text, plan)
+        return _convert_ndjson_text(text, plan)
+    except RowError as err:
+        # the rows are numbered from the start of the range -- it's only
+        # worth counting the lines before it if there's an error
+        raise RowError(err.row + count_lines(filename, start), err.detail)
+    except ValueError as err:
+        raise ValueError("in bytes {}-{}: {}".format(start, end, err))
+
+
+def count_lines(filename, end, block_size=2**20):
+    """
+    The number of lines in the first end bytes of a file
+    """
+    num_lines = 0
+    with open(filename, "rb") as infile:
+        while end > 0:
+            block = infile.read(min(block_size, end))
+            if not block:
+                break
+            num_lines += block.count(b"\n")
+            end -= len(block)
+    return num_lines
+
+
+def _convert_csv_text(text, plan):
+    reader = csv.reader(io.StringIO(text, newline=""), **plan.fmtparams)
+    rows = list(convert_rows(reader, plan.conversions, plan.float_format,
+                             first_row=1))
+    output = io.StringIO(newline="")
+    csv.writer(output, **plan.fmtparams).writerows(rows)
+    return output.getvalue(), len(rows)
+
+
+def _convert_ndjson_text(text, plan):
+    lines = []
+    # only "\n" ends a line, as in split_ranges() -- JSON strings can
+    # have other line breaks in them, like U+2028
+    for row_num, line in enumerate(text.split("\n"), 1):
+        if not line.strip():
+            continue
+        try:
+            items = json.loads(line).items()
+        except (ValueError, AttributeError):
+            raise RowError(row_num, "not a JSON object")
+        record = {}
+        for key, value in items:
+            if key not in plan.conversions:
+                record[key] = value
+                continue
+            new_key, converter = plan.conversions[key]
+            if value is not None:
+                if (isinstance(value, bool)
+                        or not isinstance(value, (int, float))):
+                    raise RowError(row_num, "key {!r}: {!r} is not a number"
+                                            .format(key, value))
+                value = converter(value)
+            record[new_key] = value
+        lines.append(json.dumps(record))
+    return "".join(line + "\n" for line in lines), len(lines)
+
+
+def convert_file(infile, outfile, columns=None, to_units=None,
+                 file_format=None, float_format=None, workers=None,
+                 chunk_bytes=2**24, **fmtparams):
+    """
+    convert_file(infile, outfile, columns=None, to_units=None,
+                 file_format=None, float_format=None, workers=None,
+                 chunk_bytes=2**24, **fmtparams)
+
+    Convert the units of columns of a CSV or NDJSON file, in parallel.
+
+    :param infile: name of the file to read
+    :param outfile: filename or open (text) file to write
+    :param columns=None: mapping of column header (or key) to
+                         (from_unit, to_unit)
+    :param to_units=None: mapping of unit type to the unit to convert to,
+                          for columns with the unit in the header.
+    :param file_format=None: "csv" or "ndjson". If None, it's worked out
+                             from the extension of infile.
+    :param float_format=None: format spec for the converted CSV values,
+                              e.g. ".6g". The default is repr().
+                              (NDJSON values are always written in full)
+    :param workers=None: number of processes to use. None for the number
+                         of CPUs. With 1, it's all done in this process.
+    :param chunk_bytes=2**24: about how much of the file each process
+                              converts at a time.
+
+    Any other keyword arguments (delimiter, etc.) are passed on to
+    csv.reader and csv.writer.
+
+    See csv_conversion.resolve_columns() for the details of columns
+    and to_units.
+
+    :returns: the number of rows converted
+    """
+    if file_format is None:
+        file_format = file_format_from_name(infile)
+    plan, header, data_start = make_plan(infile, file_format,
+                                         columns, to_units,
+                                         float_format, **fmtparams)
+    ranges = split_ranges(infile, data_start, chunk_bytes)
+
+    num_rows = 0
+    with _open(outfile, "w") as outfile:
+        outfile.write(header)
+        for text, rows in _convert_ranges(infile, ranges, plan, workers):
+            outfile.write(text)
+            num_rows += rows
+    return num_rows
+
+
+def _convert_ranges(filename, ranges, plan, workers):
+    """
+    Generator of the converted ranges, in order.
+
+    Only a couple of ranges per worker are in flight at a time, so
+    memory use doesn't depend on the size of the file.
+    """
+    if workers == 1:
+        for start, end in ranges:
+            yield convert_range(filename, start, end, plan)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(workers) as executor:
+        max_pending = 2 * workers
+        pending = deque()
+        for start, end in ranges:
+            pending.append(executor.submit(convert_range,
+                                           filename, start, end, plan))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -10,6 +10,20 @@ import math
 import struct
 
 
+def _get_numpy():
+    """
+    numpy is optional, and only imported when the array functions are used
+    (so it doesn't slow down importing nucos)
+
+    returns the numpy module, or None if it's not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
 def signbit(value):
     """
     Test whether the sign bit of the given floating-point value is
@@ -78,6 +92,17 @@ class LatLongConverter(object):
     if ``ustring`` is True, the result will be a string,
     formatted nicely with Unicode, rather than numbers.
 
+    There are also array versions, for converting many coordinates at once:
+
+    ``ToDecDegArray(self, d=0, m=0, s=0, max=180)``
+
+    ``ToDegMinArray(self, DecDegrees)``
+
+    ``ToDegMinSecArray(self, DecDegrees)``
+
+    These don't raise on invalid values: they return a mask of which
+    values are valid as well, and the invalid values are NaN.
+    (they use numpy if it's there -- otherwise lists are returned)
     """
 
     @classmethod
@@ -185,9 +210,154 @@ class LatLongConverter(object):
         else:
             return (Sign * float(Degrees), Minutes, Seconds)
 
+    @classmethod
+    def ToDecDegArray(self, d=0, m=0, s=0, max=180):
+        """
+        DecDegrees, valid = ToDecDegArray(d=0, m=0, s=0, max=180)
+
+        converts arrays of degrees, minutes, seconds to decimal degrees
+
+        The same rules as ToDecDeg() are applied to each value, but rather
+        than raising, the invalid ones are NaN, and False in ``valid``.
+
+        d, m, and s can be any shape, as long as they broadcast together.
+        """
+        np = _get_numpy()
+        if np is None:
+            return _loop_to_dec_deg(d, m, s, max)
+
+        d, m, s = np.broadcast_arrays(np.asarray(d, dtype=np.float64),
+                                      np.asarray(m, dtype=np.float64),
+                                      np.asarray(s, dtype=np.float64))
+        sign = np.where(np.signbit(d), -1.0, 1.0)
+        d = np.abs(d)
+
+        deg_has_fract = np.modf(d)[0] != 0.0
+        min_has_fract = np.modf(m)[0] != 0.0
+        valid = ((m >= 0.0) & (s >= 0.0) &
+                 (m <= 60.0) & (s <= 60.0) &
+                 (d <= max) &
+                 ~(deg_has_fract & ((m != 0.0) | (s != 0.0))) &
+                 ~(min_has_fract & (s != 0.0)) &
+                 np.isfinite(d))
+
+        DecDegrees = np.where(valid, sign * (d + m / 60.0 + s / 3600.0), np.nan)
+
+        return DecDegrees, valid
+
+    @classmethod
+    def ToDegMinArray(self, DecDegrees):
+        """
+        Degrees, Minutes, valid = ToDegMinArray(DecDegrees)
+
+        Converts an array of decimal degrees to degrees, minutes,
+        the same way as ToDegMin()
+
+        Non-finite values are NaN, and False in ``valid``.
+        """
+        np = _get_numpy()
+        if np is None:
+            return _loop_from_dec_deg(self.ToDegMin, DecDegrees, 2)
+
+        Sign, DecDegrees, valid = _split_sign(DecDegrees)
+        Degrees = np.trunc(DecDegrees)
+
+        # add a tiny bit then round to avoid binary rounding issues
+        # (inf - inf is NaN: those are already flagged as not valid)
+        with np.errstate(invalid='ignore'):
+            DecMinutes = np.round((DecDegrees - Degrees + 1e-14) * 60, 10)
+
+        return np.where(valid, Sign * Degrees, np.nan), DecMinutes, valid
+
+    @classmethod
+    def ToDegMinSecArray(self, DecDegrees):
+        """
+        Degrees, Minutes, Seconds, valid = ToDegMinSecArray(DecDegrees)
+
+        Converts an array of decimal degrees to degrees, minutes, seconds,
+        the same way as ToDegMinSec()
+
+        Minutes is returned as a float array, so that invalid values
+        can be NaN.
+        """
+        np = _get_numpy()
+        if np is None:
+            return _loop_from_dec_deg(self.ToDegMinSec, DecDegrees, 3)
+
+        Sign, DecDegrees, valid = _split_sign(DecDegrees)
+        Degrees = np.trunc(DecDegrees)
+
+        # add a tiny bit to avoid rounding issues
+        with np.errstate(invalid='ignore'):
+            DecMinutes = (DecDegrees - Degrees + 1e-14) * 60
+
+            Minutes = np.trunc(DecMinutes)
+            Seconds = np.round((DecMinutes - Minutes) * 60, 10)
+
+        return (np.where(valid, Sign * Degrees, np.nan),
+                np.where(valid, Minutes, np.nan),
+                Seconds,
+                valid)
+
+
+def _split_sign(DecDegrees):
+    """
+    returns the sign (from the sign bit, so -0.0 is negative),
+    the absolute values and the validity mask for an array of degrees
+    """
+    np = _get_numpy()
+    DecDegrees = np.asarray(DecDegrees, dtype=np.float64)
+    valid = np.isfinite(DecDegrees)
+    Sign = np.where(np.signbit(DecDegrees), -1.0, 1.0)
+    return Sign, np.abs(DecDegrees), valid
+
+
+# The pure Python versions of the array methods, for when there's no numpy
+def _loop_to_dec_deg(d, m, s, max):
+    args = [arg if isinstance(arg, (int, float)) else list(arg)
+            for arg in (d, m, s)]
+    lengths = {len(arg) for arg in args if isinstance(arg, list)}
+    if len(lengths) > 1:
+        raise ValueError("d, m, and s must all be the same length")
+    num = lengths.pop() if lengths else 1
+    args = [[arg] * num if isinstance(arg, (int, float)) else arg
+            for arg in args]
+
+    DecDegrees = []
+    valid = []
+    for d, m, s in zip(*args):
+        try:
+            DecDegrees.append(LatLongConverter.ToDecDeg(d, m, s, max=max))
+            valid.append(math.isfinite(d))
+        except ValueError:
+            DecDegrees.append(float('nan'))
+            valid.append(False)
+    return DecDegrees, valid
+
+
+def _loop_from_dec_deg(method, DecDegrees, num):
+    results = [[] for _ in range(num)]
+    valid = []
+    for value in DecDegrees:
+        try:
+            parts = method(value)
+        except (ValueError, OverflowError):
+            parts = (float('nan'),) * num
+        for result, part in zip(results, parts):
+            result.append(float(part))
+        valid.append(math.isfinite(parts[0]))
+    return tuple(results) + (valid,)
+
 
 # These are classes used in our web apps: ResponseLink, etc.
 # They provide a different interface to lat-long format conversion
+# the formats used by Latitude.format(), etc.
+OBJECT_FORMATS = {1: u'''%0.2f\xb0 %s''',
+                  2: u'''%d\xb0 %0.2f' %s''',
+                  3: u'''%d\xb0 %d' %0.2f" %s''',
+                  }
+
+
 class Latitude(object):
     """An object that can interpret a latitude in various formats.
 
@@ -295,11 +465,11 @@ class Latitude(object):
         """
 
         if style == 1:
-            return u'''%0.2f\xb0 %s''' % self.degrees()
+            return OBJECT_FORMATS[1] % self.degrees()
         elif style == 2:
-            return u'''%d\xb0 %0.2f' %s''' % self.degrees_minutes()
+            return OBJECT_FORMATS[2] % self.degrees_minutes()
         elif style == 3:
-            return u'''%d\xb0 %d' %0.2f" %s''' % self.degrees_minutes_seconds()
+            return OBJECT_FORMATS[3] % self.degrees_minutes_seconds()
         else:
             raise ValueError("style must be 1, 2, or 3")
 
@@ -348,6 +518,223 @@ class DummyLongitude(DummyLatitude):
     pass
 
 
+class CoordinateArray(object):
+    """
+    A whole array of latitudes or longitudes -- e.g. a trajectory
+
+    This is the array version of Latitude / Longitude: rather than
+    a Python object per point, the values are stored as decimal degrees
+    in a single contiguous buffer of doubles: a numpy array if numpy is
+    installed, otherwise a memoryview of an array.array.
+
+    Use the LatitudeArray or LongitudeArray subclasses.
+
+       Constructor:
+       LatitudeArray(deg, min=0.0, sec=0.0, direction=None)
+           - deg, min, and sec are arrays (or scalars) that broadcast
+             together, following the same rules as Latitude.
+           - 'direction' may be None, or a string beginning with the
+             direction letter, which applies to all the values.
+           - raises ValueError if any of the values are not valid
+
+       Attributes:
+       .values : the buffer of decimal degrees
+
+       Methods:
+       .direction() -> list of str
+       .degrees() -> (array, list of str)
+       .degrees_minutes() -> (array, array, list of str)
+       .degrees_minutes_seconds() -> (array, array, array, list of str)
+       .format(style) -> list of str
+
+       Indexing gives a Latitude / Longitude object, slicing gives
+       another array that is a view on the same buffer.
+    """
+    negative_direction = None
+    positive_direction = None
+    max = None
+    scalar_class = None
+
+    def __init__(self, deg, min=0.0, sec=0.0, direction=None):
+        if direction:
+            deg = _apply_direction(deg, direction,
+                                   self.positive_direction,
+                                   self.negative_direction)
+
+        values, valid = LatLongConverter.ToDecDegArray(deg, min, sec,
+                                                       max=self.max)
+        _check_valid(valid, "values")
+
+        np = _get_numpy()
+        if np is None:
+            import array
+
+            self.values = memoryview(array.array('d', values))
+        else:
+            self.values = np.atleast_1d(values)
+            if self.values.ndim != 1:
+                raise ValueError("values must be one dimensional")
+
+    @classmethod
+    def from_strings(cls, strings):
+        """
+        Create an array from strings, like "48° 12.5' N"
+
+        See parse_latlon_array for the formats understood.
+        """
+        directions = {cls.positive_direction.lower(): 1,
+                      cls.positive_direction[0].lower(): 1,
+                      cls.negative_direction.lower(): -1,
+                      cls.negative_direction[0].lower(): -1,
+                      }
+        values, valid = parse_latlon_array(strings, max=cls.max,
+                                           directions=directions)
+        _check_valid(valid, "strings")
+        return cls(values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            view = self.__class__.__new__(self.__class__)
+            view.values = self.values[index]
+            return view
+        return self.scalar_class(self.values[index])
+
+    def __iter__(self):
+        for value in self.values:
+            yield self.scalar_class(value)
+
+    def __repr__(self):
+        return "%s(%d values)" % (self.__class__.__name__, len(self))
+
+    def _abs(self):
+        np = _get_numpy()
+        if np is None:
+            return [abs(value) for value in self.values]
+        return np.abs(self.values)
+
+    def direction(self):
+        np = _get_numpy()
+        if np is None:
+            return [self.negative_direction if value < 0.0
+                    else self.positive_direction for value in self.values]
+        return np.where(self.values < 0.0,
+                        self.negative_direction,
+                        self.positive_direction).tolist()
+
+    def degrees(self):
+        return self._abs(), self.direction()
+
+    def degrees_minutes(self):
+        deg, _min, valid = LatLongConverter.ToDegMinArray(self._abs())
+
+        return deg, _min, self.direction()
+
+    def degrees_minutes_seconds(self):
+        deg, _min, sec, valid = LatLongConverter.ToDegMinSecArray(self._abs())
+
+        return deg, _min, sec, self.direction()
+
+    def format(self, style):
+        """
+        format(style)
+
+        returns a list of the formatted values, the same as
+        Latitude.format() would give for each one.
+
+        style is one of:
+        1:  decimal degrees
+        2:  degrees, decimal minutes
+        3:  degrees, minutes, seconds
+        """
+        if style == 1:
+            columns = self.degrees()
+        elif style == 2:
+            columns = self.degrees_minutes()
+        elif style == 3:
+            columns = self.degrees_minutes_seconds()
+        else:
+            raise ValueError("style must be 1, 2, or 3")
+
+        template = OBJECT_FORMATS[style]
+        columns = [column.tolist() if hasattr(column, "tolist") else column
+                   for column in columns]
+        return [template % row for row in zip(*columns)]
+
+    def format_html(self, style):
+        """
+        format_html(style)
+
+        list version of Latitude.format_html()
+        """
+        return [string.replace(u"\xb0", u"&deg;")
+                for string in self.format(style)]
+
+
+def _check_valid(valid, name):
+    np = _get_numpy()
+    if np is None:
+        num_invalid = list(valid).count(False)
+    else:
+        num_invalid = np.size(valid) - np.count_nonzero(valid)
+    if num_invalid:
+        raise ValueError("{} of the {} are not valid".format(num_invalid, name))
+
+
+def _apply_direction(deg, direction, positive_direction, negative_direction):
+    """
+    makes the degrees negative for the negative direction,
+    following the rules in Latitude.__init__
+    """
+    ndir = negative_direction[0].upper()
+    pdir = positive_direction[0].upper()
+    np = _get_numpy()
+    if np is None:
+        deg = list(deg) if hasattr(deg, "__iter__") else [deg]
+        negative = any(value < 0.0 for value in deg)
+    else:
+        deg = np.asarray(deg, dtype=np.float64)
+        negative = (deg < 0.0).any()
+    if negative:
+        raise ValueError("degrees cannot be negative if direction is specified")
+
+    if direction[0].upper() == pdir:
+        return deg
+    elif direction[0].upper() == ndir:
+        if np is None:
+            return [-value for value in deg]
+        return -deg
+    else:
+        msg = "direction must start with %r or %r" % (pdir, ndir)
+        raise ValueError(msg)
+
+
+class LatitudeArray(CoordinateArray):
+    """See CoordinateArray docstring.
+
+       Positive is North; negative is South. Degrees must be between
+       -90.0 and 90.0
+    """
+    negative_direction = "South"
+    positive_direction = "North"
+    max = 90.0
+    scalar_class = Latitude
+
+
+class LongitudeArray(CoordinateArray):
+    """See CoordinateArray docstring.
+
+       Positive is East; negative is West. Degrees must be between
+       -180.0 and 180.0
+    """
+    negative_direction = "West"
+    positive_direction = "East"
+    max = 180.0
+    scalar_class = Longitude
+
+
 # The new simple API
 # -- just methods that do what we need for ResponseLink, etc.
 DEGREES = "\xb0"     # "DEGREE SIGN"
@@ -378,24 +765,27 @@ def reduce_base_60(f):
     return whole, fract
 
 
-def format_latlon1(f, positive_direction, negative_direction):
+def format_latlon1(f, positive_direction, negative_direction,
+                   template=FORMAT1):
     direction = positive_direction if f >= 0.0 else negative_direction
-    return FORMAT1.format(degrees, direction)
+    return template.format(abs(f), direction)
 
 
-def format_latlon2(f, positive_direction, negative_direction):
+def format_latlon2(f, positive_direction, negative_direction,
+                   template=FORMAT2):
     direction = positive_direction if f >= 0.0 else negative_direction
     degrees, minutes = reduce_base_60(f)
     degrees = abs(degrees)
-    return FORMAT2.format(degrees, minutes, direction)
+    return template.format(degrees, minutes, direction)
 
 
-def format_latlon3(f, positive_direction, negative_direction):
+def format_latlon3(f, positive_direction, negative_direction,
+                   template=FORMAT3):
     direction = positive_direction if f >= 0.0 else negative_direction
     degrees, minutes = reduce_base_60(f)
     minutes, seconds = reduce_base_60(minutes)
     degrees = abs(degrees)
-    return FORMAT3.format(degrees, minutes, seconds, direction)
+    return template.format(degrees, minutes, seconds, direction)
 
 
 def format_lat_d(degrees):
@@ -435,7 +825,7 @@ def format_lon_d(degrees):
 
     example::
       In [4]: nucos.format_lon(-33.2)
-      Out[4]: '33.2° West'
+      Out[4]: '33.20° West'
 
     :param degrees: degrees of longitude -- negative is South
     :type degrees: float
@@ -443,7 +833,7 @@ def format_lon_d(degrees):
     :returns: string version of longitude
     """
 
-    return format_latlon2(degrees, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION)
+    return format_latlon1(degrees, LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION)
 
 
 def format_lon_dm(degrees):
@@ -472,3 +862,210 @@ def format_lon_dms(f):
 
 format_lat = format_lat_dm
 format_lon = format_lon_dm
+
+
+# formatting whole arrays of values at once
+
+HTML_DEGREES = "&deg;"
+
+# style name: (scalar formatter, template)
+FORMAT_STYLES = {"d": (format_latlon1, FORMAT1),
+                 "dm": (format_latlon2, FORMAT2),
+                 "dms": (format_latlon3, FORMAT3),
+                 }
+
+
+def format_latlon_array(values, style, positive_direction, negative_direction,
+                        html=False):
+    """
+    Format a whole array of floating point numbers as latitude or longitude
+
+    The strings are exactly the same as the scalar format_latlon* functions
+    produce, but with numpy the base 60 reduction is done on the whole
+    array at once.
+
+    :param values: degrees -- numpy array, or any iterable of numbers
+    :param style: one of "d" (decimal degrees), "dm" (degrees, decimal
+                  minutes) or "dms" (degrees, minutes, seconds)
+    :param html=False: if True, use "&deg;" for the degree sign.
+
+    :returns: list of strings
+    """
+    try:
+        formatter, template = FORMAT_STYLES[style]
+    except KeyError:
+        raise ValueError("style must be one of: {}".format(list(FORMAT_STYLES)))
+    if html:
+        template = template.replace(DEGREES, HTML_DEGREES)
+
+    np = _get_numpy()
+    if np is None:
+        return [formatter(f, positive_direction, negative_direction, template)
+                for f in values]
+
+    if iter(values) is values:  # an iterator, rather than a sequence
+        values = list(values)
+    values = np.asarray(values, dtype=np.float64).ravel()
+    directions = np.where(values >= 0.0,
+                          positive_direction,
+                          negative_direction).tolist()
+    if style == "d":
+        columns = (np.abs(values),)
+    else:
+        degrees, minutes = _reduce_base_60_array(values)
+        if style == "dm":
+            columns = (np.abs(degrees), minutes)
+        else:
+            minutes, seconds = _reduce_base_60_array(minutes)
+            columns = (np.abs(degrees), minutes, seconds)
+    columns = [column.tolist() for column in columns]
+    return list(map(template.format, *columns, directions))
+
+
+def _reduce_base_60_array(f):
+    """
+    array version of reduce_base_60 -- same operations, so same results
+    """
+    np = _get_numpy()
+    fract, whole = np.modf(f)
+    fract = np.abs(fract)
+    fract += 1e-14
+    fract *= 60
+    return whole, np.round(fract, 10, out=fract)
+
+
+def format_lat_array(values, style="dm", html=False):
+    """
+    Format an array of degrees of latitude -- negative is South
+
+    See format_latlon_array for the parameters
+    """
+    return format_latlon_array(values, style,
+                               LAT_POSITIVE_DIRECTION, LAT_NEGATIVE_DIRECTION,
+                               html)
+
+
+def format_lon_array(values, style="dm", html=False):
+    """
+    Format an array of degrees of longitude -- negative is West
+
+    See format_latlon_array for the parameters
+    """
+    return format_latlon_array(values, style,
+                               LON_POSITIVE_DIRECTION, LON_NEGATIVE_DIRECTION,
+                               html)
+
+
+# parsing strings into decimal degrees
+
+_NUMBER = r"(\d+(?:\.\d*)?|\.\d+)"
+_DIRECTION = r"(?i:north|south|east|west|[nsew])"
+
+# degrees, with optional minutes and seconds, with or without the
+# degree, minute and second symbols, and a sign or a direction, e.g.:
+#   "48° 12.5' N", "-122 30 15", "28° 13′ 7.00″ North", "N 45.5°"
+#
+# It's compiled the first time it's used, as importing re and compiling
+# it is a good part of the time to import nucos
+_LATLON_PATTERN = r"""
+    \s* (?P<dir1>{dir})?
+    \s* (?P<sign>[-+])?
+    \s* (?P<deg>{num}) \s* (?:\xb0|\xba|&deg;)?
+    (?: \s* (?P<min>{num}) \s* [′']?
+        (?: \s* (?P<sec>{num}) \s* (?:″|"|'')? )?
+    )?
+    \s* (?P<dir2>{dir})? \s*
+    """.format(num=_NUMBER, dir=_DIRECTION)
+
+LAT_DIRECTIONS = {"n": 1, "north": 1, "s": -1, "south": -1}
+LON_DIRECTIONS = {"e": 1, "east": 1, "w": -1, "west": -1}
+LATLON_DIRECTIONS = dict(LAT_DIRECTIONS, **LON_DIRECTIONS)
+
+
+def _latlon_pattern():
+    """
+    LATLON_PATTERN, compiled the first time it's needed
+    """
+    try:
+        return globals()["LATLON_PATTERN"]
+    except KeyError:
+        import re
+        # save it in the module, so this is only done once
+        pattern = globals()["LATLON_PATTERN"] = re.compile(_LATLON_PATTERN,
+                                                           re.VERBOSE)
+        return pattern
+
+
+def __getattr__(name):
+    if name != "LATLON_PATTERN":
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    return _latlon_pattern()
+
+
+def parse_latlon_array(strings, max=180, directions=LATLON_DIRECTIONS):
+    """
+    Parse a whole array of latitude or longitude strings to decimal degrees
+
+    Understands what the format_* functions and Latitude.format() produce,
+    as well as simpler forms: "48° 12.5' N", "-122 30 15", etc.
+
+    Strings that can't be parsed, or that aren't valid coordinates
+    (see ``LatLongConverter.ToDecDeg``) don't raise: they are flagged in
+    the returned valid mask, and set to NaN.
+
+    :param strings: iterable of strings
+    :param max=180: the largest valid number of degrees
+    :param directions: mapping of the allowed directions (lower case)
+                       to 1 or -1
+
+    :returns: (DecDegrees, valid) -- numpy arrays, or lists if numpy
+              is not installed
+    """
+    match = _latlon_pattern().fullmatch
+    nan = float('nan')
+    degrees = []
+    minutes = []
+    seconds = []
+    for string in strings:
+        found = match(string) if isinstance(string, str) else None
+        if found is None:
+            degrees.append(nan)
+            minutes.append(0.0)
+            seconds.append(0.0)
+            continue
+        dir1, sign, deg, mins, secs, dir2 = found.group("dir1", "sign",
+                                                        "deg", "min",
+                                                        "sec", "dir2")
+        deg = float(deg)
+        direction = dir1 or dir2
+        if direction is None:
+            if sign == "-":
+                deg = -deg
+        elif sign or (dir1 and dir2) or direction.lower() not in directions:
+            deg = nan
+        elif directions[direction.lower()] < 0:
+            deg = -deg
+        degrees.append(deg)
+        minutes.append(float(mins) if mins else 0.0)
+        seconds.append(float(secs) if secs else 0.0)
+
+    return LatLongConverter.ToDecDegArray(degrees, minutes, seconds, max=max)
+
+
+def parse_lat_array(strings):
+    """
+    Parse an array of latitude strings -- South is negative
+
+    See parse_latlon_array for details
+    """
+    return parse_latlon_array(strings, max=90, directions=LAT_DIRECTIONS)
+
+
+def parse_lon_array(strings):
+    """
+    Parse an array of longitude strings -- West is negative
+
+    See parse_latlon_array for details
+    """
+    return parse_latlon_array(strings, max=180, directions=LON_DIRECTIONS)
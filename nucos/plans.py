@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+
+"""
+Conversion plans: conversions that can be chained, fused and inverted
+
+Every conversion nucos does is affine -- ``value * scale + offset`` --
+except those to or from API gravity. A Plan is a list of steps, where
+adjacent affine steps are always fused into one, so a chain of any
+number of conversions is a single multiply-add::
+
+    plan = get_plan("ft", "m").then(get_plan("m", "km"))
+    plan.scale, plan.offset
+
+API gravity can't be fused: it shows up as a BarrierStep, with the
+affine steps on either side of it fused as far as they can be::
+
+    plan = get_plan("API", "kg/m^3").then(get_plan("kg/m^3", "lb/ft^3"))
+    # Plan(BarrierStep('api_to_sg'), AffineStep(scale=..., offset=0.0))
+
+``plan.simplify()`` drops steps that do nothing (to within floating
+point error) -- so that a plan followed by its inverse (even through
+API gravity) is empty.
+"""
+
+from collections import namedtuple
+from math import isclose
+
+from .unit_conversion import get_converter, APIGravityConverter
+
+
+class AffineStep(namedtuple("AffineStep", ["scale", "offset"])):
+    """
+    A conversion step of the form: ``value * scale + offset``
+    """
+    __slots__ = ()
+
+    def __new__(cls, scale=1.0, offset=0.0):
+        return super().__new__(cls, scale, offset)
+
+    def __call__(self, value):
+        if self.offset:
+            return value * self.scale + self.offset
+        return value * self.scale
+
+    def then(self, other):
+        """
+        The single step that does this step, then the other one
+        """
+        return AffineStep(self.scale * other.scale,
+                          self.offset * other.scale + other.offset)
+
+    def inverse(self):
+        if not self.scale:
+            raise ValueError("An AffineStep with a scale of zero "
+                             "can't be inverted")
+        return AffineStep(1.0 / self.scale, -self.offset / self.scale)
+
+    def is_identity(self, rel_tol=0.0):
+        return (isclose(self.scale, 1.0, rel_tol=rel_tol) and
+                isclose(self.offset, 0.0, abs_tol=rel_tol))
+
+    def _apply_inplace(self, np, values):
+        np.multiply(values, self.scale, out=values)
+        if self.offset:
+            np.add(values, self.offset, out=values)
+
+
+def _api_to_sg(value):
+    return 141.5 / (value + 131.5)
+
+
+def _sg_to_api(value):
+    return 141.5 / value - 131.5
+
+
+def _api_to_sg_inplace(np, values):
+    np.add(values, 131.5, out=values)
+    np.divide(141.5, values, out=values)
+
+
+def _sg_to_api_inplace(np, values):
+    np.divide(141.5, values, out=values)
+    np.subtract(values, 131.5, out=values)
+
+
+# name: (function, in-place numpy version, name of the inverse)
+BARRIERS = {"api_to_sg": (_api_to_sg, _api_to_sg_inplace, "sg_to_api"),
+            "sg_to_api": (_sg_to_api, _sg_to_api_inplace, "api_to_sg"),
+            }
+
+
+class BarrierStep(namedtuple("BarrierStep", ["name"])):
+    """
+    A conversion step that isn't affine, so other steps can't be fused
+    across it -- one of the ones in BARRIERS.
+    """
+    __slots__ = ()
+
+    def __new__(cls, name):
+        if name not in BARRIERS:
+            raise ValueError("{!r} is not a known barrier step: {}"
+                             .format(name, sorted(BARRIERS)))
+        return super().__new__(cls, name)
+
+    def __call__(self, value):
+        return BARRIERS[self.name][0](value)
+
+    def inverse(self):
+        return BarrierStep(BARRIERS[self.name][2])
+
+    def _apply_inplace(self, np, values):
+        BARRIERS[self.name][1](np, values)
+
+
+class Plan:
+    """
+    A chain of conversion steps, with adjacent affine steps fused.
+
+    Plans are callable, like the converters from ``get_converter()``,
+    and if a plan is affine (no barriers), it has ``scale`` and ``offset``
+    attributes too, so it can be used anywhere they can.
+    """
+    __slots__ = ("steps",)
+
+    def __init__(self, steps=()):
+        """
+        :param steps: a sequence of AffineStep and BarrierStep objects
+        """
+        self.steps = _fuse(steps)
+
+    @classmethod
+    def from_converter(cls, converter):
+        """
+        The Plan for a converter from ``get_converter()``
+        """
+        if isinstance(converter, Plan):
+            return converter
+        if isinstance(converter, (AffineStep, BarrierStep)):
+            return cls([converter])
+        if isinstance(converter, APIGravityConverter):
+            steps = [AffineStep(converter.scale)]
+            if converter.from_api:
+                steps.insert(0, BarrierStep("api_to_sg"))
+            if converter.to_api:
+                steps.append(BarrierStep("sg_to_api"))
+            return cls(steps)
+        return cls([AffineStep(converter.scale, converter.offset)])
+
+    def __call__(self, value):
+        for step in self.steps:
+            value = step(value)
+        return value
+
+    def __len__(self):
+        return len(self.steps)
+
+    def __iter__(self):
+        return iter(self.steps)
+
+    def __eq__(self, other):
+        if not isinstance(other, Plan):
+            return NotImplemented
+        return self.steps == other.steps
+
+    def __hash__(self):
+        return hash(self.steps)
+
+    def __repr__(self):
+        return "Plan({})".format(", ".join(map(repr, self.steps)))
+
+    @property
+    def is_affine(self):
+        return all(isinstance(step, AffineStep) for step in self.steps)
+
+    @property
+    def scale(self):
+        return self._affine_step().scale
+
+    @property
+    def offset(self):
+        return self._affine_step().offset
+
+    def _affine_step(self):
+        if not self.is_affine:
+            raise ValueError("{!r} is not affine: it has no scale and offset"
+                             .format(self))
+        return self.steps[0] if self.steps else AffineStep()
+
+    def then(self, *others):
+        """
+        then(*others)
+
+        The Plan that does this one, then each of the others in turn.
+
+        :param others: Plans, steps, or converters from ``get_converter()``
+        """
+        steps = list(self.steps)
+        for other in others:
+            steps.extend(Plan.from_converter(other).steps)
+        return Plan(steps)
+
+    def inverse(self):
+        """
+        The Plan that undoes this one
+        """
+        return Plan([step.inverse() for step in reversed(self.steps)])
+
+    def simplify(self, rel_tol=1e-12):
+        """
+        simplify(rel_tol=1e-12)
+
+        The same Plan, without the steps that (to within rel_tol) do
+        nothing: affine steps that are an identity, and barriers followed
+        by their inverse.
+        """
+        return Plan(_fuse(self.steps, rel_tol, cancel_barriers=True))
+
+    def apply(self, arr, out=None, dtype=None):
+        """
+        apply(arr, out=None, dtype=None)
+
+        Apply the plan to a whole array: one multiply-add per affine step,
+        done in place in the output array.
+
+        See ``array_conversion.convert_array()`` for the parameters.
+        """
+        # imported here, so numpy isn't imported with nucos
+        from . import array_conversion
+
+        np = array_conversion.np
+        if self.is_affine or np is None:
+            return array_conversion.apply_converter(self, arr, out, dtype)
+
+        first = self.steps[0]
+        if isinstance(first, AffineStep):
+            rest = self.steps[1:]
+        else:
+            first, rest = AffineStep(), self.steps
+        result = array_conversion.apply_converter(first, arr, out, dtype)
+        values = np.asarray(result)
+        for step in rest:
+            step._apply_inplace(np, values)
+        return result
+
+
+def _fuse(steps, rel_tol=0.0, cancel_barriers=False):
+    """
+    fuse adjacent affine steps, and drop the ones that do nothing
+    """
+    fused = []
+    for step in steps:
+        if isinstance(step, AffineStep):
+            if fused and isinstance(fused[-1], AffineStep):
+                step = fused.pop().then(step)
+            if not step.is_identity(rel_tol):
+                fused.append(step)
+        elif not isinstance(step, BarrierStep):
+            raise TypeError("Plan steps must be AffineStep or BarrierStep, "
+                            "not {!r}".format(step))
+        elif cancel_barriers and fused and fused[-1] == step.inverse():
+            fused.pop()
+        else:
+            fused.append(step)
+    return tuple(fused)
+
+
+def get_plan(from_unit, to_unit, unit_type=None):
+    """
+    get_plan(from_unit, to_unit, unit_type=None)
+
+    The Plan for a conversion -- see get_converter() for the parameters.
+    """
+    return Plan.from_converter(get_converter(from_unit, to_unit, unit_type))
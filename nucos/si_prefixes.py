@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+
+"""
+SI prefixes (nano ... giga) for the metric units
+
+Prefixed units aren't listed in unit_data.py -- they are worked out
+when they are looked up (and then remembered), so any prefix can be
+used with the units that take one:
+
+    nanometer, nm, gigapascal, GPa, megatonne, µl, ul, ...
+
+Names in the tables always come first: "nm" is a nautical mile, and
+as names are case insensitive, "Mm" is a millimeter, not a megameter.
+"""
+
+# prefix: (symbol, factor)
+PREFIXES = {"nano": ("n", 1e-9),
+            "micro": ("\N{MICRO SIGN}", 1e-6),
+            "milli": ("m", 1e-3),
+            "centi": ("c", 1e-2),
+            "deci": ("d", 1e-1),
+            "deca": ("da", 1e1),
+            "hecto": ("h", 1e2),
+            "kilo": ("k", 1e3),
+            "mega": ("M", 1e6),
+            "giga": ("G", 1e9),
+            }
+
+# the ways each prefix can be written, as the start of a name
+PREFIX_NAMES = dict({name: name for name in PREFIXES}, deka="deca")
+
+# symbols are case sensitive -- "da" has to be checked before "d"
+PREFIX_SYMBOLS = {"da": "deca",
+                  "n": "nano",
+                  "\N{MICRO SIGN}": "micro",
+                  "\N{GREEK SMALL LETTER MU}": "micro",
+                  "u": "micro",
+                  "m": "milli",
+                  "c": "centi",
+                  "d": "deci",
+                  "h": "hecto",
+                  "k": "kilo",
+                  "M": "mega",
+                  "G": "giga",
+                  }
+
+# the units that can have a prefix:
+# unit type: {simplified primary name: (name, symbol) to put the prefix on}
+# (symbol is None if the prefixed symbols would clash with other units --
+# a prefixed symbol that is another unit, like "nm", isn't used either)
+PREFIXABLE = {"length": {"meter": ("meter", "m")},
+              "mass": {"gram": ("gram", "g"),
+                       "metricton(tonne)": ("tonne", None),
+                       },
+              "time": {"second": ("second", "s")},
+              "volume": {"liter": ("liter", "l")},
+              "pressure": {"pascal": ("pascal", "Pa"),
+                           "bar": ("bar", "bar"),
+                           },
+              "kinematicviscosity": {"stoke": ("stoke", "St")},
+              "dynamicviscosity": {"pascalsecond": ("pascal second", "Pa s"),
+                                   "poise": ("poise", "P"),
+                                   },
+              "interfacialtension": {"newtonpermeter": ("newton per meter",
+                                                        "N/m"),
+                                     },
+              }
+
+
+def split_prefix(name):
+    """
+    The ways a unit name could be split into an SI prefix and the rest
+    of the name.
+
+    :returns: list of (prefix, rest of name) -- full prefix names first
+    """
+    splits = []
+    lower = name.lower()
+    for start, prefix in PREFIX_NAMES.items():
+        if lower.startswith(start):
+            splits.append((prefix, name[len(start):]))
+    for start, prefix in PREFIX_SYMBOLS.items():
+        if name.startswith(start):
+            splits.append((prefix, name[len(start):]))
+    # "m s" is meter seconds, not milli-seconds
+    return [(prefix, rest) for prefix, rest in splits
+            if rest and not rest[0].isspace()]
+
+
+def unprefix(name):
+    """
+    Split a (simplified) prefixed name, like "gigapascal", as made by
+    the unit name lookup, into its prefix and unit.
+
+    :returns: (prefix, unit), or None if it doesn't start with a prefix
+    """
+    for prefix in PREFIXES:
+        if name.startswith(prefix) and len(name) > len(prefix):
+            return prefix, name[len(prefix):]
+    return None
@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+
+"""
+"Did you mean" suggestions for unit names that aren't recognized
+
+All the unit names (primary names and synonyms) are indexed by their
+trigrams (three letter pieces, of the simplified name), so only names
+that share some of them have their edit distance computed -- that keeps
+it well under a millisecond, rather than checking every name.
+
+The index is built the first time it's needed.
+"""
+
+from collections import Counter, defaultdict
+
+from .unit_conversion import Simplify, _normalize
+from .unit_data import ConvertDataUnits
+
+# how many of the names with the most trigrams in common to check
+NUM_CANDIDATES = 64
+
+
+def suggest_units(name, unit_type=None, k=5):
+    """
+    suggest_units(name, unit_type=None, k=5)
+
+    Suggest unit names that are close to a name that isn't recognized,
+    e.g. for "kilogrms": ["kilograms", "kilogram"]
+
+    :param name: the unit name that was passed in
+    :param unit_type=None: only suggest units of this type
+    :param k=5: the maximum number of suggestions
+
+    :returns: a list of unit names, best match first
+              (empty if nothing is close)
+    """
+    if unit_type is not None:
+        unit_type = _normalize(unit_type)
+    return get_index().suggest(name, unit_type, k)
+
+
+def trigrams(name):
+    """
+    the set of trigrams in a (simplified) name -- padded, so short names
+    have some, and matching beginnings count for more
+    """
+    padded = "  " + name + " "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(name1, name2, limit):
+    """
+    Edit distance between two names, counting swapped neighboring
+    letters as one edit (optimal string alignment distance).
+
+    Gives up, and returns limit + 1, once the distance is more than limit.
+    Only the cells within limit of the diagonal are computed.
+    """
+    len1, len2 = len(name1), len(name2)
+    too_far = limit + 1
+    if abs(len1 - len2) > limit:
+        return too_far
+    before = None
+    previous = [j if j <= limit else too_far for j in range(len2 + 1)]
+    for i in range(1, len1 + 1):
+        char1 = name1[i - 1]
+        last1 = name1[i - 2] if i > 1 else None
+        row = [too_far] * (len2 + 1)
+        row_min = row[0] = i if i <= limit else too_far
+        for j in range(max(1, i - limit), min(len2, i + limit) + 1):
+            char2 = name2[j - 1]
+            distance = previous[j - 1]
+            if char1 != char2:
+                distance += 1
+                # (written out, rather than min(), as this is the hot loop)
+                if previous[j] + 1 < distance:
+                    distance = previous[j] + 1
+                if row[j - 1] + 1 < distance:
+                    distance = row[j - 1] + 1
+                if (j > 1 and char1 == name2[j - 2] and last1 == char2
+                        and before[j - 2] + 1 < distance):
+                    distance = before[j - 2] + 1
+            row[j] = distance
+            if distance < row_min:
+                row_min = distance
+        if row_min > limit:
+            return too_far
+        before, previous = previous, row
+    return min(previous[len2], too_far)
+
+
+def bag_distance(letters1, letters2):
+    """
+    A quick lower bound on the edit distance between two names, from
+    Counters of their letters: each edit adds and/or removes one letter.
+    """
+    extra1 = extra2 = 0
+    for char, num in letters1.items():
+        other = letters2.get(char, 0)
+        if num > other:
+            extra1 += num - other
+    for char, num in letters2.items():
+        other = letters1.get(char, 0)
+        if num > other:
+            extra2 += num - other
+    return max(extra1, extra2)
+
+
+class SuggestionIndex:
+    """
+    A trigram index of unit names
+
+    :param entries: iterable of (name, unit_type, is_primary_name)
+                    unit_type is the simplified unit type name.
+    """
+    def __init__(self, entries):
+        self.entries = []
+        self.simple_names = []
+        self.num_grams = []
+        self.letters = []
+        self.grams = defaultdict(list)
+        seen = set()
+        for name, unit_type, is_primary in entries:
+            simple_name = Simplify(name)
+            if (simple_name, unit_type) in seen:
+                continue
+            seen.add((simple_name, unit_type))
+            index = len(self.entries)
+            self.entries.append((name, unit_type, is_primary))
+            self.simple_names.append(simple_name)
+            grams = trigrams(simple_name)
+            self.num_grams.append(len(grams))
+            self.letters.append(Counter(simple_name))
+            for gram in grams:
+                self.grams[gram].append(index)
+
+    @classmethod
+    def from_unit_data(cls, units_data=ConvertDataUnits):
+        """
+        The index of all the names in the units table
+        """
+        def entries():
+            for pretty_type, units in units_data.items():
+                unit_type = Simplify(pretty_type)
+                for primary_name, (_, synonyms) in units.items():
+                    yield primary_name, unit_type, True
+                    for synonym in synonyms:
+                        yield synonym, unit_type, False
+        return cls(entries())
+
+    def suggest(self, name, unit_type=None, k=5):
+        """
+        See suggest_units() -- but unit_type has to be simplified already
+        """
+        if not isinstance(name, str):
+            return []
+        name = Simplify(name)
+        if not name:
+            return []
+
+        grams = trigrams(name)
+        letters = Counter(name)
+        counts = defaultdict(int)
+        for gram in grams:
+            for index in self.grams.get(gram, ()):
+                counts[index] += 1
+        if unit_type is not None:
+            counts = {index: count for index, count in counts.items()
+                      if self.entries[index][1] == unit_type}
+        candidates = sorted(counts, key=counts.get, reverse=True)
+
+        # allow about one mistake for every four letters
+        limit = max(1, (len(name) + 1) // 4)
+        scored = []
+        for index in candidates[:NUM_CANDIDATES]:
+            # each edit changes at most three trigrams -- so names with
+            # too few in common can't be close enough
+            count = counts[index]
+            if count < max(len(grams), self.num_grams[index]) - 3 * limit:
+                if count < len(grams) - 3 * limit:
+                    break  # the rest have even fewer
+                continue
+            simple_name = self.simple_names[index]
+            if (simple_name == name or
+                    bag_distance(letters, self.letters[index]) > limit):
+                continue
+            distance = edit_distance(name, simple_name, limit)
+            if distance <= limit:
+                display_name, _, is_primary = self.entries[index]
+                scored.append((distance, not is_primary, -count, display_name))
+                if len(scored) >= k:
+                    # no need to look for anything worse than the k best
+                    limit = sorted(scored)[k - 1][0]
+
+        suggestions = []
+        for score in sorted(scored):
+            if score[-1] not in suggestions:
+                suggestions.append(score[-1])
+                if len(suggestions) == k:
+                    break
+        return suggestions
+
+
+_index = None
+
+
+def get_index():
+    """
+    The SuggestionIndex of all the unit names -- built on first use
+    """
+    global _index
+    if _index is None:
+        _index = SuggestionIndex.from_unit_data()
+    return _index
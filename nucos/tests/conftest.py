@@ -0,0 +1,34 @@
+"""
+fixtures and helpers shared by the tests
+"""
+
+from math import isclose
+
+import pytest
+
+from nucos import array_conversion, binary_conversion, lat_long
+
+
+@pytest.fixture(params=["numpy", "no numpy"])
+def numpy_or_not(request, monkeypatch):
+    """
+    run a test with numpy, if it's installed, and with the pure Python
+    versions, as though numpy isn't there
+    """
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+        monkeypatch.setattr(binary_conversion, "np", None)
+        monkeypatch.setattr(lat_long, "_get_numpy", lambda: None)
+    return request.param
+
+
+def all_close(result, expected, rel_tol=1e-6, abs_tol=1e-9):
+    """
+    True if two sequences of numbers are the same length, and close
+    """
+    result, expected = list(result), list(expected)
+    return (len(result) == len(expected) and
+            all(isclose(r, e, rel_tol=rel_tol, abs_tol=abs_tol)
+                for r, e in zip(result, expected)))
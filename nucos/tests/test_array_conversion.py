@@ -0,0 +1,453 @@
+#!/usr/bin/env python
+
+"""
+tests for the array conversion functions
+
+The numpy tests are skipped if numpy is not installed, the pure
+Python fallback is tested either way.
+"""
+
+import array
+from math import isclose
+
+import pytest
+
+from nucos import unit_conversion
+from nucos import array_conversion
+from nucos.array_conversion import convert_array
+
+from .conftest import all_close
+
+
+@pytest.fixture
+def no_numpy(monkeypatch):
+    """
+    make the array_conversion module act as though numpy isn't there
+    """
+    monkeypatch.setattr(array_conversion, "np", None)
+
+
+def expected(unit1, unit2, values, unit_type=None):
+    if unit_type is None:
+        return [unit_conversion.convert(unit1, unit2, v) for v in values]
+    return [unit_conversion.convert(unit_type, unit1, unit2, v)
+            for v in values]
+
+
+CASES = [("m", "ft", [0.0, 1.0, 2.5, -3.0]),
+         ("C", "F", [-40.0, 0.0, 100.0]),
+         ("API", "kg/m^3", [10.0, 25.0, 32.5]),
+         ("SG", "API", [0.8, 0.9, 1.0]),
+         ("API", "API", [10.0, 25.0]),
+         ]
+
+
+@pytest.mark.parametrize("unit1, unit2, values", CASES)
+def test_convert_list_no_numpy(no_numpy, unit1, unit2, values):
+    result = convert_array(unit1, unit2, values)
+
+    assert isinstance(result, list)
+    assert all_close(result, expected(unit1, unit2, values))
+
+
+@pytest.mark.parametrize("unit1, unit2, values", CASES)
+def test_convert_array_array_no_numpy(no_numpy, unit1, unit2, values):
+    arr = array.array('f', values)
+    result = convert_array(unit1, unit2, arr)
+
+    assert result.typecode == 'f'
+    assert all_close(result, expected(unit1, unit2, arr))
+
+
+def test_convert_in_place_no_numpy(no_numpy):
+    arr = array.array('d', [1.0, 2.0, 3.0])
+    result = convert_array("km", "m", arr, out=arr)
+
+    assert result is arr
+    assert list(arr) == [1000.0, 2000.0, 3000.0]
+
+
+def test_convert_int_array_no_numpy(no_numpy):
+    result = convert_array("km", "m", array.array('i', [1, 2]))
+
+    assert result.typecode == 'd'
+
+
+def test_convert_bad_dtype_no_numpy(no_numpy):
+    with pytest.raises(TypeError):
+        convert_array("km", "m", [1, 2], dtype='i')
+
+
+def test_convert_temperature_same_as_convert(numpy_or_not):
+    values = [0.0, 100.0, 37.5, -40.0, 20.1]
+    expected_values = expected("C", "F", values)
+
+    assert list(convert_array("C", "F", values)) == expected_values
+    arr = array.array('d', values)
+    array_conversion.convert_buffer("C", "F", arr)
+    assert list(arr) == expected_values
+
+
+@pytest.mark.parametrize("unit1, unit2, values", CASES)
+def test_convert_ndarray(unit1, unit2, values):
+    np = pytest.importorskip("numpy")
+    arr = np.array(values)
+    result = convert_array(unit1, unit2, arr)
+
+    assert result.dtype == np.float64
+    assert all_close(result, expected(unit1, unit2, values))
+
+
+@pytest.mark.parametrize("unit1, unit2, values", CASES)
+def test_convert_ndarray_float32(unit1, unit2, values):
+    np = pytest.importorskip("numpy")
+    arr = np.array(values, dtype=np.float32)
+    result = convert_array(unit1, unit2, arr)
+
+    assert result.dtype == np.float32
+    assert np.allclose(result, expected(unit1, unit2, arr), rtol=1e-6, atol=1e-4)
+
+
+def test_convert_ndarray_in_place():
+    np = pytest.importorskip("numpy")
+    arr = np.array([[32.0, 212.0], [-40.0, 50.0]], dtype=np.float32)
+    result = convert_array("F", "C", arr, out=arr)
+
+    assert result is arr
+    assert np.allclose(arr, [[0.0, 100.0], [-40.0, 10.0]], atol=1e-5)
+
+
+def test_convert_ndarray_int_input():
+    np = pytest.importorskip("numpy")
+    result = convert_array("km", "m", np.arange(3))
+
+    assert result.dtype == np.float64
+    assert np.array_equal(result, [0.0, 1000.0, 2000.0])
+
+
+def test_convert_ndarray_dtype():
+    np = pytest.importorskip("numpy")
+    result = convert_array("km", "m", [1.0, 2.0], dtype=np.float32)
+
+    assert result.dtype == np.float32
+
+
+def test_convert_ndarray_out_array_array():
+    pytest.importorskip("numpy")
+    out = array.array('d', [0.0, 0.0])
+    result = convert_array("km", "m", [1.0, 2.0], out=out)
+
+    assert result is out
+    assert list(out) == [1000.0, 2000.0]
+
+
+def test_convert_ndarray_dtype_mismatch():
+    np = pytest.importorskip("numpy")
+    out = np.zeros(2)
+    with pytest.raises(TypeError):
+        convert_array("km", "m", [1.0, 2.0], out=out, dtype=np.float32)
+
+
+def test_convert_array_unit_type():
+    result = convert_array("oz", "ml", [1.0], unit_type="volume")
+
+    assert isclose(result[0], 29.57353, rel_tol=1e-6)
+
+
+def test_convert_array_bad_unit():
+    with pytest.raises(unit_conversion.UnitConversionError):
+        convert_array("m", "kg", [1.0])
+
+
+MIXED_UNITS = ["bbl", "gal", "m^3", "bbl", "spam", "kg", "liter"]
+MIXED_VALUES = [1.0, 42.0, 0.1589873, 2.0, 3.0, 4.0, 1000.0]
+MIXED_EXPECTED = [1.0, 1.0, 1.0, 2.0, None, None, 6.28981]
+MIXED_ERRORS = [False, False, False, False, True, True, False]
+
+
+def check_mixed(results, errors):
+    assert list(errors) == MIXED_ERRORS
+    for r, e in zip(results, MIXED_EXPECTED):
+        if e is None:
+            assert r != r  # NaN
+        else:
+            assert isclose(r, e, rel_tol=1e-5)
+
+
+def test_convert_many():
+    pytest.importorskip("numpy")
+    results, errors = array_conversion.convert_many(MIXED_UNITS, "bbl",
+                                                    MIXED_VALUES)
+    check_mixed(results, errors)
+
+
+def test_convert_many_no_numpy(no_numpy):
+    results, errors = array_conversion.convert_many(MIXED_UNITS, "bbl",
+                                                    MIXED_VALUES)
+    assert isinstance(results, list)
+    check_mixed(results, errors)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_convert_many_both_columns(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+
+    results, errors = array_conversion.convert_many(["m", "C", "C", "None"],
+                                                    ["ft", "F", "kg", None],
+                                                    [1.0, 100.0, 1.0, 1.0])
+    assert list(errors) == [False, False, True, True]
+    assert isclose(results[0], 3.2808399, rel_tol=1e-6)
+    assert isclose(results[1], 212.0, rel_tol=1e-6)
+
+
+def test_convert_many_wrong_length():
+    with pytest.raises(ValueError):
+        array_conversion.convert_many(["m", "ft"], "ft", [1.0, 2.0, 3.0])
+
+
+def test_convert_many_empty():
+    results, errors = array_conversion.convert_many([], "ft", [])
+
+    assert len(results) == 0
+    assert len(errors) == 0
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_unit_codes_convert_codes(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+
+    units = ["bbl", "gal", "m^3", "barrels", "liter"]
+    values = [1.0, 42.0, 0.1589873, 2.0, 1000.0]
+
+    codes = array_conversion.unit_codes("Volume", units)
+    assert list(codes[:4]) == [codes[0], codes[1], 0, codes[0]]
+
+    bbl = unit_conversion.Converters["volume"].get_unit_code("bbl")
+    results = array_conversion.convert_codes("Volume", codes, bbl, values)
+
+    assert all_close(results, [1.0, 1.0, 1.0, 2.0, 6.28981])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_convert_codes_special(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+
+    codes = array_conversion.unit_codes("Density", ["API", "SG", "kg/m^3"])
+    results = array_conversion.convert_codes("Density",
+                                             codes,
+                                             [codes[1], codes[0], codes[1]],
+                                             [10.0, 1.0, 900.0])
+    assert all_close(results, [1.0, 10.0, 0.900886])
+
+    codes = array_conversion.unit_codes("Temperature", ["C", "F"])
+    results = array_conversion.convert_codes("Temperature",
+                                             codes, codes[::-1],
+                                             [100.0, 32.0])
+    assert all_close(results, [212.0, 0.0])
+
+
+def test_unit_codes_bad():
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        array_conversion.unit_codes("Volume", ["bbl", "kg"])
+    with pytest.raises(unit_conversion.InvalidUnitTypeError):
+        array_conversion.unit_codes("Spam", ["bbl"])
+
+
+# converting buffers in place
+
+@pytest.mark.parametrize("numpy", [True, False])
+@pytest.mark.parametrize(("unit1", "unit2", "values"),
+                         CASES + [("API", "SG", [10.0, 35.0, 60.0])])
+def test_convert_buffer(monkeypatch, numpy, unit1, unit2, values):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    monkeypatch.setattr(array_conversion, "BUFFER_BLOCK_SIZE", 3)
+    arr = array.array('d', values * 3)
+
+    num = array_conversion.convert_buffer(unit1, unit2, arr)
+
+    assert num == len(values) * 3
+    assert all_close(arr, expected(unit1, unit2, values * 3))
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_convert_buffer_bytes(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    buffer = bytearray(array.array('f', [0.0, 100.0]).tobytes())
+
+    array_conversion.convert_buffer("C", "F", buffer, typecode='f')
+
+    assert all_close(array.array('f', bytes(buffer)), [32.0, 212.0])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_convert_buffer_memoryview_slice(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    arr = array.array('d', [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    array_conversion.convert_buffer("m", "cm", memoryview(arr)[1::2])
+
+    assert all_close(arr, [1.0, 200.0, 3.0, 400.0, 5.0])
+
+
+def test_convert_buffer_ndarray():
+    np = pytest.importorskip("numpy")
+    arr = np.ones((3, 4), dtype=np.float32)
+
+    array_conversion.convert_buffer("m", "cm", arr)
+
+    assert arr.dtype == np.float32
+    assert np.all(arr == 100.0)
+
+
+@pytest.mark.parametrize(("buffer", "typecode"),
+                         [(b"12345678", 'd'),  # read only
+                          (bytearray(8), None),  # no typecode
+                          (bytearray(7), 'd'),  # not whole doubles
+                          (array.array('i', [1]), None),  # not floats
+                          (array.array('d', [1.0]), 'f'),  # wrong typecode
+                          ])
+def test_convert_buffer_bad(buffer, typecode):
+    with pytest.raises(TypeError):
+        array_conversion.convert_buffer("m", "cm", buffer, typecode)
+
+
+# mass <-> volume with arrays of densities
+
+OQC = unit_conversion.OilQuantityConverter
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_to_volume_array(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    masses = [1.0, 2.0, 0.5]
+    densities = [25.0, 10.0, 45.0]
+
+    result = OQC.ToVolumeArray(masses, "metricton", densities, "API", "bbl")
+
+    assert all_close(result, [OQC.ToVolume(m, "metricton", d, "API", "bbl")
+                              for m, d in zip(masses, densities)])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_to_mass_array(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    volumes = [7.83861191, 1.0, 100.0]
+
+    result = OQC.ToMassArray(volumes, "bbls", 0.816, "SG", "longton")
+
+    assert all_close(result, [OQC.ToMass(v, "bbls", 0.816, "SG", "longton")
+                              for v in volumes])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_to_mass_array_scalar_volume(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+
+    result = OQC.ToMassArray(1.0, "m^3", [900.0, 0.9], "kg/m^3", "kg")
+
+    assert all_close(result, [900.0, 0.9])
+
+
+# viscosity and discharge with arrays of densities
+
+VC = unit_conversion.ViscosityConverter
+DC = unit_conversion.DischargeConverter
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_viscosity_arrays(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    viscosities = [1.0, 100.0, 2500.0]
+    densities = [35.0, 20.0, 10.0]
+
+    dynamic = VC.ToDynamicArray(viscosities, "cSt", densities, "API", "cP")
+    kinematic = VC.ToKinematicArray(dynamic, "cP", densities, "API", "cSt")
+
+    assert all_close(dynamic, [VC.ToDynamic(v, "cSt", d, "API", "cP")
+                               for v, d in zip(viscosities, densities)])
+    assert all_close(kinematic, viscosities)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_discharge_arrays(monkeypatch, numpy):
+    if numpy:
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(array_conversion, "np", None)
+    discharges = [1000.0, 50.0, 0.0]
+
+    mass = DC.ToMassDischargeArray(discharges, "bbl/day", 0.9, "g/cm^3",
+                                   "kg/s")
+    volume = DC.ToDischargeArray(mass, "kg/s", 0.9, "g/cm^3", "bbl/day")
+
+    assert all_close(mass, [DC.ToMassDischarge(q, "bbl/day", 0.9, "g/cm^3",
+                                               "kg/s")
+                            for q in discharges])
+    assert all_close(volume, discharges)
+
+
+def test_scale_by_density_broadcast():
+    np = pytest.importorskip("numpy")
+    volumes = np.array([[1.0], [2.0]])
+    densities = np.array([800.0, 900.0, 1000.0])
+
+    result = array_conversion.scale_by_density(volumes, 1.0,
+                                               densities, "kg/m^3")
+
+    assert result.shape == (2, 3)
+    assert np.allclose(result[1], [1600.0, 1800.0, 2000.0])
+
+
+def test_scale_by_density_length_mismatch(no_numpy):
+    with pytest.raises(ValueError):
+        array_conversion.scale_by_density([1.0, 2.0], 1.0,
+                                          [800.0, 900.0, 1000.0], "kg/m^3")
+
+
+def test_import_nucos_does_not_import_arrays():
+    """
+    convert_array, and the other lazy imports, shouldn't be imported
+    (nor numpy) until they are used (needs a fresh interpreter to check)
+    """
+    import subprocess
+    import sys
+
+    code = ("import sys, nucos\n"
+            "lazy = {'nucos.' + name for name in "
+            "nucos._LAZY_IMPORTS.values()}\n"
+            "assert not lazy & set(sys.modules), lazy & set(sys.modules)\n"
+            "assert 'numpy' not in sys.modules\n"
+            "nucos.convert_array\n"
+            "assert 'nucos.array_conversion' in sys.modules\n"
+            )
+    subprocess.run([sys.executable, "-c", code], check=True)
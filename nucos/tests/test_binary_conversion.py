@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+
+"""
+tests for converting binary files
+
+The files are written with the struct module, so that the tests
+of the pure Python version run without numpy.
+"""
+
+import struct
+from math import isclose
+
+import pytest
+
+from nucos import binary_conversion, convert
+from nucos.binary_conversion import convert_raw_file, convert_npy_file
+
+from .conftest import all_close
+
+VALUES = [float(i) / 4 - 100 for i in range(5000)]
+
+
+def write_raw(filename, values, fmt="<d", header=b""):
+    with open(filename, "wb") as outfile:
+        outfile.write(header)
+        outfile.write(struct.pack("{}{}{}".format(fmt[0], len(values), fmt[1]),
+                                  *values))
+
+
+def read_raw(filename, fmt="<d", header_bytes=0):
+    with open(filename, "rb") as infile:
+        data = infile.read()[header_bytes:]
+    return list(struct.unpack("{}{}{}".format(fmt[0],
+                                              len(data) // struct.calcsize(fmt),
+                                              fmt[1]),
+                              data))
+
+
+def npy_header(descr, num):
+    header = ("{{'descr': '{}', 'fortran_order': False, 'shape': ({},), }}"
+              .format(descr, num))
+    header += " " * (63 - len(header) % 64) + "\n"
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + \
+        header.encode("latin1")
+
+
+@pytest.mark.parametrize("fmt", ["<d", ">d", "<f", ">f"])
+@pytest.mark.parametrize(("from_unit", "to_unit"),
+                         [("m", "ft"), ("C", "F"), ("API", "SG")])
+def test_convert_raw_file_in_place(numpy_or_not, tmp_path, fmt,
+                                   from_unit, to_unit):
+    values = [abs(v) + 1 for v in VALUES] if from_unit == "API" else VALUES
+    filename = tmp_path / "data.raw"
+    write_raw(filename, values, fmt)
+
+    dtype = fmt[0] + {"d": "f8", "f": "f4"}[fmt[1]]
+
+    num = convert_raw_file(from_unit, to_unit, filename, dtype=dtype,
+                           window_bytes=1)
+
+    assert num == len(values)
+    # float32 is computed in single precision with numpy
+    abs_tol = 1e-4 if fmt[1] == "f" else 1e-6
+    assert all(isclose(r, e, rel_tol=1e-6, abs_tol=abs_tol)
+               for r, e in zip(read_raw(filename, fmt),
+                               [convert(from_unit, to_unit, v)
+                                for v in values]))
+
+
+def test_convert_raw_file_new_file(numpy_or_not, tmp_path):
+    filename = tmp_path / "data.raw"
+    outfile = tmp_path / "out.raw"
+    header = b"odd sized header"
+    write_raw(filename, VALUES, header=header)
+
+    convert_raw_file("ft", "m", filename, outfile, header_bytes=len(header))
+
+    assert read_raw(filename, header_bytes=len(header)) == VALUES
+    assert open(outfile, "rb").read(len(header)) == header
+    assert all_close(read_raw(outfile, header_bytes=len(header)),
+                     [convert("ft", "m", v) for v in VALUES])
+
+
+def test_convert_raw_file_same_file(numpy_or_not, tmp_path):
+    filename = tmp_path / "data.raw"
+    write_raw(filename, VALUES)
+
+    convert_raw_file("ft", "m", filename, str(filename))
+
+    assert all_close(read_raw(filename), [convert("ft", "m", v)
+                                          for v in VALUES])
+
+
+def test_convert_raw_file_empty(numpy_or_not, tmp_path):
+    filename = tmp_path / "data.raw"
+    filename.write_bytes(b"")
+
+    assert convert_raw_file("ft", "m", filename) == 0
+
+
+@pytest.mark.parametrize(("dtype", "header_bytes"),
+                         [("float16", 0),
+                          ("float64", 3),
+                          ])
+def test_convert_raw_file_bad(tmp_path, dtype, header_bytes):
+    filename = tmp_path / "data.raw"
+    write_raw(filename, VALUES)
+
+    with pytest.raises(ValueError):
+        convert_raw_file("ft", "m", filename, dtype=dtype,
+                         header_bytes=header_bytes)
+
+
+@pytest.mark.parametrize("descr", ["<f8", ">f4"])
+def test_convert_npy_file(numpy_or_not, tmp_path, descr):
+    filename = tmp_path / "data.npy"
+    fmt = descr[0] + {"f8": "d", "f4": "f"}[descr[1:]]
+    header = npy_header(descr, len(VALUES))
+    write_raw(filename, VALUES, fmt, header=header)
+
+    convert_npy_file("C", "K", filename, window_bytes=1)
+
+    assert binary_conversion.read_npy_header(filename) == (descr,
+                                                           (len(VALUES),),
+                                                           len(header))
+    assert all_close(read_raw(filename, fmt, len(header)),
+                     [convert("C", "K", v) for v in VALUES])
+
+
+def test_convert_npy_file_numpy(tmp_path):
+    np = pytest.importorskip("numpy")
+    filename = tmp_path / "data.npy"
+    outfile = tmp_path / "out.npy"
+    data = np.arange(12, dtype=np.float32).reshape(3, 4)
+    np.save(filename, data)
+
+    convert_npy_file("kg", "lb", filename, outfile)
+
+    result = np.load(outfile)
+    assert result.dtype == np.float32
+    assert result.shape == (3, 4)
+    assert np.allclose(result, convert("kg", "lb", data))
+
+
+def test_convert_npy_file_bad(tmp_path):
+    filename = tmp_path / "data.npy"
+    write_raw(filename, VALUES, header=npy_header("<f8", len(VALUES) + 1))
+
+    with pytest.raises(ValueError):
+        convert_npy_file("C", "K", filename)
+
+    filename.write_bytes(b"not an npy file")
+    with pytest.raises(ValueError):
+        convert_npy_file("C", "K", filename)
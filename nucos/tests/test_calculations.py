@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+"""
+tests for the calculations that combine unit types
+"""
+
+from math import isclose
+
+import pytest
+
+from nucos import calculations, convert
+
+from .conftest import all_close
+
+RELTOL = 1e-6
+
+
+# slick calculations
+
+def test_slick_volume(numpy_or_not):
+    # 1 km^2 at 1 micron is 1 m^3
+    result = calculations.slick_volume([1.0, 2.0, 0.5], "km^2",
+                                       [1.0, 1.0, 10.0], "micron",
+                                       "m^3")
+
+    assert all_close(result, [1.0, 2.0, 5.0])
+
+
+def test_slick_volume_units(numpy_or_not):
+    # 1 bbl/acre over an acre is 1 bbl
+    result = calculations.slick_volume(1.0, "acre", [1.0, 2.0], "bbl/acre",
+                                       "bbl")
+
+    assert all_close(result, [1.0, 2.0])
+
+
+def test_slick_volume_mass_per_area(numpy_or_not):
+    # g/m^2 is converted with a density of 0.95
+    result = calculations.slick_volume([1.0], "m^2", [950.0], "g/m^2", "l")
+
+    assert all_close(result, [1.0])
+
+
+def test_slick_thickness(numpy_or_not):
+    areas = [1.0, 10.0, 100.0]
+
+    result = calculations.slick_thickness(1.0, "bbl", areas, "acre",
+                                          "bbl/acre")
+
+    assert all_close(result, [1.0, 0.1, 0.01])
+
+
+def test_slick_area(numpy_or_not):
+    volumes = [1.0, 2.0, 3.0]
+    thickness = [1.0, 1.0, 0.1]
+
+    result = calculations.slick_area(volumes, "m^3", thickness, "mm", "m^2")
+
+    assert all_close(result, [1000.0, 2000.0, 30000.0])
+
+
+@pytest.mark.parametrize("thickness_units", ["micron", "bbl/acre", "in",
+                                             "g/m^2", "l/hectare"])
+def test_slick_round_trip(numpy_or_not, thickness_units):
+    areas = [1.5, 3.0]
+    thickness = [2.0, 0.25]
+
+    volumes = calculations.slick_volume(areas, "sq miles",
+                                        thickness, thickness_units, "gal")
+    area = calculations.slick_area(volumes, "gal",
+                                   thickness, thickness_units, "sq miles")
+    thick = calculations.slick_thickness(volumes, "gal", areas, "sq miles",
+                                         thickness_units)
+
+    assert all_close(area, areas)
+    assert all_close(thick, thickness)
+    assert isclose(volumes[0],
+                   convert("m^3", "gal",
+                           convert("area", "sq miles", "m^2", 1.5) *
+                           convert("oil concentration", thickness_units,
+                                   "micron", 2.0) * 1e-6),
+                   rel_tol=RELTOL)
+
+
+def test_slick_broadcast():
+    np = pytest.importorskip("numpy")
+    areas = np.array([[1.0], [2.0]])
+    thickness = np.array([1.0, 2.0, 3.0])
+
+    result = calculations.slick_volume(areas, "km^2", thickness, "micron",
+                                       "m^3")
+
+    assert result.shape == (2, 3)
+    assert np.allclose(result[1], [2.0, 4.0, 6.0])
+
+
+def test_slick_bad_units():
+    with pytest.raises(ValueError):
+        calculations.slick_volume(1.0, "m", 1.0, "micron", "m^3")
+
+
+# cumulative release
+
+def test_cumulative_release_trapezoid(numpy_or_not):
+    # 24 bbl/day ramping up to 48 bbl/day over a day, then steady
+    result = calculations.cumulative_release([24.0, 48.0, 48.0], "bbl/day",
+                                             [0.0, 24.0, 36.0], "hours",
+                                             "bbl")
+
+    assert all_close(result, [0.0, 36.0, 60.0])
+
+
+def test_cumulative_release_step(numpy_or_not):
+    result = calculations.cumulative_release([24.0, 48.0, 48.0], "bbl/day",
+                                             [0.0, 24.0, 36.0], "hours",
+                                             "bbl", method="step")
+
+    assert all_close(result, [0.0, 24.0, 48.0])
+
+
+def test_cumulative_release_units(numpy_or_not):
+    rates = [100.0, 150.0, 50.0]
+    times = [0.0, 30.0, 90.0]
+    result = calculations.cumulative_release(rates, "gpm", times, "min",
+                                             "m^3")
+
+    in_gal = calculations.cumulative_release(rates, "gpm", times, "min",
+                                             "gal")
+
+    assert all_close(in_gal, [0.0, 3750.0, 9750.0])
+    assert all_close(result, [convert("gal", "m^3", v) for v in in_gal])
+
+
+def test_cumulative_release_mass(numpy_or_not):
+    result = calculations.cumulative_release([1.0, 3.0], "kg/s",
+                                             [0.0, 1.0], "hr",
+                                             "tonne")
+
+    assert all_close(result, [0.0, 7.2])
+
+
+@pytest.mark.parametrize("times", [[], [5.0]])
+def test_cumulative_release_short(numpy_or_not, times):
+    result = calculations.cumulative_release([1.0] * len(times), "m^3/s",
+                                             times, "s", "m^3")
+
+    assert list(result) == [0.0] * len(times)
+
+
+def test_cumulative_release_wrong_total_type():
+    with pytest.raises(ValueError):
+        calculations.cumulative_release([1.0, 2.0], "bbl/day",
+                                        [0.0, 1.0], "day", "kg")
+
+
+def test_cumulative_release_not_a_rate():
+    with pytest.raises(ValueError):
+        calculations.cumulative_release([1.0, 2.0], "bbl",
+                                        [0.0, 1.0], "day", "bbl")
+
+
+def test_cumulative_release_bad_method():
+    with pytest.raises(ValueError):
+        calculations.cumulative_release([1.0, 2.0], "bbl/day",
+                                        [0.0, 1.0], "day", "bbl",
+                                        method="simpson")
+
+
+def test_cumulative_release_mismatched_lengths(numpy_or_not):
+    with pytest.raises(ValueError):
+        calculations.cumulative_release([1.0, 2.0, 3.0], "bbl/day",
+                                        [0.0, 1.0], "day", "bbl")
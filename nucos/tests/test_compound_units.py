@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+
+"""
+tests for compound unit expressions
+"""
+
+from math import isclose
+
+import pytest
+
+import nucos
+from nucos import convert, get_converter
+from nucos.compound_units import compile_unit, compile_conversion
+from nucos.unit_conversion import (UnitConversionError,
+                                   NotSupportedUnitError,
+                                   InvalidUnitError,
+                                   )
+
+
+@pytest.mark.parametrize(("expression", "dimensions", "scale"),
+                         [("kg m^-3", (-3, 1, 0), 1.0),
+                          ("meter sec-1", (1, 0, -1), 1.0),
+                          ("ft^3/min", (3, 0, -1), 0.3048 ** 3 / 60),
+                          ("ft**3 / min", (3, 0, -1), 0.3048 ** 3 / 60),
+                          ("ft³·min⁻¹", (3, 0, -1), 0.3048 ** 3 / 60),
+                          ("bbl/day", (3, 0, -1), 0.1589873 / 86400),
+                          ("g/cm3", (-3, 1, 0), 1000.0),
+                          ("kg/(m s)", (-1, 1, -1), 1.0),
+                          ("kg/(m s^2)", (-1, 1, -2), 1.0),
+                          ("metric ton per day", (0, 1, -1), 1000.0 / 86400),
+                          ("cubic meter per second", (3, 0, -1), 1.0),
+                          ("square feet", (2, 0, 0), 0.3048 ** 2),
+                          ("lb * ft / s2", (1, 1, -2), 0.45359237 * 0.3048),
+                          ("m s / s", (1, 0, 0), 1.0),
+                          ])
+def test_compile_unit(expression, dimensions, scale):
+    compiled = compile_unit(expression)
+
+    assert compiled.expression == expression
+    assert compiled.dimensions == dimensions
+    # (the ones in the tables have the table value)
+    assert isclose(compiled.scale, scale, rel_tol=1e-6)
+
+
+@pytest.mark.parametrize(("expression", "unit_type"),
+                         [("kg m^-3", "density"),
+                          ("gal/min", "discharge"),
+                          ("knots", "velocity"),
+                          ("kg s-2", "interfacialtension"),
+                          ("m s kg", None),
+                          ])
+def test_unit_type(expression, unit_type):
+    assert compile_unit(expression).unit_type == unit_type
+
+
+@pytest.mark.parametrize("expression",
+                         ["",
+                          "eggs/day",
+                          "kg//m",
+                          "kg/",
+                          "3 kg",
+                          "kg^2^2",
+                          "(kg m",
+                          "kg m)",
+                          "oz/s",  # ambiguous: mass or volume
+                          "square",
+                          "API",  # not linear
+                          ])
+def test_compile_unit_bad(expression):
+    with pytest.raises(UnitConversionError):
+        compile_unit(expression)
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit"),
+                         [("ft^3/min", "cfs"),
+                          ("meter sec-1", "knots"),
+                          ("kg m^-3", "lb/gal"),
+                          ("m^2 s^-1", "cSt"),
+                          ("bbl/day", "gpm"),
+                          ])
+def test_compile_conversion(from_unit, to_unit):
+    plan = compile_conversion(from_unit, to_unit)
+    expected = (compile_unit(from_unit).scale /
+                compile_unit(to_unit).scale)
+
+    assert plan.is_affine
+    assert isclose(plan.scale, expected)
+    assert isclose(plan(2.0), 2.0 * expected)
+
+
+def test_compile_conversion_matches_table():
+    plan = compile_conversion("ft s^-1", "km hr^-1")
+
+    assert isclose(plan(10.0), convert("ft/s", "km/h", 10.0), rel_tol=1e-5)
+
+
+def test_compile_conversion_is_cached():
+    assert (compile_conversion("ft^3 min-1", "bbl/day")
+            is compile_conversion("ft^3 min-1", "bbl/day"))
+
+
+def test_compile_conversion_mismatch():
+    with pytest.raises(UnitConversionError):
+        compile_conversion("kg m^-3", "m/s")
+
+
+def test_convert_compound():
+    assert isclose(convert("meter sec-1", "knots", 0.514444), 1.0)
+    assert isclose(convert("knots", "meter sec-1", 1.0), 0.514444)
+    assert isclose(convert("kg m^-3", "kg/m^3", 900.0), 900.0)
+
+
+def test_get_converter_compound():
+    converter = get_converter("bbl/day", "ft^3 min^-1")
+
+    assert isclose(converter(1.0), 0.1589873 / 0.3048 ** 3 / 1440,
+                   rel_tol=1e-6)
+    assert converter.offset == 0.0
+
+
+def test_errors_unchanged():
+    # the same errors as without compound units
+    with pytest.raises(NotSupportedUnitError):
+        convert("kgt", "miles", 0)
+    with pytest.raises(InvalidUnitError):
+        convert("kg", "miless", 0)
+    with pytest.raises(InvalidUnitError):
+        get_converter("kg", "m")
+    with pytest.raises(NotSupportedUnitError):
+        get_converter("kg m^-3", "m")
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit", "error"),
+                         [("g/kg", "l/m^3", InvalidUnitError),
+                          ("gram per kilogram", "liter per cubic meter",
+                           InvalidUnitError),
+                          ("m/m", "l/m^3", NotSupportedUnitError),
+                          ("g/kg", "m/km", InvalidUnitError),
+                          ("mg/kg", "s/s", InvalidUnitError),
+                          ("m/m", "s/s", NotSupportedUnitError),
+                          ])
+def test_fractions_are_not_compound(from_unit, to_unit, error):
+    # mass and volume fractions aren't just numbers
+    with pytest.raises(error):
+        convert(from_unit, to_unit, 3.0)
+    with pytest.raises(error):
+        get_converter(from_unit, to_unit)
+
+
+@pytest.mark.parametrize("unit", ["g/kg", "ppm", "l/m^3"])
+def test_compile_unit_fraction(unit):
+    with pytest.raises(UnitConversionError):
+        compile_unit(unit)
+
+
+def test_compile_conversion_no_dimensions():
+    with pytest.raises(UnitConversionError):
+        compile_conversion("m/m", "s/s")
+
+
+def test_lazy_import():
+    assert nucos.compile_unit is compile_unit
+    assert nucos.compile_conversion is compile_conversion
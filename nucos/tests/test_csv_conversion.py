@@ -0,0 +1,164 @@
+#!/usr/bin/env python
+
+"""
+tests for converting CSV files
+"""
+
+import io
+
+import pytest
+
+from nucos import csv_conversion, convert
+from nucos.__main__ import main
+from nucos.unit_conversion import UnitConversionError
+
+CSV = ("Date,Volume (bbl),Rate [bbl/day],Note,Depth\n"
+       "2020-01-01,100,2,\"a, b\",3\n"
+       "2020-01-02,,5.5,x,4.5\n"
+       )
+
+
+@pytest.mark.parametrize(("header", "unit"),
+                         [("Volume (bbl)", "bbl"),
+                          ("Rate [ m^3/s ]", "m^3/s"),
+                          ("Volume", None),
+                          ("Volume (bbl) total", None),
+                          ])
+def test_header_unit(header, unit):
+    assert csv_conversion.header_unit(header) == unit
+
+
+def test_resolve_columns():
+    header = ["Date", "Volume (bbl)", "Rate [bbl/day]", "Depth (ft)"]
+    new_header, conversions = csv_conversion.resolve_columns(
+        header,
+        columns={"Date": ("day", "hour")},
+        to_units={"Volume": "m^3"})
+
+    assert new_header == ["Date", "Volume (m^3)", "Rate [bbl/day]",
+                          "Depth (ft)"]
+    assert [index for index, converter in conversions] == [0, 1]
+    assert conversions[1][1](1.0) == convert("bbl", "m^3", 1.0)
+
+
+def test_resolve_columns_missing():
+    with pytest.raises(ValueError):
+        csv_conversion.resolve_columns(["Volume (bbl)"],
+                                       columns={"Volume": ("bbl", "m^3")})
+
+
+def test_resolve_columns_bad_unit():
+    with pytest.raises(UnitConversionError):
+        csv_conversion.resolve_columns(["Volume (bbl)"],
+                                       to_units={"Volume": "meter"})
+
+
+def test_convert_csv():
+    outfile = io.StringIO()
+    num_rows = csv_conversion.convert_csv(io.StringIO(CSV), outfile,
+                                          columns={"Depth": ("ft", "m")},
+                                          to_units={"volume": "m^3",
+                                                    "discharge": "m^3/s"},
+                                          chunk_size=1)
+
+    assert num_rows == 2
+    lines = outfile.getvalue().splitlines()
+    assert lines[0] == "Date,Volume (m^3),Rate (m^3/s),Note,Depth"
+    assert lines[1].split(",")[:2] == ["2020-01-01",
+                                       repr(convert("bbl", "m^3", 100))]
+    assert lines[2].split(",")[:2] == ["2020-01-02", ""]
+    assert float(lines[2].split(",")[-1]) == convert("ft", "m", 4.5)
+    assert '"a, b"' in lines[1]
+
+
+def test_convert_csv_files(tmp_path):
+    infile = tmp_path / "in.csv"
+    infile.write_text(CSV.replace(",", ";"))
+    outfile = tmp_path / "out.csv"
+
+    csv_conversion.convert_csv(infile, outfile, to_units={"volume": "gal"},
+                               float_format=".1f", delimiter=";")
+
+    rows = [line.split(";") for line in outfile.read_text().splitlines()]
+    assert rows[0][1] == "Volume (gal)"
+    assert rows[1][1] == "4200.0"
+
+
+def test_convert_csv_empty():
+    outfile = io.StringIO()
+
+    assert csv_conversion.convert_csv(io.StringIO(""), outfile) == 0
+    assert outfile.getvalue() == ""
+
+
+def test_convert_csv_not_a_number():
+    with pytest.raises(ValueError, match="row 4, column 5"):
+        csv_conversion.convert_csv(io.StringIO(CSV + "2020-01-03,1,1,,x\n"),
+                                   io.StringIO(),
+                                   columns={"Depth": ("ft", "m")})
+
+
+@pytest.mark.parametrize("row", ["2020-01-03,1,1,x", "", "2020-01-03"])
+def test_convert_csv_short_row(row):
+    with pytest.raises(ValueError, match="row 4, column 5: missing"):
+        csv_conversion.convert_csv(io.StringIO(CSV + row + "\n"),
+                                   io.StringIO(),
+                                   columns={"Depth": ("ft", "m")})
+
+
+def test_files_are_utf8(tmp_path):
+    """
+    the files are read and written as utf-8, whatever the locale
+    (needs a fresh interpreter, with an ASCII locale, to check)
+    """
+    import os
+    import subprocess
+    import sys
+
+    infile = tmp_path / "in.csv"
+    infile.write_bytes("Temp (\N{DEGREE SIGN}C),Depth (\N{MICRO SIGN}m)\n"
+                       "10,20\n".encode("utf-8"))
+    outfile = tmp_path / "out.csv"
+    code = ("from nucos import csv_conversion\n"
+            "csv_conversion.convert_csv({!r}, {!r}, "
+            "to_units={{'length': 'mm'}})\n".format(str(infile), str(outfile)))
+    env = dict(os.environ, LC_ALL="C", PYTHONUTF8="0", PYTHONCOERCECLOCALE="0")
+
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
+
+    assert (outfile.read_bytes().decode("utf-8").splitlines()[0] ==
+            "Temp (\N{DEGREE SIGN}C),Depth (mm)")
+
+
+def test_convert_rows_is_lazy():
+    def rows():
+        yield ["1"]
+        raise RuntimeError("read too far")
+
+    converted = csv_conversion.convert_rows(rows(), [(0, lambda x: x * 2)])
+
+    assert next(converted) == ["2.0"]
+
+
+def test_command_line(tmp_path):
+    infile = tmp_path / "in.csv"
+    infile.write_text(CSV)
+    outfile = tmp_path / "out.csv"
+
+    main(["convert-csv", str(infile), str(outfile),
+          "--to", "volume", "m^3", "--column", "Depth", "ft", "m"])
+
+    header = outfile.read_text().splitlines()[0]
+    assert header == "Date,Volume (m^3),Rate [bbl/day],Note,Depth"
+
+
+def test_command_line_error(tmp_path, capsys):
+    infile = tmp_path / "in.csv"
+    infile.write_text(CSV)
+
+    with pytest.raises(SystemExit) as err:
+        main(["convert-csv", str(infile), str(tmp_path / "out.csv"),
+              "--to", "volume", "furlong"])
+
+    assert err.value.code == 1
+    assert "furlong" in capsys.readouterr().err
@@ -32,11 +32,11 @@ def test_write_unit_data_file_txt():
     unit_data.write_all_unit_names(format="txt", filename=filename)
 
 
-def test_dump_to_json():
+def test_dump_to_json(tmp_path):
     '''
     does the dump_to_json_ run without error
     '''
-    unit_data.dump_to_json("junk.json")
+    unit_data.dump_to_json(tmp_path / "junk.json")
 
 
 def test_write_all_unit_names():
@@ -54,3 +54,8 @@ def test_write_all_unit_names():
 #     unit_data.write_units()
 #     # and to a file
 #     unit_data.write_units("all_units.txt")
+
+
+def test_unit_sets():
+    assert "bbl" in unit_data.unit_sets["Volume"]
+    assert "bbl" in unit_data.supported_units
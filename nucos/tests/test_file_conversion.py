@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+
+"""
+tests for converting files in parallel
+"""
+
+import io
+import json
+import pickle
+
+import pytest
+
+from nucos import file_conversion, csv_conversion, convert
+from nucos.__main__ import main
+
+HEADER = "Date,Volume (bbl),Rate [bbl/day],Note,Depth\n"
+ROWS = "".join('2020-01-{:02d},{},{},"a, b",{}\n'.format(i % 28 + 1,
+                                                         i * 10.5, i, i / 3)
+               for i in range(200))
+
+
+@pytest.fixture
+def csv_file(tmp_path):
+    filename = tmp_path / "in.csv"
+    filename.write_text(HEADER + ROWS)
+    return filename
+
+
+@pytest.fixture
+def ndjson_file(tmp_path):
+    filename = tmp_path / "in.ndjson"
+    with open(filename, "w") as outfile:
+        for i in range(100):
+            outfile.write(json.dumps({"id": i,
+                                      "Volume (bbl)": i * 2.5,
+                                      "Depth": None if i % 10 else i,
+                                      "note": "x"}) + "\n")
+    return filename
+
+
+def test_split_ranges(csv_file):
+    data = csv_file.read_bytes()
+
+    ranges = list(file_conversion.split_ranges(csv_file, 10, chunk_bytes=100))
+
+    assert ranges[0][0] == 10
+    assert ranges[-1][1] == len(data)
+    for (start, end), (next_start, _) in zip(ranges, ranges[1:]):
+        assert end == next_start
+        assert data[end - 1:end] == b"\n"
+
+
+def test_plan_is_picklable(csv_file):
+    plan, header, data_start = file_conversion.make_plan(
+        csv_file, "csv", to_units={"volume": "m^3"})
+
+    assert header == "Date,Volume (m^3),Rate [bbl/day],Note,Depth\r\n"
+    assert data_start == len(HEADER)
+    plan = pickle.loads(pickle.dumps(plan))
+    assert plan.conversions[0][1](1.0) == convert("bbl", "m^3", 1.0)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_file_csv(csv_file, workers):
+    kwargs = {"columns": {"Depth": ("ft", "m")},
+              "to_units": {"volume": "m^3", "discharge": "m^3/s"}}
+    expected = io.StringIO()
+    csv_conversion.convert_csv(str(csv_file), expected, **kwargs)
+
+    result = io.StringIO()
+    num_rows = file_conversion.convert_file(str(csv_file), result,
+                                            workers=workers,
+                                            chunk_bytes=500,
+                                            **kwargs)
+
+    assert num_rows == 200
+    assert result.getvalue() == expected.getvalue()
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_file_ndjson(ndjson_file, tmp_path, workers):
+    outfile = tmp_path / "out.ndjson"
+    num_rows = file_conversion.convert_file(str(ndjson_file), outfile,
+                                            to_units={"volume": "m^3"},
+                                            columns={"Depth": ("ft", "m")},
+                                            workers=workers,
+                                            chunk_bytes=500)
+
+    records = [json.loads(line) for line in open(outfile)]
+    assert num_rows == len(records) == 100
+    assert list(records[10]) == ["id", "Volume (m^3)", "Depth", "note"]
+    assert records[10]["Volume (m^3)"] == convert("bbl", "m^3", 25.0)
+    assert records[10]["Depth"] == convert("ft", "m", 10)
+    assert records[11]["Depth"] is None
+
+
+def test_convert_file_error(tmp_path):
+    filename = tmp_path / "in.ndjson"
+    filename.write_text('{"Volume (bbl)": 1}\n{"Volume (bbl)": "lots"}\n')
+
+    with pytest.raises(ValueError, match="row 2"):
+        file_conversion.convert_file(str(filename), io.StringIO(),
+                                     to_units={"volume": "m^3"}, workers=1)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_file_ndjson_line_separators(tmp_path, workers):
+    # valid JSON can have these in strings, unescaped
+    names = ["a\u2028b", "c\u2029d", "e\x85f", "g\rh"]
+    filename = tmp_path / "in.ndjson"
+    with open(filename, "w", encoding="utf-8", newline="") as outfile:
+        for name in names:
+            outfile.write(json.dumps({"Name": name, "Volume (bbl)": 1.0},
+                                     ensure_ascii=False) + "\n")
+    outfile = tmp_path / "out.ndjson"
+
+    num_rows = file_conversion.convert_file(str(filename), outfile,
+                                            to_units={"volume": "m^3"},
+                                            workers=workers, chunk_bytes=20)
+
+    with open(outfile, encoding="utf-8", newline="") as infile:
+        records = [json.loads(line) for line in infile]
+    assert num_rows == 4
+    assert [record["Name"] for record in records] == names
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_file_error_row_csv(tmp_path, workers):
+    rows = ROWS.splitlines(keepends=True)
+    rows[150] = "2020-01-01,1,1,x,deep\n"
+    filename = tmp_path / "in.csv"
+    filename.write_text(HEADER + "".join(rows))
+
+    # the row number in the file, not in the range
+    with pytest.raises(ValueError, match="row 152, column 5"):
+        file_conversion.convert_file(str(filename), io.StringIO(),
+                                     columns={"Depth": ("ft", "m")},
+                                     workers=workers, chunk_bytes=500)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert_file_error_row_ndjson(ndjson_file, workers):
+    lines = ndjson_file.read_text().splitlines(keepends=True)
+    lines[80] = '{"Volume (bbl)": "lots"}\n'
+    lines[90] = "[1, 2]\n"
+    ndjson_file.write_text("".join(lines))
+
+    with pytest.raises(ValueError, match="row 81, key 'Volume"):
+        file_conversion.convert_file(str(ndjson_file), io.StringIO(),
+                                     to_units={"volume": "m^3"},
+                                     workers=workers, chunk_bytes=500)
+
+    lines[80] = lines[79]
+    ndjson_file.write_text("".join(lines))
+
+    with pytest.raises(ValueError, match="row 91, not a JSON object"):
+        file_conversion.convert_file(str(ndjson_file), io.StringIO(),
+                                     to_units={"volume": "m^3"},
+                                     workers=workers, chunk_bytes=500)
+
+
+def test_count_lines(csv_file):
+    data = csv_file.read_bytes()
+
+    assert file_conversion.count_lines(csv_file, len(data)) == 201
+    assert file_conversion.count_lines(csv_file, 100, block_size=7) == (
+        data[:100].count(b"\n"))
+
+
+def test_convert_file_format():
+    with pytest.raises(ValueError):
+        file_conversion.convert_file("data.txt", io.StringIO())
+
+
+def test_convert_file_empty(tmp_path):
+    filename = tmp_path / "in.csv"
+    filename.write_text("")
+    result = io.StringIO()
+
+    assert file_conversion.convert_file(str(filename), result) == 0
+    assert result.getvalue() == ""
+
+
+def test_command_line_workers(csv_file, tmp_path):
+    outfile = tmp_path / "out.csv"
+
+    main(["convert-csv", str(csv_file), str(outfile),
+          "--to", "volume", "m^3", "--workers", "2"])
+
+    lines = outfile.read_text().splitlines()
+    assert lines[0] == "Date,Volume (m^3),Rate [bbl/day],Note,Depth"
+    assert len(lines) == 201
+
+
+def test_command_line_ndjson(ndjson_file, tmp_path):
+    outfile = tmp_path / "out.ndjson"
+
+    main(["convert-ndjson", str(ndjson_file), str(outfile),
+          "--to", "volume", "m^3", "--workers", "1"])
+
+    assert "Volume (m^3)" in json.loads(outfile.read_text().splitlines()[0])
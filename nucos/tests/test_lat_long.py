@@ -282,3 +282,294 @@ def test_format_lat_dms(number, text):
 def test_format_lon_dms(number, text):
     assert lat_long.format_lon_dms(number) == text
 
+
+
+# the array versions of the LatLongConverter methods
+
+LLC = lat_long.LatLongConverter
+
+DEC_DEG_CASES = [  # (d, m, s, valid)
+    (30, 30, 0, True),
+    (-45, 34, 12, True),
+    (-0.0, 34, 0, True),
+    (45.5, 0, 0, True),
+    (30, -30, 0, False),  # negative minutes
+    (30, 30, -1, False),  # negative seconds
+    (200, 0, 0, False),  # too big
+    (20, 61, 0, False),  # too big minutes
+    (30.2, 5, 0, False),  # fractional degrees and minutes
+    (30, 4.5, 6, False),  # fractional minutes and seconds
+    (float('nan'), 0, 0, False),
+]
+
+
+def test_ToDecDegArray(numpy_or_not):
+    d, m, s, valid = zip(*DEC_DEG_CASES)
+    results, result_valid = LLC.ToDecDegArray(d, m, s)
+
+    assert list(result_valid) == list(valid)
+    for args, is_valid, result in zip(DEC_DEG_CASES, valid, results):
+        if is_valid:
+            expected = LLC.ToDecDeg(*args[:3])
+            assert result == expected
+            assert lat_long.signbit(result) == lat_long.signbit(expected)
+        else:
+            assert result != result  # NaN
+
+
+def test_ToDecDegArray_broadcast(numpy_or_not):
+    results, valid = LLC.ToDecDegArray([10, -20, 30], 30)
+
+    assert list(results) == [10.5, -20.5, 30.5]
+    assert all(valid)
+
+
+def test_ToDecDegArray_max(numpy_or_not):
+    results, valid = LLC.ToDecDegArray([89, 91], max=90)
+
+    assert list(valid) == [True, False]
+
+
+DEGREES = [0.0, -0.0, 45.57, -45.57, -0.1, 28.2186111111, -92.6244444444,
+           179.99999, 40 + 40 / 60]
+
+
+def test_ToDegMinArray(numpy_or_not):
+    degrees, minutes, valid = LLC.ToDegMinArray(DEGREES + [float('inf')])
+
+    assert list(valid) == [True] * len(DEGREES) + [False]
+    for value, deg, mins in zip(DEGREES, degrees, minutes):
+        expected = LLC.ToDegMin(value)
+        assert deg == expected[0]
+        assert lat_long.signbit(deg) == lat_long.signbit(expected[0])
+        assert mins == pytest.approx(expected[1], abs=1e-9)
+    assert degrees[-1] != degrees[-1]
+
+
+def test_ToDegMinSecArray(numpy_or_not):
+    degrees, minutes, seconds, valid = LLC.ToDegMinSecArray(DEGREES +
+                                                            [float('nan')])
+
+    assert list(valid) == [True] * len(DEGREES) + [False]
+    for value, deg, mins, secs in zip(DEGREES, degrees, minutes, seconds):
+        expected = LLC.ToDegMinSec(value)
+        assert deg == expected[0]
+        assert lat_long.signbit(deg) == lat_long.signbit(expected[0])
+        assert mins == expected[1]
+        assert secs == pytest.approx(expected[2], abs=1e-9)
+    assert minutes[-1] != minutes[-1]
+
+
+def test_ToDegMinArray_many():
+    np = pytest.importorskip("numpy")
+    values = np.random.default_rng(42).uniform(-180, 180, 100000)
+    degrees, minutes, valid = LLC.ToDegMinArray(values)
+
+    assert valid.all()
+    for i in range(0, len(values), 997):
+        assert (degrees[i], minutes[i]) == pytest.approx(LLC.ToDegMin(values[i]))
+
+
+def test_format_lat_d():
+    assert lat_long.format_lat_d(-33.2) == "33.20\xb0 South"
+
+
+def test_format_lon_d():
+    assert lat_long.format_lon_d(-33.2) == "33.20\xb0 West"
+
+
+# formatting whole arrays
+
+SCALAR_FORMATTERS = {("lat", "d"): lat_long.format_lat_d,
+                     ("lat", "dm"): lat_long.format_lat_dm,
+                     ("lat", "dms"): lat_long.format_lat_dms,
+                     ("lon", "d"): lat_long.format_lon_d,
+                     ("lon", "dm"): lat_long.format_lon_dm,
+                     ("lon", "dms"): lat_long.format_lon_dms,
+                     }
+
+
+@pytest.mark.parametrize(("kind", "style"), list(SCALAR_FORMATTERS))
+def test_format_array(numpy_or_not, kind, style):
+    values = DEGREES + [float('nan'), float('inf')]
+    format_array = (lat_long.format_lat_array if kind == "lat"
+                    else lat_long.format_lon_array)
+
+    result = format_array(values, style)
+
+    assert result == [SCALAR_FORMATTERS[kind, style](f) for f in values]
+
+
+def test_format_array_iterable(numpy_or_not):
+    result = lat_long.format_lat_array((f for f in [-0.1, 28.2186111111]))
+
+    assert result == ["0\xb0 6.00′ South", "28\xb0 13.12′ North"]
+
+
+def test_format_array_html(numpy_or_not):
+    result = lat_long.format_lon_array([30.001], "dms", html=True)
+
+    assert result == ["30&deg; 0′ 3.60″ East"]
+
+
+def test_format_array_bad_style(numpy_or_not):
+    with pytest.raises(ValueError):
+        lat_long.format_lat_array([1.0], "dd")
+
+
+@pytest.mark.parametrize("style", ["d", "dm", "dms"])
+def test_format_array_many(style):
+    np = pytest.importorskip("numpy")
+    values = np.random.default_rng(42).uniform(-180, 180, 20000)
+    # values right on minute and second boundaries too
+    values = np.r_[values, np.round(values, 4), np.round(values * 3600) / 3600]
+
+    result = lat_long.format_lon_array(values, style)
+
+    formatter = SCALAR_FORMATTERS["lon", style]
+    assert result == [formatter(f) for f in values.tolist()]
+
+
+# parsing strings
+
+@pytest.mark.parametrize(("string", "expected"),
+                         [("48\xb0 12.5' N", 48 + 12.5 / 60),
+                          ("-122 30 15", -(122 + 30 / 60 + 15 / 3600)),
+                          ("28\xb0 13′ 7.00″ North", 28 + 13 / 60 + 7 / 3600),
+                          ("N 45.5\xb0", 45.5),
+                          ("30.500000\xb0", 30.5),  # ToDecDeg(ustring=True)
+                          ("-30\xb0 0.060'", -30.001),  # ToDegMin(ustring=True)
+                          ('30&deg; 0\' 3.60" South', -30.001),  # format_html
+                          ("  12 30 s ", -12.5),
+                          ("-0 30", -0.5),
+                          ("+10", 10.0),
+                          ])
+def test_parse_latlon_array(numpy_or_not, string, expected):
+    result, valid = lat_long.parse_latlon_array([string])
+
+    assert list(valid) == [True]
+    assert result[0] == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("string",
+                         ["",
+                          "abc",
+                          "-30 S",  # sign and direction
+                          "N 30 S",
+                          "30 61",  # too many minutes
+                          "30.5 3",  # fractional degrees with minutes
+                          "181 W",
+                          "30 15 10 5",
+                          None,
+                          ])
+def test_parse_latlon_array_invalid(numpy_or_not, string):
+    result, valid = lat_long.parse_latlon_array(["10 N", string])
+
+    assert list(valid) == [True, False]
+    assert result[1] != result[1]  # NaN
+
+
+def test_parse_lat_lon_array_directions(numpy_or_not):
+    lats, lat_valid = lat_long.parse_lat_array(["10 N", "10 E", "91 S"])
+    lons, lon_valid = lat_long.parse_lon_array(["10 N", "10 W", "91 E"])
+
+    assert list(lat_valid) == [True, False, False]
+    assert list(lon_valid) == [False, True, True]
+    assert list(lons[1:]) == [-10.0, 91.0]
+
+
+@pytest.mark.parametrize("style", ["d", "dm", "dms"])
+def test_parse_formatted(numpy_or_not, style):
+    strings = lat_long.format_lon_array(DEGREES, style)
+
+    result, valid = lat_long.parse_lon_array(strings)
+
+    assert all(valid)
+    assert list(result) == pytest.approx(DEGREES, abs=0.01)
+
+
+def test_pattern_is_lazy():
+    """
+    the pattern shouldn't be compiled on import
+    (needs a fresh interpreter to check)
+    """
+    import subprocess
+    import sys
+
+    code = ("from nucos import lat_long\n"
+            "assert 'LATLON_PATTERN' not in vars(lat_long)\n"
+            "lat_long.parse_lat_array(['10 N'])\n"
+            "assert lat_long.LATLON_PATTERN.fullmatch('10 N')\n"
+            )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+# the array versions of Latitude and Longitude
+
+@pytest.mark.parametrize(("array_class", "scalar_class"),
+                         [(lat_long.LatitudeArray, lat_long.Latitude),
+                          (lat_long.LongitudeArray, lat_long.Longitude),
+                          ])
+def test_coordinate_array_matches_scalar(numpy_or_not,
+                                         array_class, scalar_class):
+    values = [v for v in DEGREES if abs(v) <= 90]
+    coords = array_class(values)
+    scalars = [scalar_class(v) for v in values]
+
+    assert len(coords) == len(values)
+    assert coords.direction() == [s.direction() for s in scalars]
+    for style in (1, 2, 3):
+        assert coords.format(style) == [s.format(style) for s in scalars]
+        assert coords.format_html(style) == [s.format_html(style)
+                                             for s in scalars]
+    deg, mins, secs, directions = coords.degrees_minutes_seconds()
+    for i, scalar in enumerate(scalars):
+        assert (deg[i], mins[i], secs[i], directions[i]) == pytest.approx(
+            scalar.degrees_minutes_seconds())
+
+
+def test_coordinate_array_constructor(numpy_or_not):
+    lons = lat_long.LongitudeArray([120, 10], [45, 30], 45, direction='w')
+
+    assert list(lons.values) == [lat_long.Longitude(120, 45, 45, 'w').value,
+                                 lat_long.Longitude(10, 30, 45, 'w').value]
+
+
+@pytest.mark.parametrize(("args", "kwargs"),
+                         [(([91],), {}),
+                          (([10, -10],), {"direction": "S"}),
+                          (([10],), {"direction": "E"}),
+                          (([10.5], [30]), {}),
+                          ])
+def test_coordinate_array_invalid(numpy_or_not, args, kwargs):
+    with pytest.raises(ValueError):
+        lat_long.LatitudeArray(*args, **kwargs)
+
+
+def test_coordinate_array_from_strings(numpy_or_not):
+    lats = lat_long.LatitudeArray.from_strings(["48\xb0 12.5' S", "10 N"])
+
+    assert list(lats.values) == pytest.approx([-48 - 12.5 / 60, 10])
+    with pytest.raises(ValueError):
+        lat_long.LatitudeArray.from_strings(["10 W"])
+
+
+def test_coordinate_array_slicing(numpy_or_not):
+    lats = lat_long.LatitudeArray([10, 20, 30, 40])
+
+    view = lats[1::2]
+
+    assert isinstance(view, lat_long.LatitudeArray)
+    assert view.format(1) == ['20.00\xb0 North', '40.00\xb0 North']
+    assert lats.values.nbytes == 4 * 8
+    assert view.values.nbytes == 2 * 8
+    # a view, not a copy
+    if numpy_or_not == "numpy":
+        assert view.values.base is lats.values
+    else:
+        assert view.values.obj is lats.values.obj
+
+    item = lats[2]
+    assert isinstance(item, lat_long.Latitude)
+    assert item.value == 30.0
+    assert [lat.value for lat in lats] == [10, 20, 30, 40]
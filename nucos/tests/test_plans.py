@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+"""
+tests for the conversion plans
+"""
+
+import pickle
+from math import isclose
+
+import pytest
+
+import nucos
+from nucos import array_conversion, convert, get_converter
+from nucos.plans import AffineStep, BarrierStep, Plan, get_plan
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit", "unit_type"),
+                         [("ft", "m", None),
+                          ("F", "C", None),
+                          ("API", "kg/m^3", None),
+                          ("g/cm^3", "API", None),
+                          ("API", "API", None),
+                          ("oz", "ml", "volume"),
+                          ])
+def test_get_plan(from_unit, to_unit, unit_type):
+    plan = get_plan(from_unit, to_unit, unit_type)
+    converter = get_converter(from_unit, to_unit, unit_type)
+
+    for value in (0.5, 10.0, 35.5):
+        assert isclose(plan(value), converter(value), rel_tol=1e-12)
+
+
+def test_chain_is_fused():
+    plan = get_plan("ft", "m").then(get_plan("m", "cm"),
+                                    get_plan("cm", "in"),
+                                    get_converter("in", "km"))
+
+    assert len(plan) == 1
+    assert plan.is_affine
+    assert isclose(plan.scale, get_converter("ft", "km").scale)
+    assert plan.offset == 0.0
+
+
+def test_chain_affine():
+    plan = get_plan("C", "F").then(get_plan("F", "K"))
+
+    assert len(plan) == 1
+    assert isclose(plan.scale, 1.0)
+    assert isclose(plan.offset, 273.15)
+
+
+def test_chain_across_barrier():
+    plan = (get_plan("lb/ft^3", "kg/m^3")
+            .then(get_plan("kg/m^3", "API"),
+                  get_plan("API", "g/cm^3"),
+                  get_plan("g/cm^3", "kg/m^3")))
+
+    assert [type(step) for step in plan] == [AffineStep,
+                                             BarrierStep,
+                                             BarrierStep,
+                                             AffineStep]
+    assert not plan.is_affine
+    assert isclose(plan(50.0), convert("lb/ft^3", "kg/m^3", 50.0))
+
+
+def test_no_scale_with_barrier():
+    plan = get_plan("API", "SG")
+
+    with pytest.raises(ValueError):
+        plan.scale
+
+
+def test_empty_plan():
+    plan = Plan()
+
+    assert plan.is_affine
+    assert plan.scale == 1.0
+    assert plan.offset == 0.0
+    assert plan(3.0) == 3.0
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit"),
+                         [("ft", "m"),
+                          ("F", "C"),
+                          ("API", "kg/m^3"),
+                          ("kg/m^3", "API"),
+                          ])
+def test_inverse(from_unit, to_unit):
+    plan = get_plan(from_unit, to_unit)
+    inverse = plan.inverse()
+
+    assert isclose(inverse(plan(32.0)), 32.0)
+    assert isclose(inverse(5.0), convert(to_unit, from_unit, 5.0))
+
+
+def test_inverse_zero_scale():
+    with pytest.raises(ValueError):
+        Plan([AffineStep(0.0, 1.0)]).inverse()
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit"),
+                         [("ft", "nm"),
+                          ("C", "F"),
+                          ("API", "lb/ft^3"),
+                          ("lb/ft^3", "API"),
+                          ])
+def test_simplify_round_trip(from_unit, to_unit):
+    plan = get_plan(from_unit, to_unit)
+
+    assert plan.then(plan.inverse()).simplify() == Plan()
+
+
+def test_simplify_leaves_real_steps():
+    plan = get_plan("API", "kg/m^3").then(get_plan("kg/m^3", "lb/ft^3"))
+
+    assert plan.simplify() == plan
+
+
+def test_bad_steps():
+    with pytest.raises(TypeError):
+        Plan([AffineStep(), "api_to_sg"])
+    with pytest.raises(ValueError):
+        BarrierStep("c_to_f")
+
+
+@pytest.mark.parametrize(("from_unit", "to_unit"),
+                         [("ft", "m"),
+                          ("C", "F"),
+                          ("API", "lb/ft^3"),
+                          ("lb/ft^3", "API"),
+                          ])
+def test_apply(numpy_or_not, from_unit, to_unit):
+    values = [10.0, 20.0, 35.0]
+    plan = get_plan(from_unit, to_unit)
+
+    result = plan.apply(values)
+
+    assert all(isclose(r, convert(from_unit, to_unit, v))
+               for r, v in zip(result, values))
+
+
+def test_apply_in_place():
+    np = pytest.importorskip("numpy")
+    values = np.array([10.0, 20.0, 35.0])
+    expected = [convert("kg/m^3", "API", convert("lb/ft^3", "kg/m^3", v))
+                for v in values]
+    plan = get_plan("lb/ft^3", "kg/m^3").then(get_plan("kg/m^3", "API"))
+
+    result = plan.apply(values, out=values)
+
+    assert result is values
+    assert np.allclose(values, expected)
+
+
+def test_apply_converter_with_plan():
+    np = pytest.importorskip("numpy")
+    plan = get_plan("C", "F").then(get_plan("F", "K"))
+
+    result = array_conversion.apply_converter(plan, np.array([0.0, 100.0]))
+
+    assert np.allclose(result, [273.15, 373.15])
+
+
+def test_pickle():
+    plan = get_plan("API", "kg/m^3").then(get_plan("kg/m^3", "lb/ft^3"))
+
+    assert pickle.loads(pickle.dumps(plan)) == plan
+
+
+def test_lazy_import():
+    assert nucos.get_plan is get_plan
+    assert nucos.Plan is Plan
@@ -0,0 +1,172 @@
+#!/usr/bin/env python
+
+"""
+tests for units with SI prefixes that aren't in the tables
+"""
+
+import pickle
+from math import isclose
+
+import pytest
+
+from nucos import unit_conversion
+from nucos import (convert,
+                   get_converter,
+                   get_unit,
+                   get_primary_name,
+                   get_abbreviation,
+                   is_supported,
+                   is_supported_unit,
+                   get_supported_names,
+                   )
+from nucos.si_prefixes import PREFIXES, PREFIXABLE, split_prefix, unprefix
+
+
+@pytest.mark.parametrize(("unit", "base", "factor"),
+                         [("nanometer", "m", 1e-9),
+                          ("nanometers", "m", 1e-9),
+                          ("decameter", "m", 10.0),
+                          ("dam", "m", 10.0),
+                          ("gigapascal", "Pa", 1e9),
+                          ("GPa", "Pa", 1e9),
+                          ("hPa", "mbar", 1.0),
+                          ("kbar", "bar", 1000.0),
+                          ("megatonne", "tonne", 1e6),
+                          ("Gg", "kg", 1e6),
+                          ("ng", "mg", 1e-6),
+                          ("\N{MICRO SIGN}l", "ml", 1e-3),
+                          ("\N{GREEK SMALL LETTER MU}l", "ml", 1e-3),
+                          ("uL", "ml", 1e-3),
+                          ("hectoliter", "l", 100.0),
+                          ("dekaliter", "l", 10.0),
+                          ("ms", "s", 1e-3),
+                          ("Ms", "s", 1e6),
+                          ("kilosecond", "s", 1e3),
+                          ("kN/m", "N/m", 1e3),
+                          ("mSt", "cSt", 0.1),
+                          ("kPa s", "Pa s", 1e3),
+                          ])
+def test_convert_prefixed(unit, base, factor):
+    assert isclose(convert(unit, base, 1.0), factor)
+    assert isclose(convert(base, unit, factor), 1.0)
+
+
+def test_convert_prefixed_with_type():
+    assert isclose(convert("length", "nanometers", "m", 1.0), 1e-9)
+    assert isclose(convert("length", "m", "nm", 1.0), 1.0 / 1852)
+
+
+def test_table_names_first():
+    # nm is in the table as nautical mile
+    assert convert("nm", "m", 1.0) == 1852.0
+    # milliPascal second is in the table -- the same either way
+    assert isclose(convert("mPa s", "Pa s", 1.0), 1e-3)
+
+
+@pytest.mark.parametrize(("unit", "base", "factor"),
+                         [("mt", "kg", 1e3),
+                          ("Mt", "kg", 1e3),
+                          ("Mm", "m", 1e-3),
+                          ("ML", "l", 1e-3),
+                          ("Mg", "g", 1e-3),
+                          ("Mbar", "bar", 1e-3),
+                          ("mPa", "Pa", 1e6),
+                          ("MN/m", "N/m", 1e-3),
+                          ("MPa s", "Pa s", 1e-3),
+                          ("Mm/s", "m/s", 1e-3),
+                          ])
+def test_table_names_ignore_case(unit, base, factor):
+    # names in the table are found first, whatever the case,
+    # so these are not prefixed units
+    assert isclose(convert(unit, base, 1.0), factor)
+
+
+@pytest.mark.parametrize("unit", ["kilofoot",  # not metric
+                                  "mft",
+                                  "kkm",  # already has a prefix
+                                  "m s",  # meter second
+                                  "kilo",
+                                  "xm",
+                                  ])
+def test_not_prefixed(unit):
+    with pytest.raises(unit_conversion.NotSupportedUnitError):
+        convert(unit, "m", 1.0)
+
+
+def test_wrong_type():
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        convert("m", "GPa", 1.0)
+
+
+def test_get_converter():
+    converter = get_converter("kPa", "GPa")
+
+    assert converter.to_unit == "gigapascal"
+    assert isclose(converter(1.0), 1e-6)
+
+
+def test_get_unit():
+    unit = get_unit("GPa")
+
+    assert unit is get_unit("gigapascal")
+    assert unit.unit_type == "pressure"
+    assert unit.primary_name == "gigapascal"
+    assert unit.abbreviation == "GPa"
+    assert unit.scale == 1e9
+    assert unit.code is None
+    assert pickle.loads(pickle.dumps(unit)) is unit
+
+
+def test_names():
+    assert get_primary_name("nm", "length") == "nautical mile"
+    assert get_primary_name("Gm") == "gigameter"
+    assert get_abbreviation("gigameter") == "Gm"
+    assert get_abbreviation("megatonne") == "megatonne"
+    assert get_primary_name("millipascal") == "millipascal"
+    assert get_primary_name("kSt") == "kilostoke"
+    assert get_primary_name("GPa s") == "gigapascal second"
+    assert get_primary_name("kN/m") == "kilonewton per meter"
+    assert get_abbreviation("\N{GREEK SMALL LETTER MU}s") == "\N{MICRO SIGN}s"
+
+
+def test_abbreviation_clash():
+    # "nm" is a nautical mile
+    assert get_abbreviation("nanometer") == "nanometer"
+    assert get_unit("nanometer").abbreviation == "nanometer"
+    assert convert("nanometer", get_abbreviation("nanometer"), 1.0) == 1.0
+
+
+@pytest.mark.parametrize("prefix", PREFIXES)
+def test_abbreviations_round_trip(prefix):
+    for unit_type, units in PREFIXABLE.items():
+        for primary_name in units:
+            unit = get_unit(prefix + primary_name, unit_type)
+
+            assert get_unit(unit.abbreviation) is unit
+
+
+def test_supported():
+    assert is_supported("GPa")
+    assert is_supported_unit("length", "nanometer")
+    assert not is_supported_unit("length", "GPa")
+    assert not is_supported("kilofoot")
+
+
+def test_tables_do_not_grow():
+    convert("nanometer", "m", 1.0)
+
+    assert "nanometer" not in get_supported_names("length")
+    assert "nanometer" not in unit_conversion.Converters["length"].Synonyms
+
+
+def test_split_prefix():
+    assert split_prefix("GPa") == [("giga", "Pa")]
+    assert split_prefix("millisecond") == [("milli", "second"),
+                                           ("milli", "illisecond")]
+    assert split_prefix("m s") == []
+
+
+def test_unprefix():
+    assert unprefix("gigapascal") == ("giga", "pascal")
+    assert unprefix("giga") is None
+    assert unprefix("pascal") is None
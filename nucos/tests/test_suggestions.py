@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+"""
+tests for the "did you mean" suggestions
+"""
+
+import pytest
+
+import nucos
+from nucos import convert, InvalidUnitError, NotSupportedUnitError
+from nucos.suggestions import (suggest_units,
+                               edit_distance,
+                               SuggestionIndex,
+                               )
+
+
+@pytest.mark.parametrize(("name", "expected"),
+                         [("kilogrms", "kilograms"),
+                          ("celcius", "Celsius"),
+                          ("farenheit", "Fahrenheit"),
+                          ("kilometre", "kilometer"),
+                          ("bbl/dya", "bbl/day"),
+                          ("barels per day", "barrel per day"),
+                          ("cubic meter per secnd", "cubic meter per second"),
+                          ("Kilo Grams", "kilogram"),
+                          ])
+def test_suggest_units(name, expected):
+    assert suggest_units(name)[0] == expected
+
+
+def test_suggest_units_type():
+    assert suggest_units("kilogrms", "Mass")[0] == "kilograms"
+    assert suggest_units("kilogrms", "volume") == []
+
+
+@pytest.mark.parametrize("name", ["xyzzy", "", " ", None, 3.0])
+def test_nothing_close(name):
+    assert suggest_units(name) == []
+
+
+def test_k():
+    assert len(suggest_units("m", k=5)) == 5
+    assert len(suggest_units("m", k=2)) == 2
+
+
+def test_no_duplicates():
+    suggestions = suggest_units("kg/m3 ")
+
+    assert len(suggestions) == len(set(suggestions))
+
+
+def test_primary_names_first():
+    index = SuggestionIndex([("meters", "length", False),
+                             ("meter", "length", True),
+                             ])
+
+    assert index.suggest("meterz") == ["meter", "meters"]
+
+
+@pytest.mark.parametrize(("name1", "name2", "distance"),
+                         [("meter", "meter", 0),
+                          ("meter", "metre", 1),
+                          ("meter", "meters", 1),
+                          ("meter", "mete", 1),
+                          ("meter", "mater", 1),
+                          ("", "abc", 3),
+                          ("kitten", "sitting", 3),
+                          ])
+def test_edit_distance(name1, name2, distance):
+    assert edit_distance(name1, name2, 5) == distance
+    assert edit_distance(name2, name1, 5) == distance
+
+
+def test_edit_distance_limit():
+    assert edit_distance("kitten", "sitting", 2) == 3
+    assert edit_distance("a", "abcdef", 2) == 3
+
+
+def test_not_supported_error():
+    with pytest.raises(NotSupportedUnitError) as err:
+        convert("kilogrms", "lb", 1.0)
+
+    assert err.value.suggestions[0] == "kilograms"
+
+
+def test_invalid_unit_error():
+    with pytest.raises(InvalidUnitError) as err:
+        convert("Mass", "kilometre", "lb", 1.0)
+
+    # it's not a mass, so there's nothing to suggest
+    assert err.value.suggestions == []
+
+
+def test_invalid_unit_error_message_only():
+    assert InvalidUnitError("a message").suggestions == []
+
+
+def test_lazy_import():
+    assert nucos.suggest_units is suggest_units
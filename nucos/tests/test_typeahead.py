@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+tests for the unit name typeahead
+"""
+
+import json
+
+import pytest
+
+import nucos
+from nucos import InvalidUnitTypeError, get_primary_names
+from nucos.typeahead import complete_units, get_index, TypeaheadIndex
+
+
+def test_complete_units():
+    completions = complete_units("cubic m")
+
+    assert completions[0] == "cubic meter"
+    assert all(name.lower().startswith("cubic m") for name in completions)
+
+
+@pytest.mark.parametrize("prefix", ["Kilo", "kilo", "KILO", " kilo"])
+def test_ignores_case_and_whitespace(prefix):
+    assert complete_units(prefix)[0] == "kilogram"
+
+
+def test_ignores_dots():
+    assert "ft/s" in complete_units("ft./s", "velocity")
+
+
+def test_unit_type():
+    assert complete_units("c", "Temperature") == ["Celsius", "C",
+                                                  "centigrade"]
+    assert complete_units("c", "temperature") == ["Celsius", "C",
+                                                  "centigrade"]
+
+
+def test_bad_unit_type():
+    with pytest.raises(InvalidUnitTypeError):
+        complete_units("k", "not a type")
+
+
+def test_primary_names_first():
+    completions = complete_units("", "Mass", k=None)
+    primary_names = get_primary_names("Mass")
+
+    assert sorted(completions[:len(primary_names)]) == sorted(primary_names)
+    assert "kg" in completions[len(primary_names):]
+
+
+def test_k():
+    assert len(complete_units("m", k=3)) == 3
+    assert len(complete_units("m", k=None)) > 10
+
+
+@pytest.mark.parametrize("prefix", ["zzz", None, 3])
+def test_no_completions(prefix):
+    assert complete_units(prefix) == []
+
+
+def test_all_types_no_duplicates():
+    completions = complete_units("", k=None)
+
+    assert len(completions) == len(set(completions))
+    assert "ounce" in completions
+
+
+def test_index():
+    index = TypeaheadIndex([("meter", "Length", True),
+                            ("metre", "Length", False),
+                            ("Meter", "Length", False),
+                            ("mile", "Length", True),
+                            ("meter per second", "Velocity", True),
+                            ("meters", "Velocity", False),
+                            ])
+
+    assert index.complete("me") == ["meter", "meter per second",
+                                     "meters", "metre"]
+    assert index.complete("me", "Length") == ["meter", "metre"]
+    assert index.complete("m", "length") == ["meter", "mile", "metre"]
+
+
+def test_to_json():
+    index = get_index()
+    data = json.loads(index.to_json())
+
+    assert data["Mass"]["names"][:data["Mass"]["primary"]][0] == "gram"
+    assert data["Mass"]["keys"][0] == ""  # same as the name
+    assert data["Temperature"]["keys"][0] == "celsius"
+
+
+def test_from_dict():
+    index = get_index()
+    data = index.to_dict()
+
+    assert TypeaheadIndex.from_dict(data).to_dict() == data
+    assert (TypeaheadIndex.from_dict(data).complete("b") ==
+            index.complete("b"))
+
+
+def test_lazy_import():
+    assert nucos.complete_units is complete_units
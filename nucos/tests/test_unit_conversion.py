@@ -10,6 +10,7 @@ pytest test_unit_conversion.py
 """
 
 import math
+from collections import OrderedDict
 
 try:
     from math import isclose
@@ -397,6 +398,43 @@ class testOilQuantityConverterClass:
         assert isclose(Expected, Calculated, rel_tol=RELTOL)
 
 
+@pytest.mark.parametrize(("kinematic", "kin_units", "density", "density_units",
+                          "dynamic", "dyn_units"),
+                         [(1.0, "cSt", 1000.0, "kg/m^3", 1.0, "mPa s"),
+                          (100.0, "cSt", 0.9, "g/cm^3", 90.0, "cP"),
+                          # API 10 is SG 1 -- water at 60F is 999.016 kg/m^3
+                          (1.0, "m^2/s", 10.0, "API", 999.016, "Pa s"),
+                          ])
+def test_viscosity_converter(kinematic, kin_units, density, density_units,
+                             dynamic, dyn_units):
+    VC = unit_conversion.ViscosityConverter
+
+    assert isclose(VC.ToDynamic(kinematic, kin_units,
+                                density, density_units, dyn_units),
+                   dynamic, rel_tol=RELTOL)
+    assert isclose(VC.ToKinematic(dynamic, dyn_units,
+                                  density, density_units, kin_units),
+                   kinematic, rel_tol=RELTOL)
+
+
+@pytest.mark.parametrize(("discharge", "dis_units", "density", "density_units",
+                          "mass_discharge", "mass_units"),
+                         [(1.0, "m^3/s", 1000.0, "kg/m^3", 1000.0, "kg/s"),
+                          (1.0, "l/s", 0.85, "g/cm^3", 850.0, "g/s"),
+                          (1.0, "m^3/s", 10.0, "API", 999.016, "kg/s"),
+                          ])
+def test_discharge_converter(discharge, dis_units, density, density_units,
+                             mass_discharge, mass_units):
+    DC = unit_conversion.DischargeConverter
+
+    assert isclose(DC.ToMassDischarge(discharge, dis_units,
+                                      density, density_units, mass_units),
+                   mass_discharge, rel_tol=RELTOL)
+    assert isclose(DC.ToDischarge(mass_discharge, mass_units,
+                                  density, density_units, dis_units),
+                   discharge, rel_tol=RELTOL)
+
+
 # fixme: there should probably be a full set of tests for the "new" API
 class TestNewConvertAPI():
 
@@ -725,3 +763,320 @@ def test_get_unit_type_bad():
         unit_type = unit_conversion.get_unit_type('fred')
 
 
+
+
+@pytest.mark.parametrize('unit_type, unit1, unit2, value, new_value',
+                         KnownValues)
+def test_get_converter(unit_type, unit1, unit2, value, new_value):
+    """
+    the pre-resolved converters should give the same answers as convert()
+    """
+    converter = unit_conversion.get_converter(unit1, unit2, unit_type)
+
+    assert isclose(converter(value), new_value,
+                   rel_tol=RELTOL, abs_tol=1e-12)
+
+
+def test_get_converter_new_api():
+    converter = unit_conversion.get_converter('meter', 'foot')
+
+    assert isclose(converter(1), 3.28083989501, rel_tol=RELTOL)
+    assert converter.unit_type == "Length"
+    assert converter.offset == 0.0
+
+
+def test_get_converter_temperature():
+    converter = unit_conversion.get_converter('C', 'F')
+
+    assert isinstance(converter, unit_conversion.AffineConverter)
+    assert isclose(converter(100), 212.0, rel_tol=RELTOL)
+    assert isclose(converter(-40), -40.0, rel_tol=RELTOL)
+
+
+@pytest.mark.parametrize('unit1', ["K", "C", "F"])
+@pytest.mark.parametrize('unit2', ["K", "C", "F"])
+def test_get_converter_temperature_same_as_convert(unit1, unit2):
+    converter = unit_conversion.get_converter(unit1, unit2)
+
+    for value in [0, 32, 100, -40, 37.5, 20.1, -273.15, 1e-3, 451]:
+        assert (converter(value) ==
+                unit_conversion.convert(unit1, unit2, value))
+    assert unit_conversion.get_converter('C', 'F')(0) == 32.0
+
+
+@pytest.mark.parametrize('unit1, unit2, value',
+                         [("API", "kg/m^3", 25.0),
+                          ("kg/m^3", "API", 900.0),
+                          ("API", "API", 32.0),
+                          ("SG", "API", 0.9),
+                          ])
+def test_get_converter_api(unit1, unit2, value):
+    converter = unit_conversion.get_converter(unit1, unit2)
+
+    assert isclose(converter(value),
+                   unit_conversion.convert("density", unit1, unit2, value),
+                   rel_tol=1e-12)
+
+
+def test_get_converter_bad_units():
+    with pytest.raises(unit_conversion.NotSupportedUnitError):
+        unit_conversion.get_converter('flintstones', 'meters')
+
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        unit_conversion.get_converter('feet', 'flintstones')
+
+    with pytest.raises(unit_conversion.InvalidUnitTypeError):
+        unit_conversion.get_converter('feet', 'meters', 'spam')
+
+
+def test_unit_codes():
+    converter = unit_conversion.Converters['length']
+
+    assert converter.get_unit_code('meter') == 0
+    assert converter.get_unit_code('Meters') == 0
+    assert converter.get_unit_code('ft') == converter.UnitCodes['foot']
+
+    with pytest.raises(unit_conversion.InvalidUnitError):
+        converter.get_unit_code('kg')
+
+
+def test_get_matrices():
+    converter = unit_conversion.Converters['temperature']
+    scale, offset = converter.get_matrices()
+    c = converter.get_unit_code('C')
+    f = converter.get_unit_code('F')
+
+    assert len(scale) == len(offset) == 3
+    assert isclose(100 * scale[c][f] + offset[c][f], 212.0, rel_tol=RELTOL)
+    assert isclose(scale[c][c], 1.0)
+
+
+def test_get_matrices_api():
+    converter = unit_conversion.Converters['density']
+    scale, offset = converter.get_matrices()
+    api = converter.get_unit_code('API')
+    sg = converter.get_unit_code('SG')
+
+    assert math.isnan(scale[api][sg])
+    assert math.isnan(scale[sg][api])
+    assert not math.isnan(scale[sg][sg])
+
+
+def test_import_is_lazy():
+    """
+    importing nucos should not build the lookup tables or import numpy
+    (needs a fresh interpreter to check)
+    """
+    import subprocess
+    import sys
+
+    code = ("import sys, nucos\n"
+            "from nucos import unit_conversion, unit_data\n"
+            "assert 'numpy' not in sys.modules\n"
+            "assert not unit_conversion._tables\n"
+            "assert not unit_conversion.Converters._converters\n"
+            "assert 'unit_sets' not in vars(unit_data)\n"
+            "nucos.convert('m', 'ft', 1)\n"
+            "assert list(unit_conversion.Converters._converters) == ['length']\n"
+            )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_lazy_tables():
+    assert unit_conversion.UNIT_TYPES is unit_conversion.UNIT_TYPES
+    assert unit_conversion.PRETTY_UNIT_TYPES['massdischarge'] == "Mass Discharge"
+    assert 'meter' in unit_conversion.UNIT_NAMES['length']
+    assert len(unit_conversion.Converters) == len(ConvertDataUnits)
+    assert 'temperature' in unit_conversion.Converters
+
+    with pytest.raises(AttributeError):
+        unit_conversion.SPAM
+
+
+class TestUnitNameCache:
+
+    def test_lookup(self):
+        cache = unit_conversion.UnitNameCache()
+        resolved = cache.lookup("Meters Per Second")
+
+        assert resolved == ("meterspersecond", "velocity", "meterpersecond")
+        assert cache.lookup("Meters Per Second") is resolved
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["size"] == 1
+
+    def test_not_a_unit(self):
+        cache = unit_conversion.UnitNameCache()
+
+        assert cache.lookup("Spam") == ("spam", None, None)
+        with pytest.raises(unit_conversion.NotSupportedUnitError):
+            cache.lookup(3)
+        with pytest.raises(unit_conversion.NotSupportedUnitError):
+            cache.lookup(["m"])
+
+    @pytest.mark.parametrize("policy, kept, dropped", [("lru", "m", "ft"),
+                                                       ("fifo", "ft", "m")])
+    def test_eviction(self, policy, kept, dropped):
+        cache = unit_conversion.UnitNameCache(maxsize=2, policy=policy)
+        cache.lookup("m")
+        cache.lookup("ft")
+        cache.lookup("m")
+        cache.lookup("kg")
+
+        assert cache.stats()["size"] == 2
+        assert kept in cache._data
+        assert dropped not in cache._data
+
+    def test_no_caching(self):
+        cache = unit_conversion.UnitNameCache(maxsize=0)
+        cache.lookup("m")
+        cache.lookup("m")
+
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["misses"] == 2
+
+    def test_configure(self):
+        cache = unit_conversion.UnitNameCache(maxsize=None)
+        for name in ("m", "ft", "kg", "lb"):
+            cache.lookup(name)
+        cache.configure(maxsize=2, policy="fifo")
+
+        assert list(cache._data) == ["kg", "lb"]
+        with pytest.raises(ValueError):
+            cache.configure(policy="random")
+        with pytest.raises(ValueError):
+            cache.configure(maxsize=-1)
+
+    def test_clear(self):
+        cache = unit_conversion.UnitNameCache()
+        cache.lookup("m")
+        cache.clear()
+
+        assert cache.stats()["size"] == 0
+        assert cache.stats()["misses"] == 0
+
+    def test_dropped_by_another_thread(self):
+        class DroppingDict(OrderedDict):
+            # as if another thread drops each name just after it's found
+            def __getitem__(self, name):
+                value = super().__getitem__(name)
+                del self[name]
+                return value
+
+        cache = unit_conversion.UnitNameCache()
+        cache._data = DroppingDict()
+        cache.lookup("m")
+
+        assert cache.lookup("m") == ("m", "length", "meter")
+        assert cache.stats()["hits"] == 1
+
+    def test_used_by_convert(self):
+        cache = unit_conversion.UNIT_NAME_CACHE
+        cache.lookup("Kilometer  Per  Day")
+        hits = cache.hits
+        unit_conversion.convert("Kilometer  Per  Day", "m/s", 1.0)
+
+        assert cache.hits > hits
+
+
+class TestUnit:
+
+    def test_interned(self):
+        unit = unit_conversion.get_unit("Nautical Miles")
+
+        assert unit is unit_conversion.get_unit("nm")
+        assert unit is unit_conversion.get_unit("nautical mile", "length")
+        assert unit is not unit_conversion.get_unit("mile")
+
+    def test_attributes(self):
+        unit = unit_conversion.get_unit("nm")
+
+        assert unit.unit_type == "length"
+        assert unit.name == "nauticalmile"
+        assert unit.primary_name == "nautical mile"
+        assert unit.abbreviation == "nm"
+        assert unit.scale == 1852.0
+        assert unit.offset == 0.0
+        assert unit.code == unit_conversion.Converters['length'].get_unit_code('nm')
+        assert str(unit) == "nautical mile"
+        assert repr(unit) == "Unit('nautical mile', 'length')"
+
+    def test_temperature(self):
+        unit = unit_conversion.get_unit("C")
+
+        assert isclose(0 * unit.scale + unit.offset, 273.15)
+
+    def test_api(self):
+        unit = unit_conversion.get_unit("API")
+
+        assert math.isnan(unit.scale)
+
+    def test_immutable(self):
+        unit = unit_conversion.get_unit("kg")
+
+        with pytest.raises(AttributeError):
+            unit.scale = 2.0
+        with pytest.raises(AttributeError):
+            del unit.scale
+        with pytest.raises(AttributeError):
+            unit.something = 2.0
+
+    def test_pickle(self):
+        import pickle
+        unit = unit_conversion.get_unit("oz", "volume")
+
+        assert pickle.loads(pickle.dumps(unit)) is unit
+
+    def test_bad(self):
+        with pytest.raises(unit_conversion.NotSupportedUnitError):
+            unit_conversion.get_unit("spam")
+        with pytest.raises(unit_conversion.InvalidUnitError):
+            unit_conversion.get_unit("spam", "length")
+        with pytest.raises(unit_conversion.InvalidUnitTypeError):
+            unit_conversion.get_unit("m", "spam")
+
+    def test_in_convert(self):
+        m = unit_conversion.get_unit("m")
+        ft = unit_conversion.get_unit("ft")
+
+        assert isclose(unit_conversion.convert(m, ft, 1), 3.2808399,
+                       rel_tol=RELTOL)
+        assert isclose(unit_conversion.convert(m, "ft", 1), 3.2808399,
+                       rel_tol=RELTOL)
+        assert isclose(unit_conversion.convert("length", m, ft, 1), 3.2808399,
+                       rel_tol=RELTOL)
+        assert isclose(unit_conversion.get_converter(m, ft)(1), 3.2808399,
+                       rel_tol=RELTOL)
+
+    def test_no_name_lookup(self):
+        units = [unit_conversion.get_unit(name)
+                 for name in ("m", "ft", "C", "F", "API", "SG", "GPa", "bar")]
+        cache = unit_conversion.UNIT_NAME_CACHE
+        lookups = cache.hits + cache.misses
+
+        for from_unit, to_unit in zip(units[::2], units[1::2]):
+            unit_conversion.convert(from_unit, to_unit, 1.0)
+            unit_conversion.get_converter(from_unit, to_unit)
+
+        assert cache.hits + cache.misses == lookups
+
+    def test_wrong_type(self):
+        micron = unit_conversion.get_unit("micron", "oil concentration")
+
+        assert isclose(unit_conversion.convert(micron, "bbl/acre", 1.0),
+                       0.02545396, rel_tol=RELTOL)
+        with pytest.raises(unit_conversion.InvalidUnitError):
+            unit_conversion.convert("length", micron, "m", 1.0)
+
+    def test_helpers(self):
+        oz = unit_conversion.get_unit("fluid oz")
+
+        assert unit_conversion.get_unit_type(oz) == "volume"
+        assert unit_conversion.get_primary_name(oz) == "fluid ounce"
+        assert unit_conversion.get_abbreviation(oz) == "oz"
+        assert unit_conversion.is_supported(oz)
+        assert unit_conversion.is_supported_unit("Volume", oz)
+        assert not unit_conversion.is_supported_unit("Mass", oz)
+        assert unit_conversion.is_same_unit(oz, "fluid ounce")
+        assert unit_conversion.is_same_unit(oz, unit_conversion.get_unit("fluid oz"))
+        assert not unit_conversion.is_same_unit(oz, unit_conversion.get_unit("oz"))
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+"""
+Typeahead (autocomplete) for unit names
+
+The names of each unit type, and of all of them together, are kept
+sorted by their simplified form (what Simplify() does: lower case, no
+whitespace or dots), so the names that start with what has been typed
+so far are found with a binary search -- that takes microseconds, and
+doesn't build any lists but the result::
+
+    complete_units("kilo")
+    complete_units("c", "Temperature")
+    complete_units("", "Mass", k=None)  # all of them, in order
+
+Primary names come first, then synonyms, each in alphabetical order.
+
+``get_index().to_json()`` exports the names for the Javascript client:
+for each unit type, the names in the same order, the number of them
+that are primary names, and their simplified keys ("" when the key is
+the same as the name). The completions for all unit types are the
+per-type ones merged: primary names first, and each name only once.
+
+The index is built the first time it's needed.
+"""
+
+import json
+from bisect import bisect_left
+
+from .unit_conversion import Simplify, InvalidUnitTypeError, _normalize
+from .unit_data import ConvertDataUnits
+
+
+def complete_units(prefix, unit_type=None, k=10):
+    """
+    complete_units(prefix, unit_type=None, k=10)
+
+    Unit names that start with a prefix -- ignoring case, whitespace and
+    dots, e.g. for "cubic m": ["cubic meter", "cubic meter per hour", ...]
+
+    :param prefix: what has been typed so far
+    :param unit_type=None: only complete units of this type
+    :param k=10: the maximum number of completions (None for all of them)
+
+    :returns: a list of unit names, primary names first
+    """
+    return get_index().complete(prefix, unit_type, k)
+
+
+class TypeaheadIndex:
+    """
+    The unit names, sorted for completing prefixes
+
+    :param entries: iterable of (name, unit_type, is_primary_name)
+                    unit_type is the full unit type name, e.g. "Mass"
+    """
+    def __init__(self, entries):
+        # unit type: ({key: primary name}, {key: synonym})
+        groups = {}
+        for name, unit_type, is_primary in entries:
+            key = Simplify(name)
+            if not key:
+                continue
+            primaries, synonyms = groups.setdefault(unit_type, ({}, {}))
+            _add_name(primaries, synonyms, key, name, is_primary)
+
+        all_primaries, all_synonyms = {}, {}
+        for primaries, synonyms in groups.values():
+            for key, name in primaries.items():
+                _add_name(all_primaries, all_synonyms, key, name, True)
+            for key, name in synonyms.items():
+                _add_name(all_primaries, all_synonyms, key, name, False)
+
+        self.unit_types = {Simplify(unit_type): unit_type
+                           for unit_type in groups}
+        # simplified unit type (None for all of them):
+        # (keys, names, number of primary names)
+        self.names = {Simplify(unit_type): _sorted_names(*names)
+                      for unit_type, names in groups.items()}
+        self.names[None] = _sorted_names(all_primaries, all_synonyms)
+
+    @classmethod
+    def from_unit_data(cls, units_data=ConvertDataUnits):
+        """
+        The index of all the names in the units table
+        """
+        def entries():
+            for unit_type, units in units_data.items():
+                for primary_name, (_, synonyms) in units.items():
+                    yield primary_name, unit_type, True
+                    for synonym in synonyms:
+                        yield synonym, unit_type, False
+        return cls(entries())
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        The index from the output of to_dict()
+        """
+        def entries():
+            for unit_type, names in data.items():
+                num_primary = names["primary"]
+                for i, name in enumerate(names["names"]):
+                    yield name, unit_type, i < num_primary
+        return cls(entries())
+
+    def complete(self, prefix, unit_type=None, k=10):
+        """
+        See complete_units()
+        """
+        if unit_type is not None:
+            unit_type = _normalize(unit_type)
+        try:
+            keys, names, num_primary = self.names[unit_type]
+        except KeyError:
+            raise InvalidUnitTypeError(unit_type)
+        if not isinstance(prefix, str):
+            return []
+        prefix = Simplify(prefix)
+
+        completions = []
+        for start, stop in ((0, num_primary), (num_primary, len(keys))):
+            i = bisect_left(keys, prefix, start, stop)
+            while i < stop and keys[i].startswith(prefix):
+                if k is not None and len(completions) >= k:
+                    return completions
+                completions.append(names[i])
+                i += 1
+        return completions
+
+    def to_dict(self):
+        """
+        The names of each unit type, as described in the module docstring
+        """
+        data = {}
+        for simple_type, unit_type in self.unit_types.items():
+            keys, names, num_primary = self.names[simple_type]
+            data[unit_type] = {"primary": num_primary,
+                               "names": list(names),
+                               "keys": ["" if key == name else key
+                                        for key, name in zip(keys, names)],
+                               }
+        return data
+
+    def to_json(self):
+        """
+        to_dict(), as compact JSON
+        """
+        return json.dumps(self.to_dict(),
+                          ensure_ascii=False,
+                          separators=(",", ":"))
+
+
+def _add_name(primaries, synonyms, key, name, is_primary):
+    """
+    add a name, unless there's already one with the same key -- a primary
+    name replaces a synonym
+    """
+    if is_primary:
+        synonyms.pop(key, None)
+        primaries.setdefault(key, name)
+    elif key not in primaries:
+        synonyms.setdefault(key, name)
+
+
+def _sorted_names(primaries, synonyms):
+    """
+    (keys, names, number of primary names) -- sorted by key, primary
+    names first
+    """
+    keys = sorted(primaries) + sorted(synonyms)
+    names = [primaries[key] if i < len(primaries) else synonyms[key]
+             for i, key in enumerate(keys)]
+    return keys, names, len(primaries)
+
+
+_index = None
+
+
+def get_index():
+    """
+    The TypeaheadIndex of all the unit names -- built on first use
+    """
+    global _index
+    if _index is None:
+        _index = TypeaheadIndex.from_unit_data()
+    return _index
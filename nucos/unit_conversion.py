@@ -29,8 +29,11 @@ CHANGELOG:
 """
 
 import warnings
+from collections import OrderedDict, namedtuple
+from collections.abc import Mapping
 
 from .unit_data import ConvertDataUnits
+from .si_prefixes import PREFIXES, PREFIXABLE, split_prefix, unprefix
 
 from nucos import lat_long
 
@@ -88,17 +91,15 @@ def get_unit_type(unit):
     In [2]: nucos.get_unit_type('meter')
     Out[2]: 'length'
     """
-    unit = Simplify(unit)
+    unit = UNIT_NAME_CACHE.lookup(unit)
 
-    try:
-        unit_type = UNIT_TYPES[unit]
-    except KeyError:
-        raise NotSupportedUnitError(unit)
-    return unit_type
+    if unit.unit_type is None:
+        raise NotSupportedUnitError(unit.name)
+    return unit.unit_type
 
 
 def get_unit_types():
-    return list(PRETTY_UNIT_TYPES.values())
+    return list(_pretty_unit_types().values())
 
 
 def GetUnitNames(UnitType):
@@ -205,25 +206,225 @@ def FindAllUnitNames():
     return unit_names
 
 
-UNIT_TYPES = FindUnitTypes()
-UNIT_NAMES = FindAllUnitNames()
-PRETTY_UNIT_TYPES = {Simplify(unit_type): unit_type for unit_type in ConvertDataUnits.keys()}
+# The lookup tables are built the first time they are needed,
+# rather than on import, so that `import nucos` is fast.
+# They are available as module attributes as well:
+#   UNIT_TYPES, UNIT_NAMES, PRETTY_UNIT_TYPES
+def FindPrettyUnitTypes():
+    """
+    returns a mapping of the simplified unit type names to the
+    "pretty" names used in the units table
+
+    Usually not called from user code.
+    """
+    return {Simplify(unit_type): unit_type
+            for unit_type in ConvertDataUnits.keys()}
+
+
+_TABLE_BUILDERS = {"UNIT_TYPES": FindUnitTypes,
+                   "UNIT_NAMES": FindAllUnitNames,
+                   "PRETTY_UNIT_TYPES": FindPrettyUnitTypes,
+                   }
+_tables = {}
+
+
+def _get_table(name):
+    try:
+        return _tables[name]
+    except KeyError:
+        table = _tables[name] = _TABLE_BUILDERS[name]()
+        return table
+
+
+def _unit_types():
+    return _get_table("UNIT_TYPES")
+
+
+def _unit_names():
+    return _get_table("UNIT_NAMES")
+
+
+def _pretty_unit_types():
+    return _get_table("PRETTY_UNIT_TYPES")
+
+
+ResolvedName = namedtuple("ResolvedName", ["name", "unit_type", "primary_name"])
+ResolvedName.__doc__ = """
+A unit name, as resolved by the UnitNameCache
+
+name: the simplified name
+unit_type: the (simplified) unit type, if the name is a unit that can be
+           used without specifying the type, otherwise None
+primary_name: the (simplified) primary name of the unit, or None
+"""
+
+
+def resolve_name(name):
+    """
+    Resolve a unit name, without the cache -- see UnitNameCache
+
+    raises NotSupportedUnitError if name is not a string (or a Unit)
+    """
+    if isinstance(name, Unit):
+        return ResolvedName(name.name, name.unit_type, name.name)
+    simple_name = Simplify(name)
+    unit_type = _unit_types().get(simple_name)
+    if unit_type is None:
+        return (_resolve_prefixed(name) or
+                ResolvedName(simple_name, None, None))
+    return ResolvedName(simple_name, unit_type,
+                        Converters[unit_type].Synonyms[simple_name])
+
+
+def _resolve_prefixed(name):
+    """
+    Resolve a unit name with an SI prefix, like "GPa" -- see si_prefixes.py
+
+    The name is resolved to the prefix and primary name: "gigapascal"
+
+    returns None if it's not a prefixed unit
+    """
+    for prefix, rest in split_prefix(name.strip()):
+        rest = Simplify(rest)
+        unit_type = _unit_types().get(rest)
+        if unit_type is None:
+            continue
+        primary_name = Converters[unit_type].Synonyms[rest]
+        if primary_name in PREFIXABLE.get(unit_type, ()):
+            name = prefix + primary_name
+            return ResolvedName(name, unit_type, name)
+    return None
+
+
+class UnitNameCache:
+    """
+    A bounded cache of resolved unit names
+
+    Maps the names as they are passed in (e.g. "Meters Per Second") to a
+    ResolvedName, so that repeated spellings don't need to be simplified
+    and looked up again.
+
+    :param maxsize=1024: maximum number of names to keep.
+                         None for no limit, 0 to turn off caching.
+    :param policy="lru": which name to drop when the cache is full:
+                         "lru": the least recently used
+                         "fifo": the oldest
+    """
+    policies = ("lru", "fifo")
+
+    def __init__(self, maxsize=1024, policy="lru"):
+        self._data = OrderedDict()
+        self.configure(maxsize, policy)
+        self.hits = 0
+        self.misses = 0
+
+    def configure(self, maxsize=1024, policy="lru"):
+        """
+        change the size or eviction policy of the cache
+
+        (see class docstring for the parameters)
+        """
+        if policy not in self.policies:
+            raise ValueError("policy must be one of {}".format(self.policies))
+        if maxsize is not None and maxsize < 0:
+            raise ValueError("maxsize must be None, or >= 0")
+        self.maxsize = maxsize
+        self.policy = policy
+        self._lru = policy == "lru"
+        if maxsize is not None:
+            while len(self._data) > maxsize:
+                self._data.popitem(last=False)
+
+    def lookup(self, name):
+        """
+        returns the ResolvedName for name
+        """
+        data = self._data
+        try:
+            resolved = data[name]
+        except KeyError:
+            pass
+        except TypeError:
+            # not hashable, so not a valid name anyway
+            return resolve_name(name)
+        else:
+            self.hits += 1
+            if self._lru:
+                try:
+                    data.move_to_end(name)
+                except KeyError:
+                    # another thread dropped it in the meantime
+                    pass
+            return resolved
+
+        self.misses += 1
+        resolved = resolve_name(name)
+        if self.maxsize != 0:
+            data[name] = resolved
+            if self.maxsize is not None and len(data) > self.maxsize:
+                try:
+                    data.popitem(last=False)
+                except KeyError:
+                    # another thread emptied it in the meantime
+                    pass
+        return resolved
+
+    def clear(self):
+        """
+        remove all the names, and reset the statistics
+        """
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """
+        returns a dict of the cache statistics
+        """
+        return {"hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                }
+
+
+UNIT_NAME_CACHE = UnitNameCache()
+
+
+def _normalize(name):
+    """
+    Simplify(), but with the results cached
+    """
+    return UNIT_NAME_CACHE.lookup(name).name
+
+
+def __getattr__(name):
+    if name not in _TABLE_BUILDERS:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    return _get_table(name)
 
 
 def is_supported_unit(unit_type, unit):
     """
     checks if a unit name is supported for the given unit type
     """
-    unit_type = Simplify(unit_type)
-    converter = Converters[unit_type]
-    return Simplify(unit) in converter.Synonyms
+    unit_type = _normalize(unit_type)
+    if isinstance(unit, Unit):
+        return unit.unit_type == unit_type
+    try:
+        Converters[unit_type]._resolve(unit)
+    except InvalidUnitError:
+        return False
+    return True
 
 
 def get_supported_names(unit_type):
     """
     Returns the list of all supported unit names for a unit_type
     """
-    return UNIT_NAMES[Simplify(unit_type)]
+    return _unit_names()[_normalize(unit_type)]
 
 def get_primary_name(unit, unit_type=None):
     """
@@ -232,11 +433,13 @@ def get_primary_name(unit, unit_type=None):
     This is usually the spelled out version, e.g.
     kilogram
     """
-    unit = Simplify(unit)
+    if isinstance(unit, Unit):
+        return unit.primary_name
+    unit = _normalize(unit)
     if unit_type is None:
-        unit_type = UNIT_TYPES[unit]
+        unit_type = _unit_type(unit)
     else:
-        unit_type = Simplify(unit_type)
+        unit_type = _normalize(unit_type)
     return Converters[unit_type].GetPrimaryName(unit)
 
 def get_primary_names(unit_type):
@@ -245,8 +448,8 @@ def get_primary_names(unit_type):
     """
     p_names = []
 
-    unit_type = Simplify(unit_type)
-    unit_type = PRETTY_UNIT_TYPES[unit_type]
+    unit_type = _normalize(unit_type)
+    unit_type = _pretty_unit_types()[unit_type]
     unit_data = ConvertDataUnits[unit_type]
     for pname, data in unit_data.items():
         p_names.append(pname)
@@ -265,20 +468,28 @@ def get_abbreviation(unit, unit_type=None):
                       e.g. oz: weight or volume?
     :type unit: str
     """
-    unit = Simplify(unit)
+    if isinstance(unit, Unit):
+        return unit.abbreviation
+    unit = _normalize(unit)
     if unit_type is None:
-        unit_type = UNIT_TYPES[unit]
+        unit_type = _unit_type(unit)
     else:
-        unit_type = Simplify(unit_type)
+        unit_type = _normalize(unit_type)
+
+    # If there are no synonyms, this is the primary name
+    return Converters[unit_type]._names(Converters[unit_type]._resolve(unit))[1]
 
-    unit_type = PRETTY_UNIT_TYPES[unit_type]
-    unit = get_primary_name(unit, unit_type)
-    synonyms = ConvertDataUnits[unit_type][unit][1]
-    try:
-        return synonyms[0]
-    except IndexError:
-        # If there are no synonyms, return the primary name
-        return unit
+
+def _unit_type(unit):
+    """
+    the unit type of a (simplified) unit name
+
+    raises a KeyError if it's not a supported name
+    """
+    unit_type = UNIT_NAME_CACHE.lookup(unit).unit_type
+    if unit_type is None:
+        raise KeyError(unit)
+    return unit_type
 
 
 def GetUnitAbbreviation(unit_type, unit):
@@ -305,22 +516,20 @@ def is_same_unit(unit1, unit2):
     :returns: True if they are synonyms for the same unit.
               False if they are different units.
               False if one of them is not in the database.
+
+    Unit objects can be passed in as well as names.
     """
-    all_types = UNIT_TYPES
-    unit1 = Simplify(unit1)
-    unit2 = Simplify(unit2)
+    if isinstance(unit1, Unit) and isinstance(unit2, Unit):
+        return unit1 is unit2
 
-    try:
-        type1 = all_types[unit1]
-        type2 = all_types[unit2]
-    except KeyError:
-        return False
+    unit1 = UNIT_NAME_CACHE.lookup(unit1)
+    unit2 = UNIT_NAME_CACHE.lookup(unit2)
 
-    if type1 != type2:
+    if unit1.unit_type is None or unit2.unit_type is None:
         return False
-    else:
-        Synonyms = Converters[Simplify(type1)].Synonyms
-        return Synonyms[Simplify(unit1)] == Synonyms[Simplify(unit2)]
+
+    return (unit1.unit_type == unit2.unit_type and
+            unit1.primary_name == unit2.primary_name)
 
 
 class ConverterClass:
@@ -339,15 +548,25 @@ class ConverterClass:
                           See unit_data.py for format
         """
         self.Name = TypeName
+        # the simplified name, which is what Unit objects have
+        self._unit_type = Simplify(TypeName)
 
         self.Synonyms = {}
         self.Convertdata = {}
         self.PrettyNames = {}
+        # integer code for each unit -- its position in the units table
+        self.UnitCodes = {}
+        self._matrices = None
+        self._units = {}
+        # the units with SI prefixes that have been used:
+        # {simplified name: (conversion factor, prefix, primary name)}
+        self._prefixed = {}
 
         for PrimaryName, data in UnitsDict.items():
             # strip out whitespace and capitalization
             Pname = Simplify(PrimaryName)
             self.PrettyNames[Pname] = PrimaryName
+            self.UnitCodes[Pname] = len(self.UnitCodes)
 
             self.Convertdata[Pname] = data[0]
             self.Synonyms[Pname] = Pname
@@ -371,23 +590,167 @@ class ConverterClass:
         :param ToUnit: the unit you want the value converted to
         :param Value: the original value
         """
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
+
+        return Value * self._factor(FromUnit) / self._factor(ToUnit)
+
+    def GetPrimaryName(self, unit):
+        return self._names(self._resolve(unit))[0]
 
+    def _resolve(self, unit):
+        """
+        returns the simplified primary name for a unit name
+
+        raises InvalidUnitError if it's not a unit of this type
+        """
+        if isinstance(unit, Unit):
+            # already resolved
+            if unit.unit_type != self._unit_type:
+                raise InvalidUnitError((unit.name, self.Name))
+            return unit.name
+        unit = _normalize(unit)
         try:
-            FromUnit = self.Synonyms[FromUnit]
+            return self.Synonyms[unit]
         except KeyError:
-            raise InvalidUnitError((FromUnit, self.Name))
+            if unit in self._prefixed or self._add_prefixed(unit):
+                return unit
+            raise InvalidUnitError((unit, self.Name))
 
+    def _add_prefixed(self, unit):
+        """
+        Add a unit with an SI prefix, e.g. "nanometer", if it is one.
+
+        returns True if it is
+        """
+        split = unprefix(unit)
+        if split is None:
+            return False
+        prefix, Pname = split
+        if Pname not in PREFIXABLE.get(Simplify(self.Name), ()):
+            return False
+        self._prefixed[unit] = (PREFIXES[prefix][1] * self.Convertdata[Pname],
+                                prefix,
+                                Pname)
+        return True
+
+    def _factor(self, Pname):
+        """
+        returns the conversion factor for a unit (with or without a prefix)
+        """
         try:
-            ToUnit = self.Synonyms[ToUnit]
+            return self.Convertdata[Pname]
         except KeyError:
-            raise InvalidUnitError((ToUnit, self.Name))
+            return self._prefixed[Pname][0]
+
+    def _names(self, Pname):
+        """
+        returns the (primary name, abbreviation) of a unit
+        """
+        if Pname in self._prefixed:
+            prefixed_name = Pname
+            _, prefix, Pname = self._prefixed[Pname]
+            name, symbol = PREFIXABLE[Simplify(self.Name)][Pname]
+            abbreviation = prefix + name
+            if symbol:
+                symbol = PREFIXES[prefix][0] + symbol
+                # the symbol may be another unit: "nm" is a nautical mile
+                if resolve_name(symbol).name == prefixed_name:
+                    abbreviation = symbol
+            return prefix + name, abbreviation
+        PrimaryName = self.PrettyNames[Pname]
+        synonyms = ConvertDataUnits[self.Name][PrimaryName][1]
+        # the abbreviation is the first synonym, if there is one
+        return PrimaryName, synonyms[0] if synonyms else PrimaryName
+
+    def get_unit(self, unit):
+        """
+        returns the Unit object for a unit name
 
-        return Value * self.Convertdata[FromUnit] / self.Convertdata[ToUnit]
+        There is only ever one Unit object for each unit.
+        """
+        Pname = self._resolve(unit)
+        try:
+            return self._units[Pname]
+        except KeyError:
+            pass
+        PrimaryName, abbreviation = self._names(Pname)
+        scale, offset = self._to_base(Pname)
+        # units with prefixes aren't in the table, so they have no code
+        unit = Unit(_normalize(self.Name), Pname, PrimaryName, abbreviation,
+                    scale, offset, self.UnitCodes.get(Pname))
+        return self._units.setdefault(Pname, unit)
+
+    def _to_base(self, Pname):
+        """
+        returns the (scale, offset) to convert from the unit to
+        the base unit of this type
+        """
+        return self._factor(Pname), 0.0
 
-    def GetPrimaryName(self, unit):
-        return self.PrettyNames[self.Synonyms[Simplify(unit)]]
+    def get_unit_code(self, unit):
+        """
+        returns the integer code for a unit name
+
+        The code is the position of the unit in the units table for this
+        type, so it is stable as long as new units are added at the end.
+
+        (units with SI prefixes that aren't in the table don't have a code)
+        """
+        Pname = self._resolve(unit)
+        try:
+            return self.UnitCodes[Pname]
+        except KeyError:
+            raise InvalidUnitError((unit, self.Name))
+
+    def get_matrices(self):
+        """
+        returns the (scale, offset) conversion matrices for this unit type
+
+        Both are N x N lists of lists, indexed by unit code, so that:
+
+          to_value = value * scale[from_code][to_code] + offset[from_code][to_code]
+
+        Conversions that can't be expressed that way (API gravity) are NaN.
+
+        The matrices are computed the first time they are asked for.
+        """
+        if self._matrices is None:
+            names = list(self.UnitCodes)
+            scale = []
+            offset = []
+            for from_unit in names:
+                scale_row = []
+                offset_row = []
+                for to_unit in names:
+                    converter = self.get_converter(from_unit, to_unit)
+                    if isinstance(converter, APIGravityConverter):
+                        scale_row.append(float('nan'))
+                        offset_row.append(float('nan'))
+                    else:
+                        scale_row.append(converter.scale)
+                        offset_row.append(converter.offset)
+                scale.append(scale_row)
+                offset.append(offset_row)
+            self._matrices = (scale, offset)
+        return self._matrices
+
+    def get_converter(self, FromUnit, ToUnit):
+        """
+        get_converter(FromUnit, ToUnit)
+
+        returns a UnitConverter that converts values from FromUnit to ToUnit
+
+        All the name lookup is done once, here, so calling the returned
+        converter does no string processing at all.
+        """
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
+
+        return UnitConverter(self.Name,
+                             FromUnit,
+                             ToUnit,
+                             self._factor(FromUnit) / self._factor(ToUnit))
 
 
 # the special case classes:
@@ -408,18 +771,8 @@ class TempConverterClass(ConverterClass):
         :param Value: the original value
         """
 #        breakpoint()
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
-
-        try:
-            FromUnit = self.Synonyms[FromUnit]
-        except KeyError:
-            raise InvalidUnitError((FromUnit, self.Name))
-
-        try:
-            ToUnit = self.Synonyms[ToUnit]
-        except KeyError:
-            raise InvalidUnitError((ToUnit, self.Name))
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
 
         A1 = self.Convertdata[FromUnit][0]
         B1 = self.Convertdata[FromUnit][1]
@@ -430,6 +783,29 @@ class TempConverterClass(ConverterClass):
 
         return to_val
 
+    def _to_base(self, Pname):
+        A, B = self.Convertdata[Pname]
+        return A, B * A
+
+    def get_converter(self, FromUnit, ToUnit):
+        """
+        get_converter(FromUnit, ToUnit)
+
+        returns an AffineConverter: ((Value + B1) * A1 / A2) - B2
+        (the same as Convert(), so it gives exactly the same results),
+        with the scale and offset it rearranges to as well.
+        """
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
+
+        A1, B1 = self.Convertdata[FromUnit]
+        A2, B2 = self.Convertdata[ToUnit]
+
+        scale = A1 / A2
+        return AffineConverter(self.Name, FromUnit, ToUnit,
+                               scale, B1 * scale - B2,
+                               convertdata=((A1, B1), (A2, B2)))
+
 
 class DensityConverterClass(ConverterClass):
     """
@@ -447,18 +823,8 @@ class DensityConverterClass(ConverterClass):
         :param ToUnit: the unit you want the value converted to
         :param Value: the original value
         """
-        FromUnit = Simplify(FromUnit)
-        ToUnit = Simplify(ToUnit)
-
-        try:
-            FromUnit = self.Synonyms[FromUnit]
-        except KeyError:
-            raise InvalidUnitError((FromUnit, self.Name))
-
-        try:
-            ToUnit = self.Synonyms[ToUnit]
-        except KeyError:
-            raise InvalidUnitError((ToUnit, self.Name))
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
 
         if FromUnit == "apidegree":
             # another Special case (could I do this the same as temp?)
@@ -477,12 +843,189 @@ class DensityConverterClass(ConverterClass):
 
         return ToVal
 
+    def _to_base(self, Pname):
+        if Pname == "apidegree":
+            # can't be done with a scale and offset
+            return float('nan'), float('nan')
+        return self.Convertdata[Pname], 0.0
+
+    def get_converter(self, FromUnit, ToUnit):
+        """
+        get_converter(FromUnit, ToUnit)
+
+        returns a UnitConverter, or an APIGravityConverter if either
+        unit is API gravity.
+        """
+        FromUnit = self._resolve(FromUnit)
+        ToUnit = self._resolve(ToUnit)
+
+        from_api = FromUnit == "apidegree"
+        to_api = ToUnit == "apidegree"
+
+        if not (from_api or to_api):
+            return UnitConverter(self.Name,
+                                 FromUnit,
+                                 ToUnit,
+                                 (self.Convertdata[FromUnit] /
+                                  self.Convertdata[ToUnit]))
+
+        sg = self.Convertdata[u"specificgravity(15\xb0c)"]
+        from_factor = sg if from_api else self.Convertdata[FromUnit]
+        to_factor = sg if to_api else self.Convertdata[ToUnit]
+
+        return APIGravityConverter(self.Name, FromUnit, ToUnit,
+                                   from_factor / to_factor)
+
+
+class Unit:
+    """
+    A unit, with all the information about it already looked up.
+
+    Get one with ``get_unit()`` -- there is only ever one Unit object
+    for each unit, so they can be compared with ``is``, and Unit objects
+    can be passed in anywhere a unit name can.
+
+    Attributes:
+
+    unit_type: the (simplified) unit type, e.g. 'length'
+    name: the simplified primary name, e.g. 'nauticalmile'
+    primary_name: the primary name, e.g. 'nautical mile'
+    abbreviation: the standard abbreviation, e.g. 'nm'
+    scale, offset: to convert to the base unit for the type:
+                   base_value = value * scale + offset
+                   (NaN for API gravity, which can't be done that way)
+    code: the integer code for the unit, within its unit type
+    """
+    __slots__ = ("unit_type", "name", "primary_name", "abbreviation",
+                 "scale", "offset", "code")
+
+    def __init__(self, unit_type, name, primary_name, abbreviation,
+                 scale, offset, code):
+        for attr, value in zip(self.__slots__,
+                               (unit_type, name, primary_name, abbreviation,
+                                scale, offset, code)):
+            object.__setattr__(self, attr, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Unit objects can not be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("Unit objects can not be changed")
+
+    def __reduce__(self):
+        # so there is still only one Unit after unpickling
+        return (get_unit, (self.name, self.unit_type))
+
+    def __repr__(self):
+        return "Unit({!r}, {!r})".format(self.primary_name, self.unit_type)
+
+    def __str__(self):
+        return self.primary_name
+
+
+class UnitConverter:
+    """
+    A conversion between two units, with all the lookups already done.
+
+    Created by ``get_converter()`` -- it holds only the conversion factor,
+    so calling it is a single multiply:
+
+        to_value = from_value * scale
+
+    Works on anything that supports multiplication by a float
+    (scalars, numpy arrays, ...)
+    """
+    __slots__ = ("unit_type", "from_unit", "to_unit", "scale")
+
+    offset = 0.0
+    convertdata = None
+
+    def __init__(self, unit_type, from_unit, to_unit, scale):
+        self.unit_type = unit_type
+        self.from_unit = from_unit
+        self.to_unit = to_unit
+        self.scale = scale
+
+    def __call__(self, value):
+        return value * self.scale
+
+    def __repr__(self):
+        return ("{}({!r}, {!r}, {!r}, {!r})"
+                .format(self.__class__.__name__, self.unit_type,
+                        self.from_unit, self.to_unit, self.scale))
+
+
+class AffineConverter(UnitConverter):
+    """
+    A converter with a zero-point shift as well as a scale
+    (i.e. Temperature):
+
+        to_value = from_value * scale + offset
+
+    If convertdata, the ((A1, B1), (A2, B2)) of the two units, is given,
+    it's calculated as Convert() does it instead, so the rounding is the
+    same -- 0 C is 32.0 F, not 31.999999999999943:
+
+        to_value = ((from_value + B1) * A1 / A2) - B2
+    """
+    __slots__ = ("offset", "convertdata")
+
+    def __init__(self, unit_type, from_unit, to_unit, scale, offset,
+                 convertdata=None):
+        super().__init__(unit_type, from_unit, to_unit, scale)
+        self.offset = offset
+        self.convertdata = convertdata
+
+    def __call__(self, value):
+        if self.convertdata is None:
+            return value * self.scale + self.offset
+        (A1, B1), (A2, B2) = self.convertdata
+        return ((value + B1) * A1 / A2) - B2
+
+    def __repr__(self):
+        convertdata = ("" if self.convertdata is None else
+                       ", convertdata={!r}".format(self.convertdata))
+        return ("{}({!r}, {!r}, {!r}, {!r}, {!r}{})"
+                .format(self.__class__.__name__, self.unit_type,
+                        self.from_unit, self.to_unit, self.scale, self.offset,
+                        convertdata))
+
+
+class APIGravityConverter(UnitConverter):
+    """
+    A density converter where one (or both) of the units is API gravity.
+
+    API gravity is not linear in density:
+
+        SG = 141.5 / (API + 131.5)
+
+    so this can't be expressed as a scale and offset. ``scale`` is the
+    factor between the specific gravity and the other unit.
+    """
+    __slots__ = ("from_api", "to_api")
+
+    def __init__(self, unit_type, from_unit, to_unit, scale):
+        super().__init__(unit_type, from_unit, to_unit, scale)
+        self.from_api = from_unit == "apidegree"
+        self.to_api = to_unit == "apidegree"
+
+    def __call__(self, value):
+        if self.from_api:
+            value = 141.5 / (value + 131.5)
+        value = value * self.scale
+        if self.to_api:
+            value = 141.5 / value - 131.5
+        return value
+
 
 class OilQuantityConverter:
     """
     class for Oil Quantity conversion -- mass to/from Volume
 
     requires density info as well
+
+    ToVolumeArray() and ToMassArray() do the same for whole arrays
+    of values and densities.
     """
     @classmethod
     def ToVolume(self, Mass, MassUnits, Density, DensityUnits, VolumeUnits):
@@ -523,16 +1066,251 @@ class OilQuantityConverter:
 
         return Mass
 
+    @classmethod
+    def ToVolumeArray(self, Mass, MassUnits, Density, DensityUnits,
+                      VolumeUnits):
+        """
+        Convert arrays of Oil Mass to Volume
 
-# create the converter objects
-Converters = {}
-for (unittype, data) in ConvertDataUnits.items():
-    if unittype.lower() == 'temperature':
-        Converters["temperature"] = TempConverterClass(unittype, data)
-    elif unittype.lower() == 'density':
-        Converters["density"] = DensityConverterClass(unittype, data)
-    else:
-        Converters[Simplify(unittype)] = ConverterClass(unittype, data)
+        Same as ToVolume(), but the unit lookups are done once, and
+        Mass and Density can be arrays (or scalars) that broadcast
+        together. Density can be in any density unit, including API.
+
+        :returns: a numpy array, or a list if numpy isn't installed
+        """
+        # imported here, so numpy isn't imported with nucos
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(MassUnits, "kg", "mass").scale *
+                  get_converter("m^3", VolumeUnits, "volume").scale)
+        return scale_by_density(Mass, factor, Density, DensityUnits,
+                                divide=True)
+
+    @classmethod
+    def ToMassArray(self, Volume, VolUnits, Density, DensityUnits,
+                    MassUnits):
+        """
+        Convert arrays of Oil Volume to Mass
+
+        Same as ToMass(), but the unit lookups are done once, and
+        Volume and Density can be arrays (or scalars) that broadcast
+        together. Density can be in any density unit, including API.
+
+        :returns: a numpy array, or a list if numpy isn't installed
+        """
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(VolUnits, "m^3", "volume").scale *
+                  get_converter("kg", MassUnits, "mass").scale)
+        return scale_by_density(Volume, factor, Density, DensityUnits)
+
+
+class ViscosityConverter:
+    """
+    class for Viscosity conversion -- kinematic to/from dynamic
+
+    requires density info as well
+
+    ToDynamicArray() and ToKinematicArray() do the same for whole arrays
+    of values and densities.
+    """
+    @classmethod
+    def ToDynamic(self, Viscosity, ViscosityUnits, Density, DensityUnits,
+                  DynamicUnits):
+        """
+        Convert Kinematic Viscosity to Dynamic Viscosity
+
+        :param Viscosity: kinematic viscosity you want converted
+        :param ViscosityUnits: units of kinematic viscosity input
+        :param Density: density of oil
+        :param DensityUnits: units of density
+        :param DynamicUnits: units of dynamic viscosity desired
+        """
+        Density = convert("Density", DensityUnits, "kg/m^3", Density)
+        Viscosity = convert("Kinematic Viscosity", ViscosityUnits, "m^2/s",
+                            Viscosity)
+
+        Dynamic = Viscosity * Density
+        return convert("Dynamic Viscosity", "Pa s", DynamicUnits, Dynamic)
+
+    @classmethod
+    def ToKinematic(self, Viscosity, ViscosityUnits, Density, DensityUnits,
+                    KinematicUnits):
+        """
+        Convert Dynamic Viscosity to Kinematic Viscosity
+
+        :param Viscosity: dynamic viscosity you want converted
+        :param ViscosityUnits: units of dynamic viscosity input
+        :param Density: density of oil
+        :param DensityUnits: units of density
+        :param KinematicUnits: units of kinematic viscosity desired
+        """
+        Density = convert("Density", DensityUnits, "kg/m^3", Density)
+        Viscosity = convert("Dynamic Viscosity", ViscosityUnits, "Pa s",
+                            Viscosity)
+
+        Kinematic = Viscosity / Density
+        return convert("Kinematic Viscosity", "m^2/s", KinematicUnits,
+                       Kinematic)
+
+    @classmethod
+    def ToDynamicArray(self, Viscosity, ViscosityUnits, Density,
+                       DensityUnits, DynamicUnits):
+        """
+        Convert arrays of Kinematic Viscosity to Dynamic Viscosity
+
+        Same as ToDynamic(), but the unit lookups are done once, and
+        Viscosity and Density can be arrays (or scalars) that broadcast
+        together. Density can be in any density unit, including API.
+
+        :returns: a numpy array, or a list if numpy isn't installed
+        """
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(ViscosityUnits, "m^2/s",
+                                "kinematic viscosity").scale *
+                  get_converter("Pa s", DynamicUnits,
+                                "dynamic viscosity").scale)
+        return scale_by_density(Viscosity, factor, Density, DensityUnits)
+
+    @classmethod
+    def ToKinematicArray(self, Viscosity, ViscosityUnits, Density,
+                         DensityUnits, KinematicUnits):
+        """
+        Convert arrays of Dynamic Viscosity to Kinematic Viscosity
+
+        Same as ToKinematic(), but for arrays -- see ToDynamicArray()
+        """
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(ViscosityUnits, "Pa s",
+                                "dynamic viscosity").scale *
+                  get_converter("m^2/s", KinematicUnits,
+                                "kinematic viscosity").scale)
+        return scale_by_density(Viscosity, factor, Density, DensityUnits,
+                                divide=True)
+
+
+class DischargeConverter:
+    """
+    class for Discharge conversion -- volume to/from mass discharge
+
+    requires density info as well
+
+    ToMassDischargeArray() and ToDischargeArray() do the same for whole
+    arrays of values and densities.
+    """
+    @classmethod
+    def ToMassDischarge(self, Discharge, DischargeUnits, Density,
+                        DensityUnits, MassDischargeUnits):
+        """
+        Convert (volume) Discharge to Mass Discharge
+
+        :param Discharge: discharge you want converted
+        :param DischargeUnits: units of discharge input
+        :param Density: density of oil
+        :param DensityUnits: units of density
+        :param MassDischargeUnits: units of mass discharge desired
+        """
+        Density = convert("Density", DensityUnits, "kg/m^3", Density)
+        Discharge = convert("Discharge", DischargeUnits, "m^3/s", Discharge)
+
+        MassDischarge = Discharge * Density
+        return convert("Mass Discharge", "kg/s", MassDischargeUnits,
+                       MassDischarge)
+
+    @classmethod
+    def ToDischarge(self, MassDischarge, MassDischargeUnits, Density,
+                    DensityUnits, DischargeUnits):
+        """
+        Convert Mass Discharge to (volume) Discharge
+
+        :param MassDischarge: mass discharge you want converted
+        :param MassDischargeUnits: units of mass discharge input
+        :param Density: density of oil
+        :param DensityUnits: units of density
+        :param DischargeUnits: units of discharge desired
+        """
+        Density = convert("Density", DensityUnits, "kg/m^3", Density)
+        MassDischarge = convert("Mass Discharge", MassDischargeUnits, "kg/s",
+                                MassDischarge)
+
+        Discharge = MassDischarge / Density
+        return convert("Discharge", "m^3/s", DischargeUnits, Discharge)
+
+    @classmethod
+    def ToMassDischargeArray(self, Discharge, DischargeUnits, Density,
+                             DensityUnits, MassDischargeUnits):
+        """
+        Convert arrays of Discharge to Mass Discharge
+
+        Same as ToMassDischarge(), but the unit lookups are done once, and
+        Discharge and Density can be arrays (or scalars) that broadcast
+        together. Density can be in any density unit, including API.
+
+        :returns: a numpy array, or a list if numpy isn't installed
+        """
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(DischargeUnits, "m^3/s", "discharge").scale *
+                  get_converter("kg/s", MassDischargeUnits,
+                                "mass discharge").scale)
+        return scale_by_density(Discharge, factor, Density, DensityUnits)
+
+    @classmethod
+    def ToDischargeArray(self, MassDischarge, MassDischargeUnits, Density,
+                         DensityUnits, DischargeUnits):
+        """
+        Convert arrays of Mass Discharge to Discharge
+
+        Same as ToDischarge(), but for arrays -- see ToMassDischargeArray()
+        """
+        from .array_conversion import scale_by_density
+
+        factor = (get_converter(MassDischargeUnits, "kg/s",
+                                "mass discharge").scale *
+                  get_converter("m^3/s", DischargeUnits, "discharge").scale)
+        return scale_by_density(MassDischarge, factor, Density, DensityUnits,
+                                divide=True)
+
+
+class ConverterRegistry(Mapping):
+    """
+    The converter objects for all the unit types,
+    keyed by simplified unit type name.
+
+    Each converter is only created the first time it is used.
+    """
+    special_classes = {"temperature": TempConverterClass,
+                       "density": DensityConverterClass,
+                       }
+
+    def __init__(self, units_data):
+        """
+        :param units_data: the units table -- see unit_data.py for format
+        """
+        self._units_data = units_data
+        self._converters = {}
+
+    def __getitem__(self, unit_type):
+        try:
+            return self._converters[unit_type]
+        except KeyError:
+            pretty_name = _pretty_unit_types()[unit_type]
+            cls = self.special_classes.get(unit_type, ConverterClass)
+            converter = cls(pretty_name, self._units_data[pretty_name])
+            self._converters[unit_type] = converter
+            return converter
+
+    def __iter__(self):
+        return iter(_pretty_unit_types())
+
+    def __len__(self):
+        return len(_pretty_unit_types())
+
+
+# the converter objects
+Converters = ConverterRegistry(ConvertDataUnits)
 
 
 def is_supported(unit):
@@ -540,7 +1318,7 @@ def is_supported(unit):
     Returns True is the unit is in the list of supported units for the
     API that does not require unit_type
     """
-    return Simplify(unit) in UNIT_TYPES
+    return UNIT_NAME_CACHE.lookup(unit).unit_type is not None
 
 
 def convert(unit1, unit2, value, unit_type=None):
@@ -576,14 +1354,17 @@ def convert(unit1, unit2, value, unit_type=None):
     :param unit2: the unit you want the value converted to
     :param value: the original value
     """
-    if unit_type is None:
+    new_api = unit_type is None
+    if isinstance(unit1, Unit) and new_api:
+        # already resolved
+        unit_type = unit1.unit_type
+    elif new_api:
         # the new API: no need to specify unit type
-        unit1, unit2 = (Simplify(s) for s in (unit1, unit2))
-
-        try:
-            unit_type = UNIT_TYPES[unit1]
-        except KeyError:
-            raise NotSupportedUnitError(unit1)
+        resolved = UNIT_NAME_CACHE.lookup(unit1)
+        unit_type = resolved.unit_type
+        if unit_type is None:
+            return _compound_converter(
+                unit1, unit2, NotSupportedUnitError(resolved.name))(value)
 
         # try:
         #     unit_type2 = UNIT_TYPES[unit2]
@@ -593,21 +1374,114 @@ def convert(unit1, unit2, value, unit_type=None):
         # if unit_type != unit_type2:
         #     raise UnitConversionError("Cannot convert {0} to {1}"
         #                               .format(unit1, unit2))
-
-        unit_type = Simplify(unit_type)
     else:
         # the old API: specify the unit type
         # re-defining the inputs:
         unit_type, unit1, unit2, value = unit1, unit2, value, unit_type
-        unit_type, unit1, unit2 = (Simplify(s)
-                                   for s in (unit_type, unit1, unit2))
+        unit_type = _normalize(unit_type)
 
     try:
         Converter = Converters[unit_type]
     except KeyError:
         raise InvalidUnitTypeError(unit_type)
 
-    return Converter.Convert(unit1, unit2, value)
+    if not new_api:
+        return Converter.Convert(unit1, unit2, value)
+    try:
+        return Converter.Convert(unit1, unit2, value)
+    except InvalidUnitError as err:
+        # maybe unit2 is a compound unit
+        return _compound_converter(unit1, unit2, err)(value)
+
+
+def get_unit(unit, unit_type=None):
+    """
+    get_unit(unit, unit_type=None)
+
+    returns the Unit object for a unit name
+
+    :param unit: the name of the unit -- any supported spelling
+    :param unit_type=None: the type of the unit: 'mass', 'length', etc.
+                           Only required if the unit name is ambiguous.
+
+    The Unit objects can be used in place of unit names anywhere,
+    and skip all the name lookups.
+    """
+    if unit_type is None:
+        resolved = UNIT_NAME_CACHE.lookup(unit)
+        if resolved.unit_type is None:
+            raise NotSupportedUnitError(resolved.name)
+        unit_type = resolved.unit_type
+    else:
+        unit_type = _normalize(unit_type)
+
+    try:
+        Converter = Converters[unit_type]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+
+    return Converter.get_unit(unit)
+
+
+def get_converter(from_unit, to_unit, unit_type=None):
+    """
+    get_converter(from_unit, to_unit, unit_type=None)
+
+    returns a callable that converts values from from_unit to to_unit
+
+    All the name normalization and table lookups are done once, when
+    the converter is created, so if you need to convert a lot of values
+    with the same units, this is much faster than calling convert()
+    each time:
+
+        m_to_ft = get_converter('meter', 'feet')
+        m_to_ft(32)
+
+    :param from_unit: the unit the original values are in
+    :param to_unit: the unit you want the values converted to
+    :param unit_type=None: the type of the unit: 'mass', 'length', etc.
+                           If None, it will be looked up from from_unit.
+
+    The returned converter has ``scale`` and ``offset`` attributes, so
+    that, except for API gravity: ``to_value = value * scale + offset``
+    """
+    if unit_type is None:
+        if isinstance(from_unit, Unit):
+            unit_type = from_unit.unit_type
+        else:
+            unit_type = UNIT_NAME_CACHE.lookup(from_unit).unit_type
+        if unit_type is None:
+            return _compound_converter(from_unit, to_unit,
+                                       NotSupportedUnitError(from_unit))
+        try:
+            return Converters[unit_type].get_converter(from_unit, to_unit)
+        except InvalidUnitError as err:
+            return _compound_converter(from_unit, to_unit, err)
+
+    unit_type = _normalize(unit_type)
+    try:
+        Converter = Converters[unit_type]
+    except KeyError:
+        raise InvalidUnitTypeError(unit_type)
+
+    return Converter.get_converter(from_unit, to_unit)
+
+
+def _compound_converter(from_unit, to_unit, error):
+    """
+    The Plan for converting between compound units, like "kg m^-3"
+    (see compound_units.py), for when the units aren't in the tables.
+
+    raises error if that doesn't work either -- so the errors are the
+    same as they would be without compound units.
+    """
+    # imported here, as compound_units imports this module
+    from .compound_units import compile_conversion
+
+    try:
+        return compile_conversion(from_unit, to_unit)
+    except (UnitConversionError, TypeError):
+        raise error from None
 
 
 # so as to have the old, non-PEP8 compatible name
@@ -644,6 +1518,14 @@ class NotSupportedUnitError(UnitConversionError):
         return ('The unit: {} is not supported or not recognized'
                 .format(self.unit))
 
+    @property
+    def suggestions(self):
+        """
+        unit names that are close to the unit -- "did you mean ...?"
+        """
+        from .suggestions import suggest_units
+        return suggest_units(self.unit)
+
 
 class InvalidUnitError(UnitConversionError):
     """
@@ -665,6 +1547,17 @@ class InvalidUnitError(UnitConversionError):
         else:
             return super(InvalidUnitError, self).__str__()
 
+    @property
+    def suggestions(self):
+        """
+        unit names of the Unit Type that are close to the unit
+        -- "did you mean ...?"
+        """
+        from .suggestions import suggest_units
+        if not hasattr(self, 'unit'):
+            return []
+        return suggest_units(self.unit, self.type or None)
+
 
 class InvalidUnitTypeError(UnitConversionError):
     """
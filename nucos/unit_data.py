@@ -371,17 +371,39 @@ ConvertDataUnits = {
 #              ...
 #              }
 
-unit_sets = {}
-for k in ConvertDataUnits.keys():
-    unit_sets[k] = set(itertools.chain(*[y for (x, y)
-                                         in ConvertDataUnits[k].values()]))
+#
+# These are built the first time they are accessed, not on import.
 
+def _build_unit_sets():
+    unit_sets = {}
+    for k in ConvertDataUnits.keys():
+        unit_sets[k] = set(itertools.chain(*[y for (x, y)
+                                             in ConvertDataUnits[k].values()]))
+    return unit_sets
 
-# Build the global unit list
 
-supported_units = set([])
-for s in unit_sets.values():
-    supported_units = supported_units.union(s)
+# Build the global unit list
+def _build_supported_units():
+    supported_units = set([])
+    for s in __getattr__("unit_sets").values():
+        supported_units = supported_units.union(s)
+    return supported_units
+
+
+_LAZY_TABLES = {"unit_sets": _build_unit_sets,
+                "supported_units": _build_supported_units,
+                }
+
+
+def __getattr__(name):
+    try:
+        builder = _LAZY_TABLES[name]
+    except KeyError:
+        raise AttributeError("module {!r} has no attribute {!r}"
+                             .format(__name__, name))
+    # save it in the module, so this is only called once
+    table = globals()[name] = builder()
+    return table
 
 # no longer needed -- see: write_all_unit_names
 # def write_units(filename=None):
@@ -13,6 +13,12 @@ from nucos import __version__
 
 from nucos.unit_conversion import *
 
+# these are built on first use, so not picked up by the import *
+from nucos.unit_conversion import (UNIT_TYPES,
+                                   UNIT_NAMES,
+                                   PRETTY_UNIT_TYPES,
+                                   )
+
 from nucos import lat_long
 
 from nucos.lat_long import (LatLongConverter,